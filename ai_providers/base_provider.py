@@ -4,12 +4,23 @@
 Abstract Base Class for AI Provider Integration.
 This module defines the unified interface (AIProvider) that all concrete
 implementations (e.g., OpenAI, Gemini) must follow.
-It also defines the expected structure of the response object (AIResponse).
+It also defines the expected structure of the response object (AIResponse)
+and of streamed responses (text deltas followed by the final AIResponse).
+get_response_async() is the asyncio counterpart of get_response(); providers
+with an async SDK client override _generate_async(), the others run
+_generate() on a worker thread.
 """
 
+import time
+import asyncio
+import logging
 from abc import ABC, abstractmethod
-from typing import TypedDict, Optional, Any
+from typing import TypedDict, Optional, Any, Iterator, Union, TYPE_CHECKING
 from core.version import APP_NAME
+from .retry_policy import RetryPolicy, RETRYABLE_STATUS_CODES, THROTTLE_STATUS_CODES, parse_retry_after
+
+if TYPE_CHECKING:
+    from core.rate_limiter import RateLimiter
 
 # Type definition for the response structure to ensure strict type checking
 class AIResponse(TypedDict):
@@ -24,6 +35,12 @@ class AIResponse(TypedDict):
     reasoning_tokens: Optional[int] # Chain of thought tokens (if available)
     status_message: Optional[str]   # Status message (e.g., "Success", "Error")
     thought_signature: Optional[str] # Gemini 3 encrypted thought signature (if available)
+    retries: Optional[int]          # Number of retried attempts (set by AIProvider.get_response)
+    cached: Optional[bool]          # True if served from the response cache (set by AppController)
+
+
+# One item of a streamed response: a text delta (str); the last item is the complete AIResponse
+StreamChunk = Union[str, AIResponse]
 
 
 class AIProvider(ABC):
@@ -45,10 +62,253 @@ class AIProvider(ABC):
             
         self.api_key = api_key
 
-    @abstractmethod
+        # Optional shared quota (attached by the AppController)
+        self.rate_limiter: Optional["RateLimiter"] = None
+        self.provider_key: Optional[str] = None
+
+        # Retry behavior for transient errors (replaced by the AppController from config)
+        self.retry_policy = RetryPolicy()
+
+    def attach_rate_limiter(self, rate_limiter: "RateLimiter", provider_key: str) -> None:
+        """
+        Routes every get_response() call through a shared rate limiter.
+        Args:
+            rate_limiter (RateLimiter): The limiter holding the request/token buckets.
+            provider_key (str): The key under which this provider is registered (e.g., "Gemini-1").
+        """
+        self.rate_limiter = rate_limiter
+        self.provider_key = provider_key
+
     def get_response(self, model: str, prompt: str, **kwargs) -> AIResponse:
         """
         Get a response from the AI model.
+        Waits for the attached rate limiter (if any), delegates to _generate() and
+        retries transient errors (429/5xx, timeouts) according to the retry policy.
+        Errors that are final are mapped by _handle_error().
+
+        Args:
+            model (str): The identifier of the model to use.
+            prompt (str): The input text.
+            **kwargs: Provider-specific optional parameters.
+
+        Returns:
+            AIResponse: Standardized response object (TypedDict), including the retry count.
+        """
+        started_at = time.monotonic()
+        attempt = 0
+
+        while True:
+            attempt += 1
+            try:
+                response = self._call_with_limits(model, prompt, **kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, model, attempt, started_at)
+                if delay is not None:
+                    time.sleep(delay)
+                    continue
+
+                response = self._handle_error(e, model, len(prompt))
+
+            response["retries"] = attempt - 1
+            return response
+
+    async def get_response_async(self, model: str, prompt: str, **kwargs) -> AIResponse:
+        """
+        Async variant of get_response(): same rate limiting, retry policy and error mapping,
+        but waiting (quota, backoff, the call itself) does not occupy a thread.
+
+        Args:
+            model (str): The identifier of the model to use.
+            prompt (str): The input text.
+            **kwargs: Provider-specific optional parameters.
+
+        Returns:
+            AIResponse: Standardized response object (TypedDict), including the retry count.
+        """
+        started_at = time.monotonic()
+        attempt = 0
+
+        while True:
+            attempt += 1
+            try:
+                response = await self._call_with_limits_async(model, prompt, **kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, model, attempt, started_at)
+                if delay is not None:
+                    await asyncio.sleep(delay)
+                    continue
+
+                response = self._handle_error(e, model, len(prompt))
+
+            response["retries"] = attempt - 1
+            return response
+
+    def stream_response(self, model: str, prompt: str, **kwargs) -> Iterator[StreamChunk]:
+        """
+        Streaming variant of get_response().
+        Yields text deltas (str) as the model produces them and, as the last item, the
+        complete AIResponse (with usage and retry count). Transient errors are retried
+        like in get_response() as long as no text has been yielded yet; a later failure
+        ends the stream with the error response of _handle_error().
+
+        Args:
+            model (str): The identifier of the model to use.
+            prompt (str): The input text.
+            **kwargs: Provider-specific optional parameters.
+
+        Yields:
+            StreamChunk: Text deltas, then the final AIResponse.
+        """
+        started_at = time.monotonic()
+        attempt = 0
+
+        while True:
+            attempt += 1
+            streamed = False
+            response = None
+            attempt_stream = self._stream_with_limits(model, prompt, **kwargs)
+            try:
+                for chunk in attempt_stream:
+                    if isinstance(chunk, str):
+                        if chunk:
+                            streamed = True
+                            yield chunk
+                    else:
+                        response = chunk
+                if response is None:
+                    raise RuntimeError("Stream ended without a final response.")
+            except Exception as e:
+                delay = None if streamed else self._retry_delay(e, model, attempt, started_at)
+                if delay is not None:
+                    time.sleep(delay)
+                    continue
+
+                response = self._handle_error(e, model, len(prompt))
+            finally:
+                # Closing this generator (e.g. the client went away) does not close the one it iterates
+                attempt_stream.close()
+
+            response["retries"] = attempt - 1
+            yield response
+            return
+
+    def _retry_delay(self, error: Exception, model: str, attempt: int, started_at: float) -> Optional[float]:
+        """Returns the wait before retrying a failed attempt, or None if the error is final."""
+        retryable = self._is_retryable(error)
+        if retryable and self._is_throttle(error) and self.rate_limiter:
+            self.rate_limiter.on_throttle(self.provider_key, model)
+
+        delay = self.retry_policy.next_delay(attempt, started_at, self._retry_after(error)) if retryable else None
+        if delay is not None:
+            logging.warning(
+                f"[{APP_NAME}] {self.provider_key or type(self).__name__} ({model}) attempt {attempt} failed "
+                f"({type(error).__name__}: {str(error)[:200]}). Retrying in {delay:.1f}s."
+            )
+        return delay
+
+    def _call_with_limits(self, model: str, prompt: str, **kwargs) -> AIResponse:
+        """Runs one attempt inside the rate limiter (in-flight slot + request/token buckets)."""
+        if self.rate_limiter is None:
+            return self._generate(model, prompt, **kwargs)
+
+        estimated_tokens = self.rate_limiter.estimate_tokens(prompt)
+        with self.rate_limiter.slot(self.provider_key, model):
+            self.rate_limiter.acquire(self.provider_key, model, estimated_tokens)
+            try:
+                response = self._generate(model, prompt, **kwargs)
+            except Exception:
+                # Failed attempts do not consume token quota
+                self.rate_limiter.record_usage(self.provider_key, model, estimated_tokens, 0)
+                raise
+
+        self.rate_limiter.record_usage(self.provider_key, model, estimated_tokens, response.get("total_tokens"))
+        self.rate_limiter.on_success(self.provider_key, model)
+        return response
+
+    async def _call_with_limits_async(self, model: str, prompt: str, **kwargs) -> AIResponse:
+        """Async variant of _call_with_limits()."""
+        if self.rate_limiter is None:
+            return await self._generate_async(model, prompt, **kwargs)
+
+        estimated_tokens = self.rate_limiter.estimate_tokens(prompt)
+        async with self.rate_limiter.slot_async(self.provider_key, model):
+            await self.rate_limiter.acquire_async(self.provider_key, model, estimated_tokens)
+            try:
+                response = await self._generate_async(model, prompt, **kwargs)
+            except Exception:
+                # Failed attempts do not consume token quota
+                await self.rate_limiter.record_usage_async(self.provider_key, model, estimated_tokens, 0)
+                raise
+
+        await self.rate_limiter.record_usage_async(self.provider_key, model, estimated_tokens, response.get("total_tokens"))
+        # In-process AIMD bookkeeping only (no I/O)
+        self.rate_limiter.on_success(self.provider_key, model)
+        return response
+
+    def _stream_with_limits(self, model: str, prompt: str, **kwargs) -> Iterator[StreamChunk]:
+        """
+        Runs one streamed attempt inside the rate limiter. The in-flight slot is held until the
+        stream ends; if the consumer stops early, closing this generator closes the provider
+        stream (and its HTTP connection) and releases the slot right away.
+        """
+        if self.rate_limiter is None:
+            yield from self._generate_stream(model, prompt, **kwargs)
+            return
+
+        estimated_tokens = self.rate_limiter.estimate_tokens(prompt)
+        response = None
+        with self.rate_limiter.slot(self.provider_key, model):
+            self.rate_limiter.acquire(self.provider_key, model, estimated_tokens)
+            stream = self._generate_stream(model, prompt, **kwargs)
+            try:
+                for chunk in stream:
+                    if not isinstance(chunk, str):
+                        response = chunk
+                    yield chunk
+            except Exception:
+                # Failed attempts do not consume token quota
+                self.rate_limiter.record_usage(self.provider_key, model, estimated_tokens, 0)
+                raise
+            finally:
+                # Also runs on an early close: the provider stream ends before the slot is released
+                stream.close()
+
+        self.rate_limiter.record_usage(self.provider_key, model, estimated_tokens, (response or {}).get("total_tokens"))
+        self.rate_limiter.on_success(self.provider_key, model)
+
+    @staticmethod
+    def _status_code(error: Exception) -> Optional[int]:
+        """Extracts the HTTP status code from an SDK exception (if any)."""
+        for attr in ("status_code", "code"):
+            value = getattr(error, attr, None)
+            if isinstance(value, int):
+                return value
+        return None
+
+    def _is_retryable(self, error: Exception) -> bool:
+        """
+        Returns True for transient errors: retryable HTTP statuses and
+        connection/timeout failures. Subclasses may refine this.
+        """
+        status = self._status_code(error)
+        if status is not None:
+            return status in RETRYABLE_STATUS_CODES
+        error_type = type(error).__name__
+        return "Timeout" in error_type or "Connect" in error_type
+
+    def _is_throttle(self, error: Exception) -> bool:
+        """Returns True if the error signals provider pushback (rate limit / overload)."""
+        return self._status_code(error) in THROTTLE_STATUS_CODES
+
+    def _retry_after(self, error: Exception) -> Optional[float]:
+        """Returns the server's wait hint in seconds (Retry-After headers), if any."""
+        response = getattr(error, "response", None)
+        return parse_retry_after(getattr(response, "headers", None))
+
+    @abstractmethod
+    def _generate(self, model: str, prompt: str, **kwargs) -> AIResponse:
+        """
+        Perform the actual provider call.
         This method must be implemented by all subclasses.
 
         Args:
@@ -58,6 +318,43 @@ class AIProvider(ABC):
 
         Returns:
             AIResponse: Standardized response object (TypedDict).
+
+        Raises:
+            Exception: Any SDK error; get_response() decides whether to retry it.
+        """
+        pass
+
+    async def _generate_async(self, model: str, prompt: str, **kwargs) -> AIResponse:
+        """
+        Perform the actual provider call from asyncio code.
+        The default implementation runs _generate() on a worker thread; providers with
+        an async SDK client override it.
+
+        Raises:
+            Exception: Any SDK error; get_response_async() decides whether to retry it.
+        """
+        return await asyncio.to_thread(self._generate, model, prompt, **kwargs)
+
+    def _generate_stream(self, model: str, prompt: str, **kwargs) -> Iterator[StreamChunk]:
+        """
+        Perform the actual provider call in streaming mode.
+        Yields text deltas (str) and, as the last item, the complete AIResponse.
+        The default implementation calls _generate() and yields the whole text as a
+        single delta; providers with a streaming API override it.
+
+        Raises:
+            Exception: Any SDK error; stream_response() decides whether to retry it.
+        """
+        response = self._generate(model, prompt, **kwargs)
+        if response["response"]:
+            yield response["response"]
+        yield response
+
+    @abstractmethod
+    def _handle_error(self, error: Exception, model: str, prompt_len: int) -> AIResponse:
+        """
+        Map a final (non-retried) error to the standardized error response.
+        This method must be implemented by all subclasses.
         """
         pass
 
@@ -68,7 +365,7 @@ if __name__ == "__main__":
 
     # Mock implementation for testing
     class _MockProvider(AIProvider):
-        def get_response(self, model: str, prompt: str, **kwargs) -> AIResponse:
+        def _generate(self, model: str, prompt: str, **kwargs) -> AIResponse:
             return {
                 "response": f"Mock response from model '{model}'.",
                 "error": False,
@@ -79,9 +376,13 @@ if __name__ == "__main__":
                 "total_tokens": 10,
                 "reasoning_tokens": None,
                 "status_message": "Success (Mock)",
-                "thought_signature": None
+                "thought_signature": None,
+                "retries": None
             }
 
+        def _handle_error(self, error: Exception, model: str, prompt_len: int) -> AIResponse:
+            raise error
+
     try:
         # Proper instantiation
         provider = _MockProvider(api_key="test_valid_key")
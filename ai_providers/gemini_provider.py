@@ -3,14 +3,19 @@
 """
 Google Gemini AI Provider Implementation.
 This module uses the 'google-genai' SDK to communicate with Gemini models.
-It handles authentication, content generation, and token counting (metadata-based or estimated).
+It handles authentication, content generation (complete or streamed, from threads
+or from asyncio code via the client's 'aio' interface), and token counting
+(metadata-based or estimated).
 """
 
+import asyncio
 import logging
+import threading
+import weakref
 import traceback
-from typing import Any, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
-from .base_provider import AIProvider, AIResponse
+from .base_provider import AIProvider, AIResponse, StreamChunk
 from core.version import APP_NAME
 # Constant to limit the length of error logs
 _MAX_LOG_ERROR_LENGTH = 500
@@ -62,16 +67,16 @@ class GeminiProvider(AIProvider):
             logging.error(f"Gemini client init error: {e}", exc_info=True)
             raise RuntimeError(f"Failed to create Gemini client: {e}") from e
 
-    def get_response(self, model: str, prompt: str, **kwargs) -> AIResponse:
+        # Clients for async calls, one per event loop (created on first use in the loop that owns their
+        # connections); a client goes away with its loop instead of being replaced when another loop calls
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+        self._async_clients_lock = threading.Lock()
+
+    def _generate(self, model: str, prompt: str, **kwargs) -> AIResponse:
         """
         Generate a response using a Gemini model.
         Token counting is performed via response metadata or estimation.
 
-        This method handles three distinct modes based on the model version:
-        1. Standard/Lite: No thinking config.
-        2. Gemini 3 Series: Uses 'thinking_level' (LOW/MEDIUM/HIGH).
-        3. Gemini 2.5 Series: Uses 'thinking_budget' (Token count).
-
         Args:
             model (str): The model identifier.
             prompt (str): The user input prompt.
@@ -83,134 +88,228 @@ class GeminiProvider(AIProvider):
         input_chars = len(prompt)
         logging.info(f"[{APP_NAME}] Gemini call ({model}). Prompt length: {input_chars} chars.")
 
+        # Errors propagate to AIProvider.get_response (retry policy -> _handle_error)
+        # 1. API Call: Generate Content
+        response = self.client.models.generate_content(
+            model=model,
+            contents=prompt,
+            config=self._generation_config(model, **kwargs)
+        )
+
+        response_text = response.text or ""
+        logging.info(f"Gemini response OK. Output: {len(response_text)} chars.")
+
+        # Extract Thought Signature (if available in the new SDK response)
+        return self._build_response(
+            response_text, getattr(response, 'usage_metadata', None),
+            getattr(response, "thought_signature", None), input_chars
+        )
+
+    async def _generate_async(self, model: str, prompt: str, **kwargs) -> AIResponse:
+        """
+        Async counterpart of _generate() (client.aio.models.generate_content).
+        """
+        input_chars = len(prompt)
+        logging.info(f"[{APP_NAME}] Gemini async call ({model}). Prompt length: {input_chars} chars.")
+
+        response = await self._get_async_client().aio.models.generate_content(
+            model=model,
+            contents=prompt,
+            config=self._generation_config(model, **kwargs)
+        )
+
+        response_text = response.text or ""
+        logging.info(f"Gemini response OK. Output: {len(response_text)} chars.")
+        return self._build_response(
+            response_text, getattr(response, 'usage_metadata', None),
+            getattr(response, "thought_signature", None), input_chars
+        )
+
+    def _get_async_client(self) -> Any:
+        """Returns the genai client used for async calls in the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = genai.Client(api_key=self.api_key)
+                self._async_clients[loop] = client
+        return client
+
+    def _generate_stream(self, model: str, prompt: str, **kwargs) -> Iterator[StreamChunk]:
+        """
+        Streaming variant of _generate() (generate_content_stream): yields the text of each
+        chunk, then the AIResponse. Usage metadata is taken from the last chunk that carries it.
+        """
+        input_chars = len(prompt)
+        logging.info(f"[{APP_NAME}] Gemini stream ({model}). Prompt length: {input_chars} chars.")
+
+        parts: List[str] = []
+        usage_metadata = None
+        thought_signature = None
+        stream = self.client.models.generate_content_stream(
+            model=model,
+            contents=prompt,
+            config=self._generation_config(model, **kwargs)
+        )
         try:
-            # --- Configuration Routing Logic ---
-            gen_config: Dict[str, Any] = {}
-            
-            # Detect model capabilities based on naming convention
-            is_gemini_3 = "gemini-3" in model
-            is_gemini_2_5 = "gemini-2.5" in model
-            is_lite = "lite" in model or "8b" in model
+            for chunk in stream:
+                usage_metadata = getattr(chunk, 'usage_metadata', None) or usage_metadata
+                thought_signature = getattr(chunk, "thought_signature", None) or thought_signature
+                text = chunk.text
+                if text:
+                    parts.append(text)
+                    yield text
+        finally:
+            # Ends the HTTP response when the consumer stops early
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+
+        response_text = "".join(parts)
+        logging.info(f"Gemini stream OK. Output: {len(response_text)} chars.")
+        yield self._build_response(response_text, usage_metadata, thought_signature, input_chars)
+
+    def _generation_config(self, model: str, **kwargs) -> Any:
+        """
+        Builds the GenerateContentConfig for a model (thinking mode, temperature, safety settings).
+
+        This method handles three distinct modes based on the model version:
+        1. Standard/Lite: No thinking config.
+        2. Gemini 3 Series: Uses 'thinking_level' (LOW/MEDIUM/HIGH).
+        3. Gemini 2.5 Series: Uses 'thinking_budget' (Token count).
+        """
+        # --- Configuration Routing Logic ---
+        gen_config: Dict[str, Any] = {}
+        
+        # Detect model capabilities based on naming convention
+        is_gemini_3 = "gemini-3" in model
+        is_gemini_2_5 = "gemini-2.5" in model
+        is_lite = "lite" in model or "8b" in model
+        
+        # Extract reasoning effort from GUI/CLI args (default: "medium")
+        # Expected values: "none", "minimal", "low", "medium", "high", "xhigh"
+        gui_effort = kwargs.get("reasoning_effort", "medium").lower()
+
+        # MODE 1: Standard / Lite (No Thinking)
+        # Active if model is Lite OR user explicitly disabled reasoning
+        if is_lite or gui_effort in ["none", "disabled"]:
+            gen_config["temperature"] = kwargs.get("temperature", 0.7)
+            # Ensure no thinking config is passed to avoid API errors
+            if "thinking_config" in gen_config:
+                del gen_config["thinking_config"]
+
+        # MODE 2: Gemini 3 Series (Thinking Levels)
+        elif is_gemini_3:
+            # Temperature must be 1.0 for thinking models
+            gen_config["temperature"] = 1.0  
             
-            # Extract reasoning effort from GUI/CLI args (default: "medium")
-            # Expected values: "none", "minimal", "low", "medium", "high", "xhigh"
-            gui_effort = kwargs.get("reasoning_effort", "medium").lower()
-
-            # MODE 1: Standard / Lite (No Thinking)
-            # Active if model is Lite OR user explicitly disabled reasoning
-            if is_lite or gui_effort in ["none", "disabled"]:
-                gen_config["temperature"] = kwargs.get("temperature", 0.7)
-                # Ensure no thinking config is passed to avoid API errors
-                if "thinking_config" in gen_config:
-                    del gen_config["thinking_config"]
-
-            # MODE 2: Gemini 3 Series (Thinking Levels)
-            elif is_gemini_3:
-                # Temperature must be 1.0 for thinking models
-                gen_config["temperature"] = 1.0  
-                
-                target_level = "HIGH" # Default fallback
-                
-                # Gemini 3 Flash supports more granular levels
-                if "flash" in model.lower():
-                    if gui_effort == "medium": target_level = "MEDIUM"
-                    elif gui_effort == "minimal": target_level = "MINIMAL"
-                    elif gui_effort == "low": target_level = "LOW"
-                    # high/xhigh remains HIGH
-                # Gemini 3 Pro (Preview) mainly targets Low/High
-                else:
-                    if gui_effort in ["low", "minimal"]: target_level = "LOW"
-                    # medium/high/xhigh -> HIGH
-                
-                gen_config["thinking_config"] = {
-                    "include_thoughts": True,
-                    "thinking_level": target_level
-                }
-
-            # MODE 3: Gemini 2.5 Series (Thinking Budget - Token Based)
-            elif is_gemini_2_5:
-                gen_config["temperature"] = 1.0 
-                
-                # Map GUI effort levels to specific token budgets
-                budget_map = {
-                    "minimal": 1024,  # Just a scratchpad
-                    "low": 2048,
-                    "medium": 8192,   # Sweet spot for 2.5 Pro
-                    "high": 16384,
-                    "xhigh": 32768    # Deep analysis (2.5 Pro only)
-                }
-                budget = budget_map.get(gui_effort, 8192) # Default to Medium
-                
-                gen_config["thinking_config"] = {
-                    "include_thoughts": True,
-                    "thinking_budget": budget
-                }
+            target_level = "HIGH" # Default fallback
             
-            # MODE 4: Legacy / Other
+            # Gemini 3 Flash supports more granular levels
+            if "flash" in model.lower():
+                if gui_effort == "medium": target_level = "MEDIUM"
+                elif gui_effort == "minimal": target_level = "MINIMAL"
+                elif gui_effort == "low": target_level = "LOW"
+                # high/xhigh remains HIGH
+            # Gemini 3 Pro (Preview) mainly targets Low/High
             else:
-                gen_config["temperature"] = kwargs.get("temperature", 0.7)
-
-            # Create Config object
-            config = genai_types.GenerateContentConfig(
-                safety_settings=self._SAFETY_SETTINGS,
-                **gen_config
-            )
-
-            # 1. API Call: Generate Content
-            response = self.client.models.generate_content(
-                model=model,
-                contents=prompt,
-                config=config
-            )
-
-            response_text = response.text or ""
-            output_chars = len(response_text)
-
-            # Extract Thought Signature (if available in the new SDK response)
-            thought_signature = getattr(response, "thought_signature", None)
-
-            # ---------------------------------------------------------
-            # TOKEN COUNTING LOGIC (Hybrid: Metadata + Estimation)
-            # ---------------------------------------------------------
-            input_tokens = None
-            output_tokens = None
-            total_tokens = None
-
-            # Method 1: Try to extract exact data from response (free)
-            if hasattr(response, 'usage_metadata') and response.usage_metadata:
-                input_tokens = response.usage_metadata.prompt_token_count
-                output_tokens = response.usage_metadata.candidates_token_count
-                total_tokens = response.usage_metadata.total_token_count
-                logging.debug(f"Gemini Tokens (Metadata): In={input_tokens}, Out={output_tokens}")
-
-            # Method 2: Fallback estimation (if metadata is missing)
-            if input_tokens is None:
-                input_tokens = input_chars // 3
+                if gui_effort in ["low", "minimal"]: target_level = "LOW"
+                # medium/high/xhigh -> HIGH
             
-            if output_tokens is None:
-                output_tokens = output_chars // 3
-
-            if total_tokens is None:
-                total_tokens = (input_tokens or 0) + (output_tokens or 0)
-            # ---------------------------------------------------------
-
-            logging.info(f"Gemini response OK. Output: {output_chars} chars.")
-
-            return {
-                "response": response_text,
-                "error": False,
-                "input_chars": input_chars,
-                "output_chars": output_chars,
-                "input_tokens": input_tokens,
-                "output_tokens": output_tokens,
-                "total_tokens": total_tokens,
-                "reasoning_tokens": None, # Gemini API currently lumps this into output tokens
-                "status_message": "Success",
-                "thought_signature": thought_signature
+            gen_config["thinking_config"] = {
+                "include_thoughts": True,
+                "thinking_level": target_level
             }
 
-        except Exception as e:
-            return self._handle_error(e, model, input_chars)
+        # MODE 3: Gemini 2.5 Series (Thinking Budget - Token Based)
+        elif is_gemini_2_5:
+            gen_config["temperature"] = 1.0 
+            
+            # Map GUI effort levels to specific token budgets
+            budget_map = {
+                "minimal": 1024,  # Just a scratchpad
+                "low": 2048,
+                "medium": 8192,   # Sweet spot for 2.5 Pro
+                "high": 16384,
+                "xhigh": 32768    # Deep analysis (2.5 Pro only)
+            }
+            budget = budget_map.get(gui_effort, 8192) # Default to Medium
+            
+            gen_config["thinking_config"] = {
+                "include_thoughts": True,
+                "thinking_budget": budget
+            }
+        
+        # MODE 4: Legacy / Other
+        else:
+            gen_config["temperature"] = kwargs.get("temperature", 0.7)
+
+        # Create Config object
+        return genai_types.GenerateContentConfig(
+            safety_settings=self._SAFETY_SETTINGS,
+            **gen_config
+        )
+
+    @staticmethod
+    def _build_response(response_text: str, usage_metadata: Any, thought_signature: Optional[str],
+                        input_chars: int) -> AIResponse:
+        """Maps the generated text and usage metadata to the AIResponse format."""
+        output_chars = len(response_text)
+
+        # ---------------------------------------------------------
+        # TOKEN COUNTING LOGIC (Hybrid: Metadata + Estimation)
+        # ---------------------------------------------------------
+        input_tokens = None
+        output_tokens = None
+        total_tokens = None
+
+        # Method 1: Try to extract exact data from response (free)
+        if usage_metadata:
+            input_tokens = usage_metadata.prompt_token_count
+            output_tokens = usage_metadata.candidates_token_count
+            total_tokens = usage_metadata.total_token_count
+            logging.debug(f"Gemini Tokens (Metadata): In={input_tokens}, Out={output_tokens}")
+
+        # Method 2: Fallback estimation (if metadata is missing)
+        if input_tokens is None:
+            input_tokens = input_chars // 3
+        
+        if output_tokens is None:
+            output_tokens = output_chars // 3
+
+        if total_tokens is None:
+            total_tokens = (input_tokens or 0) + (output_tokens or 0)
+        # ---------------------------------------------------------
+
+        return {
+            "response": response_text,
+            "error": False,
+            "input_chars": input_chars,
+            "output_chars": output_chars,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": total_tokens,
+            "reasoning_tokens": None, # Gemini API currently lumps this into output tokens
+            "status_message": "Success",
+            "thought_signature": thought_signature
+        }
+
+
+    def _retry_after(self, error: Exception) -> Optional[float]:
+        """
+        Gemini reports its wait hint in the error details (google.rpc.RetryInfo, e.g. "retryDelay": "37s")
+        rather than in a Retry-After header; fall back to the headers otherwise.
+        """
+        details = getattr(error, "details", None)
+        if isinstance(details, dict):
+            for item in details.get("error", {}).get("details", []) or []:
+                delay = item.get("retryDelay") if isinstance(item, dict) else None
+                if isinstance(delay, str) and delay.endswith("s"):
+                    try:
+                        return float(delay[:-1])
+                    except ValueError:
+                        pass
+        return super()._retry_after(error)
 
     def _handle_error(self, error: Exception, model: str, prompt_len: int) -> AIResponse:
         """
@@ -5,14 +5,19 @@ OpenAI and OpenAI-Compatible API Provider Implementation.
 
 This module provides a generic interface for any service that adheres to the
 OpenAI API specification (e.g., DeepSeek, Mistral, DeepInfra, Anthropic).
-It supports both the standard Chat Completions API and the newer Responses API (GPT-5+).
+It supports both the standard Chat Completions API and the newer Responses API (GPT-5+),
+with or without streaming of the generated text, from threads (OpenAI client) or
+from asyncio code (AsyncOpenAI client).
 """
 
+import asyncio
 import logging
+import threading
+import weakref
 import traceback
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator
 
-from .base_provider import AIProvider, AIResponse
+from .base_provider import AIProvider, AIResponse, StreamChunk
 from core.version import APP_NAME
 
 # Constant for logging
@@ -20,10 +25,11 @@ _MAX_LOG_ERROR_LENGTH = 500
 
 # Import external library with error handling
 try:
-    from openai import OpenAI, APIStatusError, BadRequestError, RateLimitError
+    from openai import OpenAI, AsyncOpenAI, APIStatusError, BadRequestError, RateLimitError
     OPENAI_AVAILABLE = True
 except ImportError:
     OpenAI = None
+    AsyncOpenAI = None
     APIStatusError = None
     BadRequestError = None
     RateLimitError = None
@@ -35,13 +41,16 @@ class OpenAICompatibleProvider(AIProvider):
     Flexible provider for handling OpenAI and compatible APIs (DeepSeek, Mistral, Anthropic, etc.).
     """
 
-    def __init__(self, api_key: str, base_url: Optional[str] = None, provider_name: str = "OpenAI"):
+    def __init__(self, api_key: str, base_url: Optional[str] = None, provider_name: str = "OpenAI",
+                 stream_usage: Optional[bool] = None):
         """
         Initialize the OpenAI client.
         Args:
             api_key (str): API key.
             base_url (Optional[str]): Custom endpoint (if not using the official OpenAI API).
             provider_name (str): Name of the provider for logging purposes (e.g., "DeepSeek", "Anthropic").
+            stream_usage (Optional[bool]): Request token usage in chat streams ('stream_options.include_usage').
+                Compatible endpoints may reject the option, so by default it is only sent to the official API.
         """
         if not OPENAI_AVAILABLE:
             raise ImportError("The 'openai' package must be installed to use OpenAICompatibleProvider.")
@@ -49,39 +58,121 @@ class OpenAICompatibleProvider(AIProvider):
         super().__init__(api_key)
         self.provider_name = provider_name
         self.base_url = base_url
+        if stream_usage is None:
+            stream_usage = not base_url or "api.openai.com" in base_url
+        self.stream_usage = stream_usage
 
         try:
-            self.client = OpenAI(api_key=api_key, base_url=base_url)
+            # SDK-internal retries are disabled: AIProvider.get_response applies the shared retry policy
+            self.client = OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
             logging.info(f"[{APP_NAME}] OpenAI client configured: {provider_name} (URL: {base_url or 'Default'})")
         except Exception as e:
             logging.error(f"Client init error ({provider_name}): {e}", exc_info=True)
             raise RuntimeError(f"Failed to configure client ({provider_name}): {e}") from e
 
-    def get_response(self, model: str, prompt: str, **kwargs) -> AIResponse:
+        # Async clients, one per event loop (a client's connection pool is bound to the loop it was created in);
+        # a client goes away with its loop, so threads that run their own loops do not replace each other's client
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+        self._async_clients_lock = threading.Lock()
+
+    def _generate(self, model: str, prompt: str, **kwargs) -> AIResponse:
         """
         Get response using the appropriate API endpoint.
         Uses 'Responses API' for GPT-5/o-series and 'Chat Completions' for legacy/compatible models.
         """
         input_chars = len(prompt)
-        
-        # Detect GPT-5 and O-series (Requires the new v1/responses endpoint)
-        use_responses_api = self.provider_name == "OpenAI" and (model.startswith('o') or model.startswith('gpt-5'))
 
-        try:
-            if use_responses_api:
-                return self._call_responses_api(model, prompt, input_chars, **kwargs)
-            else:
-                return self._call_chat_api(model, prompt, input_chars, **kwargs)
+        # Errors propagate to AIProvider.get_response (retry policy -> _handle_error)
+        if self._uses_responses_api(model):
+            return self._call_responses_api(model, prompt, input_chars, **kwargs)
+        else:
+            return self._call_chat_api(model, prompt, input_chars, **kwargs)
+
+    async def _generate_async(self, model: str, prompt: str, **kwargs) -> AIResponse:
+        """
+        Async counterpart of _generate() on the AsyncOpenAI client (same endpoints and parameters).
+        """
+        input_chars = len(prompt)
+        client = self._get_async_client()
+
+        if self._uses_responses_api(model):
+            logging.info(f"[{APP_NAME}] OpenAI Responses API async call ({model}).")
+            response = await client.responses.create(**self._responses_params(model, prompt, **kwargs))
+            return self._responses_result(response, input_chars)
 
-        except (APIStatusError, BadRequestError, RateLimitError, Exception) as e:
-            return self._handle_error(e, model, input_chars)
+        logging.info(f"[{APP_NAME}] {self.provider_name} Chat async call ({model}). Prompt: {input_chars} chars.")
+        response = await client.chat.completions.create(**self._chat_params(model, prompt, **kwargs))
+        content = response.choices[0].message.content or ""
+        logging.info(f"{self.provider_name} response OK. Output: {len(content)} chars.")
+        return self._chat_result(content, response.usage, input_chars)
+
+    def _get_async_client(self) -> "AsyncOpenAI":
+        """Returns the AsyncOpenAI client of the running event loop (its connection pool is bound to the loop)."""
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+                self._async_clients[loop] = client
+        return client
+
+    def _generate_stream(self, model: str, prompt: str, **kwargs) -> Iterator[StreamChunk]:
+        """
+        Streaming counterpart of _generate(): yields text deltas, then the complete AIResponse.
+        """
+        input_chars = len(prompt)
+        if self._uses_responses_api(model):
+            return self._stream_responses_api(model, prompt, input_chars, **kwargs)
+        return self._stream_chat_api(model, prompt, input_chars, **kwargs)
+
+    def _uses_responses_api(self, model: str) -> bool:
+        """GPT-5 and O-series models require the new v1/responses endpoint."""
+        return self.provider_name == "OpenAI" and (model.startswith('o') or model.startswith('gpt-5'))
 
     def _call_chat_api(self, model: str, prompt: str, input_chars: int, **kwargs) -> AIResponse:
         """
         Standard Chat Completions API call (GPT-4, DeepSeek, Mistral, Claude).
         """
         logging.info(f"[{APP_NAME}] {self.provider_name} Chat call ({model}). Prompt: {input_chars} chars.")
+
+        # API Call
+        response = self.client.chat.completions.create(**self._chat_params(model, prompt, **kwargs))
         
+        content = response.choices[0].message.content or ""
+        logging.info(f"{self.provider_name} response OK. Output: {len(content)} chars.")
+        return self._chat_result(content, response.usage, input_chars)
+
+    def _stream_chat_api(self, model: str, prompt: str, input_chars: int, **kwargs) -> Iterator[StreamChunk]:
+        """
+        Chat Completions call with 'stream=True': yields content deltas, then the AIResponse.
+        With 'stream_usage', usage arrives in the last chunk ('stream_options.include_usage');
+        otherwise the token counts are only filled in if the endpoint sends them anyway.
+        """
+        logging.info(f"[{APP_NAME}] {self.provider_name} Chat stream ({model}). Prompt: {input_chars} chars.")
+
+        params = self._chat_params(model, prompt, **kwargs)
+        if self.stream_usage:
+            params["stream_options"] = {"include_usage": True}
+        stream = self.client.chat.completions.create(**params, stream=True)
+
+        parts: List[str] = []
+        usage = None
+        with stream:
+            for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage = chunk.usage
+                if chunk.choices:
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+
+        content = "".join(parts)
+        logging.info(f"{self.provider_name} stream OK. Output: {len(content)} chars.")
+        yield self._chat_result(content, usage, input_chars)
+
+    def _chat_params(self, model: str, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Builds the Chat Completions request parameters (including provider-specific options)."""
         messages = [{"role": "user", "content": prompt}]
         
         # Base parameters
@@ -140,20 +231,16 @@ class OpenAICompatibleProvider(AIProvider):
 
         # --- Provider-specific extra parameters (e.g., DeepInfra stop tokens) ---
         params.update(self._get_provider_specific_params(model))
+        return params
 
-        # API Call
-        response = self.client.chat.completions.create(**params)
-        
-        content = response.choices[0].message.content or ""
-        usage = response.usage
-
+    @staticmethod
+    def _chat_result(content: str, usage: Any, input_chars: int) -> AIResponse:
+        """Maps a Chat Completions text and usage object to the AIResponse format."""
         # Safely extract token statistics
         p_tokens = usage.prompt_tokens if usage else 0
         c_tokens = usage.completion_tokens if usage else 0
         t_tokens = usage.total_tokens if usage else 0
 
-        logging.info(f"{self.provider_name} response OK. Output: {len(content)} chars.")
-
         return {
             "response": content,
             "error": False,
@@ -174,6 +261,35 @@ class OpenAICompatibleProvider(AIProvider):
         """
         logging.info(f"[{APP_NAME}] OpenAI Responses API call ({model}).")
 
+        # API Call (client.responses.create)
+        response = self.client.responses.create(**self._responses_params(model, prompt, **kwargs))
+        return self._responses_result(response, input_chars)
+
+    def _stream_responses_api(self, model: str, prompt: str, input_chars: int, **kwargs) -> Iterator[StreamChunk]:
+        """
+        Responses API call with 'stream=True': yields 'response.output_text.delta' events as text,
+        then the AIResponse built from the final response object (completed or incomplete).
+        """
+        logging.info(f"[{APP_NAME}] OpenAI Responses API stream ({model}).")
+
+        stream = self.client.responses.create(**self._responses_params(model, prompt, **kwargs), stream=True)
+
+        final = None
+        with stream:
+            for event in stream:
+                if event.type == "response.output_text.delta":
+                    yield event.delta
+                elif event.type in ("response.completed", "response.incomplete"):
+                    final = event.response
+                elif event.type in ("response.failed", "error"):
+                    raise RuntimeError(f"Responses API stream failed: {getattr(event, 'message', None) or event.type}")
+
+        if final is None:
+            raise RuntimeError("Responses API stream ended without a final response.")
+        yield self._responses_result(final, input_chars)
+
+    def _responses_params(self, model: str, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Builds the Responses API request parameters."""
         # 1. Input Format: MUST be a list [{"role": "user" ...}]
         api_input = [{"role": "user", "content": prompt}]
 
@@ -203,10 +319,11 @@ class OpenAICompatibleProvider(AIProvider):
             pass 
         elif effort == "none" and "temperature" in kwargs:
             api_params["temperature"] = kwargs["temperature"]
+        return api_params
 
-        # API Call (client.responses.create)
-        response = self.client.responses.create(**api_params)
-
+    @staticmethod
+    def _responses_result(response: Any, input_chars: int) -> AIResponse:
+        """Maps a Responses API response object to the AIResponse format."""
         content = response.output_text or ""
         usage = getattr(response, 'usage', None)
         
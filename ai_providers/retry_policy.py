@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+"""
+Retry Policy for AI Provider Calls.
+
+Decides whether and how long to wait before retrying a failed provider call:
+exponential backoff with full jitter, honoring server-provided 'Retry-After'
+hints, capped by a maximum number of attempts and a total deadline.
+"""
+
+import random
+import email.utils
+import time
+from typing import Any, Dict, Optional
+
+# HTTP status codes worth retrying (timeouts, conflicts, rate limits, server errors, overload)
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Status codes that signal provider pushback (used to shrink concurrency)
+THROTTLE_STATUS_CODES = {429, 503, 529}
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter.
+    Configured by the 'retry' section of config.json.
+    """
+
+    def __init__(self,
+                 max_attempts: int = 5,
+                 base_delay_seconds: float = 1.0,
+                 max_delay_seconds: float = 60.0,
+                 deadline_seconds: float = 300.0):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts (int): Total attempts including the first call (1 disables retries).
+            base_delay_seconds (float): Backoff base; attempt n waits up to base * 2^(n-1).
+            max_delay_seconds (float): Upper bound for a single wait.
+            deadline_seconds (float): No retry is started once this much time has passed since the first attempt.
+        """
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = max(0.0, float(base_delay_seconds))
+        self.max_delay = max(0.0, float(max_delay_seconds))
+        self.deadline = max(0.0, float(deadline_seconds))
+
+    @classmethod
+    def from_config(cls, retry_cfg: Optional[Dict[str, Any]]) -> "RetryPolicy":
+        """Builds a policy from the 'retry' config section (missing keys use defaults)."""
+        cfg = retry_cfg or {}
+        return cls(
+            max_attempts=cfg.get("max_attempts", 5),
+            base_delay_seconds=cfg.get("base_delay_seconds", 1.0),
+            max_delay_seconds=cfg.get("max_delay_seconds", 60.0),
+            deadline_seconds=cfg.get("deadline_seconds", 300.0)
+        )
+
+    def next_delay(self, attempt: int, started_at: float, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Computes the wait before the next attempt.
+
+        Args:
+            attempt (int): Number of the attempt that just failed (1-based).
+            started_at (float): time.monotonic() of the first attempt.
+            retry_after (float, optional): Server-provided wait hint in seconds.
+
+        Returns:
+            float | None: Seconds to wait, or None if no further attempt is allowed.
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        if retry_after is not None:
+            delay = min(max(0.0, retry_after), self.max_delay)
+        else:
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+        if time.monotonic() - started_at + delay > self.deadline:
+            return None
+        return delay
+
+
+def parse_retry_after(headers: Any) -> Optional[float]:
+    """
+    Reads a wait hint from HTTP response headers.
+    Supports 'retry-after-ms', 'retry-after' in seconds and 'retry-after' as an HTTP date.
+    """
+    if not headers:
+        return None
+
+    try:
+        value_ms = headers.get("retry-after-ms")
+        if value_ms:
+            return float(value_ms) / 1000.0
+
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            retry_at = email.utils.parsedate_to_datetime(value)
+            return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError, AttributeError):
+        return None
@@ -2,21 +2,37 @@
 
 """
 HTTP API Server for Sift AI.
+
+/v1/process runs a request while the client waits; /v1/process/stream runs it
+while streaming every item's result as it completes (NDJSON or Server-Sent
+Events); /v1/process/tokens streams the model output of a single prompt as it
+is generated; /v1/jobs runs it as a background job that is polled (GET) or
+cancelled (DELETE) by id.
+
+With "workers" > 1 in the 'server' config section, uvicorn runs several worker
+processes, each with its own controller. Jobs, caches and rate-limit buckets
+live in SQLite files, so every worker sees the same state.
 """
 
+import os
+import json
+import queue
 import logging
 import sys
+import threading
 import uvicorn
 from contextlib import asynccontextmanager
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Tuple, Iterator
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 # --- Project Module Imports ---
 try:
     from config_manager import ConfigManager
     from core.app_controller import AppController
+    from core.job_manager import JobManager, JobQueueFull
 except ImportError as e:
     print(f"CRITICAL ERROR: Failed to import required modules: {e}", file=sys.stderr)
     sys.exit(1)
@@ -29,6 +45,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(f"{APP_NAME}_API")
 
+# Events buffered between the processing thread and a slow streaming client (the batch waits beyond this)
+STREAM_QUEUE_SIZE = 64
+# Seconds without events after which an SSE comment keeps proxies from closing the stream
+STREAM_HEARTBEAT_SECONDS = 15
+
 
 # --- Data Models (Pydantic) ---
 
@@ -41,6 +62,7 @@ class HTMLOptions(BaseModel):
     )
     text_separator: str = Field("\n", description="Separator character for extracted text.")
     text_strip: bool = Field(True, description="Whether to strip whitespace from extracted text.")
+    backend: str = Field("bs4", description="HTML-to-text backend: 'bs4' (BeautifulSoup tree), or the faster streaming 'stream' / 'lxml'.")
 
 
 class DynamicOptions(BaseModel):
@@ -48,11 +70,23 @@ class DynamicOptions(BaseModel):
     enabled: bool = Field(False, description="Enable Playwright for dynamic content.")
     scroll: bool = Field(False, description="Enable infinite scrolling simulation.")
     max_scrolls: int = Field(10, description="Maximum number of scroll steps.")
+    scroll_step_timeout_ms: Optional[int] = Field(None, description="Stop scrolling when a step adds no content within this time. Default: config.")
+    scroll_quiet_ms: Optional[int] = Field(None, description="Network/DOM quiet period that ends a scroll step. Default: config.")
+    extract_in_browser: Optional[bool] = Field(
+        None,
+        description="Extract the visible text (innerText) inside the browser instead of returning the HTML (ignored with send_raw_html). Default: config."
+    )
     wait_selector: Optional[str] = Field(None, description="CSS selector to wait for before extraction.")
     remove_selectors: List[str] = Field(
         default_factory=list, 
         description="CSS selectors to remove from DOM via JavaScript."
     )
+    resource_profile: Optional[str] = Field(
+        None,
+        description="Request blocking: 'text' (drop images, media, fonts and analytics hosts) or 'full'. Default: 'resource_profile' in config."
+    )
+    block_resource_types: Optional[List[str]] = Field(None, description="Resource types to abort (e.g. 'image', 'font'). Overrides the config list.")
+    block_url_patterns: Optional[List[str]] = Field(None, description="Host suffixes or URL glob patterns to abort. Overrides the config list.")
 
 
 class AgentRequest(BaseModel):
@@ -72,8 +106,12 @@ class AgentRequest(BaseModel):
     verbosity: str = Field("medium", description="Verbosity level (e.g., for GPT-5.1).")
     
     # Execution Options
-    delay: float = Field(1.0, description="Delay between batch items in seconds.")
+    delay: float = Field(0.0, description="Extra delay between batch AI calls in seconds (quotas are enforced by 'rate_limits' in config.json).")
+    workers: Optional[int] = Field(None, description="Batch items processed concurrently (overrides the 'concurrency' config section).")
+    no_cache: bool = Field(False, description="If True, bypasses the AI response cache.")
+    force_refresh: bool = Field(False, description="If True, bypasses the HTTP cache of the static web loader (pages are re-downloaded).")
     send_raw_html: bool = Field(False, description="If True, sends raw HTML instead of cleaned text.")
+    async_fetch: bool = Field(False, description="BatchURLList: Download all URLs concurrently (async, static engine) and process pages as they arrive.")
     output_dir: Optional[str] = Field(None, description="Override the default output directory.")
 
     # Batch Directory Options
@@ -90,6 +128,7 @@ class AppContext:
     """Holds the application singleton instances."""
     controller: Optional[AppController] = None
     config: Optional[ConfigManager] = None
+    jobs: Optional[JobManager] = None
 
 app_context = AppContext()
 
@@ -106,8 +145,13 @@ async def lifespan(app: FastAPI):
             sys.exit(1)
             
         controller = AppController(config_manager=config)
+        server_conf = config.get("server", {})
+        if int(server_conf.get("workers", 1)) > 1:
+            # One quota for all worker processes
+            controller.rate_limiter.use_shared_store(server_conf.get("rate_limit_store", "cache/rate_limits.sqlite"))
         app_context.config = config
         app_context.controller = controller
+        app_context.jobs = JobManager.from_config(controller.process_headless, config.get("jobs", {}))
         
         providers = controller.get_available_providers()
         logger.info(f"AI Engine Ready. Active Providers: {providers}")
@@ -117,6 +161,10 @@ async def lifespan(app: FastAPI):
         sys.exit(1)
     finally:
         logger.info("--- SHUTDOWN: Cleaning up resources ---")
+        if app_context.jobs:
+            app_context.jobs.shutdown()
+        if app_context.controller:
+            app_context.controller.shutdown()
 
 
 # --- FastAPI Application ---
@@ -151,17 +199,28 @@ def get_providers() -> Dict[str, Dict[str, List[str]]]:
     return {"providers": full_schema}
 
 
-@app.post("/v1/process")
-def process_request(req: AgentRequest) -> Dict[str, Any]:
-    """
-    Main processing endpoint.
-    Accepts processing requests for text, files, or URLs and routes them to the AI engine.
-    """
+@app.get("/v1/cache/stats")
+def get_cache_stats() -> Dict[str, Any]:
+    """Returns hit/miss counters and store sizes of the caches."""
     if not app_context.controller:
         raise HTTPException(status_code=503, detail="System not initialized")
+    return app_context.controller.get_cache_stats()
 
-    logger.info(f"Incoming Request: Mode={req.mode} | AI={req.provider}/{req.model}")
 
+@app.delete("/v1/cache/{name}")
+def clear_cache(name: str) -> Dict[str, Any]:
+    """Invalidates a cache ('responses', 'extraction', 'http' or 'all')."""
+    if not app_context.controller:
+        raise HTTPException(status_code=503, detail="System not initialized")
+    try:
+        removed = app_context.controller.clear_cache(name)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    return {"status": "cleared", "cache": name, "removed_entries": removed}
+
+
+def _to_controller_call(req: AgentRequest) -> Tuple[str, Dict[str, Any]]:
+    """Translates an API request into the controller's (mode, options) (HTTP 400 on an unknown mode)."""
     # Map external API mode strings to internal AppController constants
     mode_mapping = {
         "DirectInput": "Direct Input",
@@ -189,16 +248,36 @@ def process_request(req: AgentRequest) -> Dict[str, Any]:
         "reasoning_effort": req.reasoning_effort,
         "verbosity": req.verbosity,
         "delay": req.delay,
+        "max_workers": req.workers,
+        "no_cache": req.no_cache,
+        "force_refresh": req.force_refresh,
         "output_dir": req.output_dir,
         "send_raw_html": req.send_raw_html,
+        "async_fetch": req.async_fetch,
         "recursive": req.recursive,
         "file_type": req.file_type,
         "html_options": html_opts,
         "dynamic_options": dyn_opts
     }
+    return internal_mode, options_dict
+
+
+@app.post("/v1/process")
+async def process_request(req: AgentRequest) -> Dict[str, Any]:
+    """
+    Main processing endpoint.
+    Accepts processing requests for text, files, or URLs and routes them to the AI engine.
+    Single-prompt modes await the model call on the event loop (no server thread is held
+    while the model generates); batch modes run on a worker thread.
+    """
+    if not app_context.controller:
+        raise HTTPException(status_code=503, detail="System not initialized")
+
+    logger.info(f"Incoming Request: Mode={req.mode} | AI={req.provider}/{req.model}")
+    internal_mode, options_dict = _to_controller_call(req)
 
     try:
-        results = app_context.controller.process_headless(
+        results = await app_context.controller.process_headless_async(
             mode=internal_mode,
             prompt=req.prompt,
             input_data=req.input_data,
@@ -218,6 +297,181 @@ def process_request(req: AgentRequest) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Internal Logic Error: {str(e)}")
 
 
+@app.post("/v1/process/stream")
+def process_request_stream(req: AgentRequest, format: str = "ndjson") -> StreamingResponse:
+    """
+    Streaming variant of /v1/process: emits events while the request runs instead of one final array.
+
+    Events: 'start' {total}, 'progress' {index, total, item} when a batch item starts,
+    'item' {index, result} as soon as an item's result is ready, and a final
+    'end' {status, total, counts}. format=ndjson (default) writes one JSON object per line
+    with an 'event' field; format=sse writes Server-Sent Events. Disconnecting cancels
+    the items that have not started yet.
+    """
+    if not app_context.controller:
+        raise HTTPException(status_code=503, detail="System not initialized")
+    _check_stream_format(format)
+
+    logger.info(f"Incoming Stream Request: Mode={req.mode} | AI={req.provider}/{req.model}")
+    internal_mode, options_dict = _to_controller_call(req)
+    return _streaming_response(_stream_events(internal_mode, req.prompt, req.input_data, options_dict, format), format)
+
+
+@app.post("/v1/process/tokens")
+def process_request_tokens(req: AgentRequest, format: str = "ndjson") -> StreamingResponse:
+    """
+    Streams the model output of a single prompt (modes DirectInput, SingleFile, URL) as it is generated.
+
+    Events: 'start' {source} once the prompt is prepared, 'delta' {text} per text chunk, and a
+    final 'result' with the same result object as /v1/process (usage, saved_path). Input errors
+    end the stream with an error 'result' right away. format=ndjson (default) or sse.
+    """
+    if not app_context.controller:
+        raise HTTPException(status_code=503, detail="System not initialized")
+    _check_stream_format(format)
+    if req.mode not in ("DirectInput", "SingleFile", "URL"):
+        raise HTTPException(status_code=400, detail=f"Token streaming supports the modes DirectInput, SingleFile and URL, not {req.mode}.")
+
+    logger.info(f"Incoming Token Stream Request: Mode={req.mode} | AI={req.provider}/{req.model}")
+    internal_mode, options_dict = _to_controller_call(req)
+    events = app_context.controller.stream_headless(internal_mode, req.prompt, req.input_data, options_dict)
+    return _streaming_response(_format_token_events(events, format), format)
+
+
+def _format_token_events(events: Iterator[Tuple[str, Dict[str, Any]]], fmt: str) -> Iterator[str]:
+    """Formats the token stream; closing it (client disconnected) closes the model stream and frees its slot."""
+    try:
+        for event, data in events:
+            yield _format_event(event, data, fmt)
+    finally:
+        events.close()
+
+
+def _check_stream_format(fmt: str) -> None:
+    if fmt not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail=f"Invalid format: {fmt}. Valid options: ['ndjson', 'sse']")
+
+
+def _streaming_response(chunks: Iterator[str], fmt: str) -> StreamingResponse:
+    """Wraps formatted events in a non-buffered streaming response."""
+    media_type = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+    return StreamingResponse(chunks, media_type=media_type, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+def _format_event(event: str, data: Dict[str, Any], fmt: str) -> str:
+    """Formats one event as an SSE message or as an NDJSON line (with an 'event' field)."""
+    if fmt == "sse":
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+    return json.dumps({"event": event, **data}, ensure_ascii=False, default=str) + "\n"
+
+
+def _stream_events(mode: str, prompt: str, input_data: Any, options: Dict[str, Any], fmt: str) -> Iterator[str]:
+    """Runs the request on a worker thread and yields its listener events, formatted, as they arrive."""
+    events: queue.Queue = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+    cancel = threading.Event()
+
+    def _listener(event: str, data: Dict[str, Any]) -> None:
+        # Blocks while the client lags behind (backpressure) and gives up once it has gone
+        while not cancel.is_set():
+            try:
+                events.put((event, data), timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def _run() -> None:
+        end: Dict[str, Any] = {"status": "completed"}
+        try:
+            app_context.controller.process_headless(
+                mode, prompt, input_data, options,
+                listener=_listener, cancel_event=cancel, keep_results=False
+            )
+        except Exception as e:
+            logger.critical(f"Internal Processing Error (stream): {e}", exc_info=True)
+            end = {"status": "failed", "error": str(e)}
+        _listener("end", end)
+
+    threading.Thread(target=_run, name="stream-request", daemon=True).start()
+
+    total = 0
+    counts: Dict[str, int] = {}
+    try:
+        while True:
+            try:
+                event, data = events.get(timeout=STREAM_HEARTBEAT_SECONDS)
+            except queue.Empty:
+                if fmt == "sse":
+                    yield ": keep-alive\n\n"
+                continue
+
+            if event == "start":
+                total = data["total"]
+            elif event == "item":
+                status = data["result"].get("status", "unknown")
+                counts[status] = counts.get(status, 0) + 1
+            elif event == "end":
+                data = {**data, "total": total, "counts": counts}
+
+            yield _format_event(event, data, fmt)
+            if event == "end":
+                break
+    finally:
+        # Normal end, or the client disconnected: items not started yet are skipped
+        cancel.set()
+
+
+@app.post("/v1/jobs", status_code=202)
+def submit_job(req: AgentRequest) -> Dict[str, Any]:
+    """
+    Queues a processing request as a background job and returns its id at once.
+    Responds 429 (with Retry-After) when the job queue is full.
+    """
+    if not app_context.jobs:
+        raise HTTPException(status_code=503, detail="System not initialized")
+
+    internal_mode, options_dict = _to_controller_call(req)
+    try:
+        job = app_context.jobs.submit(internal_mode, req.prompt, req.input_data, options_dict)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+    logger.info(f"Job {job['job_id']} submitted: Mode={req.mode} | AI={req.provider}/{req.model}")
+    return job
+
+
+@app.get("/v1/jobs")
+def list_jobs() -> Dict[str, Any]:
+    """Lists the known jobs (without results) and the job counters."""
+    if not app_context.jobs:
+        raise HTTPException(status_code=503, detail="System not initialized")
+    return {
+        "jobs": app_context.jobs.list(),
+        "stats": app_context.jobs.stats()
+    }
+
+
+@app.get("/v1/jobs/{job_id}")
+def get_job(job_id: str, results: bool = True) -> Dict[str, Any]:
+    """Returns a job's status and progress, plus the results finished so far (unless results=false)."""
+    if not app_context.jobs:
+        raise HTTPException(status_code=503, detail="System not initialized")
+    job = app_context.jobs.get(job_id, include_results=results)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+
+@app.delete("/v1/jobs/{job_id}")
+def cancel_job(job_id: str) -> Dict[str, Any]:
+    """Cancels a job: a queued job never starts, a running batch skips the items not started yet."""
+    if not app_context.jobs:
+        raise HTTPException(status_code=503, detail="System not initialized")
+    job = app_context.jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+
 if __name__ == "__main__":
     try:
         # Load configuration for server settings
@@ -226,10 +480,21 @@ if __name__ == "__main__":
         
         host = server_conf.get("host", "0.0.0.0")
         port = int(server_conf.get("port", 8000))
+        workers = max(1, int(server_conf.get("workers", 1)))
         
-        logger.info(f"Starting server on {host}:{port}...")
+        logger.info(f"Starting server on {host}:{port} with {workers} worker process(es)...")
         
-        uvicorn.run(app, host=host, port=port)
+        # Worker processes import the app by name (each one runs its own lifespan/controller).
+        # A worker still importing the provider SDKs must not be taken for a hung one.
+        uvicorn.run(
+            "api_server:app",
+            app_dir=os.path.dirname(os.path.abspath(__file__)),
+            host=host,
+            port=port,
+            workers=workers,
+            timeout_keep_alive=int(server_conf.get("timeout_keep_alive", 5)),
+            timeout_worker_healthcheck=int(server_conf.get("timeout_worker_healthcheck", 30))
+        )
         
     except Exception as e:
         logger.critical(f"Server startup failed: {e}")
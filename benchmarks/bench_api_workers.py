@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: API server throughput vs number of worker processes.
+
+Starts api_server.py in a temporary working directory (its own config.json,
+caches and job store) once per worker count and sends SingleFile requests for
+large HTML files from several client threads. Extracting the text is CPU-bound
+Python work, so with one worker concurrent requests queue up behind the GIL;
+more workers spread them across cores (up to the number of cores).
+
+The extraction and response caches are disabled, so every request parses its
+file. Without an API key for --provider the request ends with a "provider not
+available" result right after the extraction, which is exactly the part that is
+measured; configure a key in the generated config to include model calls.
+
+Usage:
+    python benchmarks/bench_api_workers.py --workers 1,2,4 --requests 200 --clients 16
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import socket
+import argparse
+import tempfile
+import statistics
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import requests
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+_WORDS = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+          "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud").split()
+
+
+def _make_html(path: str, paragraphs: int, rng: random.Random) -> None:
+    body = "".join(
+        f"<div><p>{' '.join(rng.choice(_WORDS) for _ in range(80))}</p><script>var x={i};</script></div>"
+        for i in range(paragraphs)
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"<html><head><title>Doc</title></head><body>{body}</body></html>")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _write_config(workdir: str, port: int, workers: int) -> None:
+    config = {
+        "server": {"host": "127.0.0.1", "port": port, "workers": workers},
+        "response_cache": {"enabled": False},
+        "extraction_cache": {"enabled": False}
+    }
+    with open(os.path.join(workdir, "config.json"), "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=4)
+
+
+def _wait_ready(base_url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{base_url}/health", timeout=1).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError("API server did not become ready.")
+
+
+def _run(workers: int, files: List[str], args: argparse.Namespace, workdir: str) -> None:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    _write_config(workdir, port, workers)
+
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "api_server.py")],
+        cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        _wait_ready(base_url)
+        # Every worker answers /health; give the others time to finish their startup too
+        time.sleep(args.warmup)
+
+        session = requests.Session()
+        session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=args.clients))
+
+        def _request(i: int) -> float:
+            body = {
+                "mode": "SingleFile", "prompt": "Summarize.", "input_data": files[i % len(files)],
+                "provider": args.provider, "model": args.model, "no_cache": True
+            }
+            t0 = time.perf_counter()
+            response = session.post(f"{base_url}/v1/process", json=body, timeout=300)
+            response.raise_for_status()
+            return time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            latencies = sorted(pool.map(_request, range(args.requests)))
+        elapsed = time.perf_counter() - t0
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+    print(f"workers={workers:<3} {args.requests / elapsed:8.1f} req/s   "
+          f"p50 {statistics.median(latencies) * 1000:7.0f} ms   p95 {p95 * 1000:7.0f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts to compare.")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per run.")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent client threads.")
+    parser.add_argument("--files", type=int, default=20, help="Number of distinct HTML files.")
+    parser.add_argument("--paragraphs", type=int, default=2000, help="Paragraphs per HTML file (extraction cost).")
+    parser.add_argument("--provider", default="Gemini-1")
+    parser.add_argument("--model", default="gemini-2.5-flash")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds to wait after the server is up.")
+    args = parser.parse_args()
+
+    worker_counts = [int(w) for w in args.workers.split(",") if w.strip()]
+    workdir = tempfile.mkdtemp(prefix="bench_api_workers_")
+    try:
+        rng = random.Random(42)
+        files = []
+        for i in range(args.files):
+            path = os.path.join(workdir, f"doc_{i}.html")
+            _make_html(path, args.paragraphs, rng)
+            files.append(path)
+
+        print(f"{args.requests} SingleFile requests, {args.clients} clients, {args.files} files "
+              f"of {os.path.getsize(files[0]) // 1024} KB, {os.cpu_count()} CPU cores")
+        for workers in worker_counts:
+            _run(workers, files, args, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: async model calls through the rate limiter, in-memory vs shared buckets.
+
+Runs N concurrent get_response_async() calls of a stub provider (a fixed
+asyncio.sleep per call, no network) on one event loop, like the API server's
+/v1/process path. With --shared the limiter uses use_shared_store(), as with
+a multi-worker API server. A second thread then holds the SQLite write lock
+for --lock-ms at a time (another worker reserving quota), so bucket updates
+must wait for the lock.
+
+A ticker task measures event loop lag. Shared-store updates run on worker
+threads, so a held lock should only delay the calls that wait for it, not the
+loop. A max lag close to --lock-ms means the loop blocked on SQLite.
+
+Usage:
+    python benchmarks/bench_async_rate_limiter.py --calls 500 --lock-ms 200
+"""
+
+import os
+import sys
+import time
+import shutil
+import sqlite3
+import asyncio
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ai_providers.base_provider import AIProvider, AIResponse
+from core.rate_limiter import RateLimiter
+
+
+class _StubProvider(AIProvider):
+    """Answers every prompt after `latency_s`, reporting a fixed token count."""
+
+    def __init__(self, latency_s: float):
+        super().__init__("bench-key")
+        self.latency_s = latency_s
+
+    def _generate(self, model: str, prompt: str, **kwargs) -> AIResponse:
+        raise NotImplementedError
+
+    async def _generate_async(self, model: str, prompt: str, **kwargs) -> AIResponse:
+        await asyncio.sleep(self.latency_s)
+        return {"response": "ok", "error": False, "input_chars": len(prompt), "output_chars": 2,
+                "input_tokens": 10, "output_tokens": 2, "total_tokens": 12, "reasoning_tokens": None,
+                "status_message": "Success", "thought_signature": None}
+
+    def _handle_error(self, error: Exception, model: str, prompt_len: int) -> AIResponse:
+        raise error
+
+
+def _hold_lock(path: str, hold_s: float, stop: threading.Event) -> None:
+    """Repeatedly takes the store's write lock for `hold_s`, like a busy concurrent worker."""
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    try:
+        while not stop.is_set():
+            conn.execute("BEGIN IMMEDIATE")
+            time.sleep(hold_s)
+            conn.execute("COMMIT")
+            time.sleep(0.01)
+    finally:
+        conn.close()
+
+
+async def _run(provider: _StubProvider, calls: int) -> tuple:
+    lags = []
+    done = asyncio.Event()
+
+    async def _ticker() -> None:
+        interval = 0.01
+        while not done.is_set():
+            t0 = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - t0 - interval)
+
+    ticker = asyncio.create_task(_ticker())
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*(provider.get_response_async("stub-model", f"prompt {i}") for i in range(calls)))
+    elapsed = time.perf_counter() - t0
+    done.set()
+    await ticker
+    errors = sum(1 for r in results if r["error"])
+    return elapsed, max(lags or [0.0]), errors
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=500, help="Concurrent async calls per run.")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Stub model latency per call.")
+    parser.add_argument("--lock-ms", type=float, default=200.0, help="How long the competing writer holds the store lock.")
+    args = parser.parse_args()
+
+    # Generous limits: the benchmark measures bucket I/O, not quota waits
+    limits = {"default": {"requests_per_minute": 1_000_000, "tokens_per_minute": 100_000_000, "max_concurrency": 1000}}
+    workdir = tempfile.mkdtemp(prefix="bench_async_rate_limiter_")
+    print(f"{args.calls} async calls, {args.latency_ms:g} ms model latency, competing writer holds the lock {args.lock_ms:g} ms")
+    try:
+        for shared in (False, True):
+            limiter = RateLimiter(limits)
+            stop = threading.Event()
+            holder = None
+            if shared:
+                path = os.path.join(workdir, "rate_limits.db")
+                limiter.use_shared_store(path)
+                holder = threading.Thread(target=_hold_lock, args=(path, args.lock_ms / 1000.0, stop), daemon=True)
+                holder.start()
+
+            provider = _StubProvider(args.latency_ms / 1000.0)
+            provider.attach_rate_limiter(limiter, "Stub")
+            try:
+                elapsed, max_lag, errors = asyncio.run(_run(provider, args.calls))
+            finally:
+                stop.set()
+                if holder:
+                    holder.join()
+
+            name = "shared" if shared else "in-memory"
+            print(f"{name:10s} {elapsed:7.2f}s  {args.calls / elapsed:8.1f} calls/s  "
+                  f"max loop lag {max_lag * 1000:7.1f} ms  errors: {errors}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: serial vs process-pool text extraction.
+
+Generates a corpus of PDF, DOCX and HTML files in a temporary directory and
+extracts it twice: serially in this process (the pre-pool behavior) and with
+core.parallel_extractor.ParallelExtractor. The extraction cache is disabled, so
+both runs parse every file.
+
+With --big-pdf-pages, a single large PDF is also extracted serially and with
+page-range splitting across the pool.
+
+Usage:
+    python benchmarks/bench_extraction.py --files 120 --pages 20 --workers 0
+    python benchmarks/bench_extraction.py --files 0 --big-pdf-pages 2000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from typing import List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.text_extractor as text_extractor
+from core.parallel_extractor import ParallelExtractor
+
+_WORDS = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+          "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud").split()
+
+
+def _paragraph(rng: random.Random, words: int = 120) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _make_pdf(path: str, pages: int, rng: random.Random) -> None:
+    import fitz
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(40, 40, 560, 800), "\n\n".join(_paragraph(rng) for _ in range(6)), fontsize=9)
+    doc.save(path)
+    doc.close()
+
+
+def _make_docx(path: str, pages: int, rng: random.Random) -> None:
+    import docx
+    document = docx.Document()
+    for _ in range(pages * 6):
+        document.add_paragraph(_paragraph(rng))
+    document.save(path)
+
+
+def _make_html(path: str, pages: int, rng: random.Random) -> None:
+    body = "".join(f"<div><p>{_paragraph(rng)}</p><script>var x={i};</script></div>" for i in range(pages * 6))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"<html><head><style>p{{}}</style></head><body><nav>menu</nav>{body}</body></html>")
+
+
+def build_corpus(directory: str, files: int, pages: int) -> List[str]:
+    """Writes `files` documents (rotating PDF/DOCX/HTML) and returns their paths."""
+    rng = random.Random(42)
+    makers = []
+    if text_extractor._HAS_PDF:
+        makers.append((".pdf", _make_pdf))
+    if text_extractor._HAS_DOCX:
+        makers.append((".docx", _make_docx))
+    if text_extractor._HAS_BS4:
+        makers.append((".html", _make_html))
+    if not makers:
+        raise SystemExit("No extractor libraries installed (PyMuPDF, python-docx, beautifulsoup4).")
+
+    paths = []
+    for i in range(files):
+        ext, maker = makers[i % len(makers)]
+        path = os.path.join(directory, f"doc_{i:04d}{ext}")
+        maker(path, pages, rng)
+        paths.append(path)
+    return paths
+
+
+def _bench_corpus(tmp: str, args: argparse.Namespace) -> bool:
+    """Serial vs pooled extraction of many documents."""
+    t0 = time.perf_counter()
+    paths = build_corpus(tmp, args.files, args.pages)
+    corpus_mb = sum(os.path.getsize(p) for p in paths) / (1024 * 1024)
+    print(f"Corpus: {len(paths)} files, {corpus_mb:.1f} MB (generated in {time.perf_counter() - t0:.1f}s)")
+
+    t0 = time.perf_counter()
+    serial = [text_extractor.extract_text_from_file(p) for p in paths]
+    serial_s = time.perf_counter() - t0
+    print(f"Serial:  {serial_s:7.2f}s  ({len(paths) / serial_s:6.1f} files/s)")
+
+    extractor = ParallelExtractor(workers=args.workers)
+    try:
+        # Warm-up starts the worker processes, so the timing excludes interpreter start-up
+        extractor.extract_many(paths[:extractor.workers * 2])
+        t0 = time.perf_counter()
+        pooled = extractor.extract_many(paths)
+        pooled_s = time.perf_counter() - t0
+    finally:
+        extractor.shutdown()
+    print(f"Pooled:  {pooled_s:7.2f}s  ({len(paths) / pooled_s:6.1f} files/s, {extractor.workers} workers)")
+    print(f"Speedup: {serial_s / pooled_s:.2f}x")
+
+    mismatches = sum(1 for s, (p, _) in zip(serial, pooled) if s != p)
+    print(f"Output identical: {mismatches == 0}" + (f" ({mismatches} mismatches)" if mismatches else ""))
+    return mismatches == 0
+
+
+def _bench_big_pdf(tmp: str, args: argparse.Namespace) -> bool:
+    """Serial vs page-range-parallel extraction of one large PDF."""
+    path = os.path.join(tmp, "big.pdf")
+    _make_pdf(path, args.big_pdf_pages, random.Random(7))
+    print(f"Big PDF: {args.big_pdf_pages} pages, {os.path.getsize(path) / (1024 * 1024):.1f} MB")
+
+    t0 = time.perf_counter()
+    serial = text_extractor.extract_text_from_file(path)
+    serial_s = time.perf_counter() - t0
+    print(f"Serial:  {serial_s:7.2f}s")
+
+    extractor = ParallelExtractor(workers=args.workers, pdf_split_pages=1)
+    try:
+        # Warm-up starts the worker processes
+        warmup_dir = os.path.join(tmp, "warmup")
+        os.makedirs(warmup_dir)
+        extractor.extract_many(build_corpus(warmup_dir, extractor.workers, 1))
+        t0 = time.perf_counter()
+        split, _ = extractor.extract(path)
+        split_s = time.perf_counter() - t0
+    finally:
+        extractor.shutdown()
+    print(f"Split:   {split_s:7.2f}s  ({extractor.workers} page ranges)")
+    print(f"Speedup: {serial_s / split_s:.2f}x")
+    print(f"Output identical: {serial == split}")
+    return serial == split
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serial vs process-pool extraction benchmark.")
+    parser.add_argument("--files", type=int, default=120, help="Number of generated documents.")
+    parser.add_argument("--pages", type=int, default=20, help="Pages (or page-sized sections) per document.")
+    parser.add_argument("--workers", type=int, default=0, help="Pool size (0 = CPU count).")
+    parser.add_argument("--big-pdf-pages", type=int, default=0, help="Also benchmark one PDF with this many pages.")
+    args = parser.parse_args()
+
+    text_extractor.set_extraction_cache(None)
+
+    with tempfile.TemporaryDirectory(prefix="sift_bench_") as tmp:
+        ok = True
+        if args.files:
+            ok = _bench_corpus(tmp, args) and ok
+        if args.big_pdf_pages:
+            ok = _bench_big_pdf(tmp, args) and ok
+        return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: HTML-to-text backends.
+
+Extracts a fixed set of saved HTML pages with every backend of
+text_extractor (bs4 = BeautifulSoup tree, stream = stdlib streaming parser,
+lxml = libxml2 streaming parser) and reports throughput and whether the output
+matches the bs4 backend.
+
+Point --pages-dir at a directory of saved pages (e.g. a sample of a
+BatchURLList run). Without it, a deterministic synthetic set modeled on
+typical article pages (navigation, scripts, nested markup) is generated.
+
+Usage:
+    python benchmarks/bench_html.py --pages-dir saved_pages/ --repeat 3
+    python benchmarks/bench_html.py --pages 200
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from typing import Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.text_extractor as text_extractor
+from core import html_stream
+
+_WORDS = ("the court held that appeal statute evidence record party motion filed order "
+          "section review judgment claim district opinion trial counsel").split()
+
+
+def _synthetic_page(rng: random.Random, paragraphs: int) -> str:
+    """One article-like page: head with assets, navigation, scripts and nested body text."""
+    def words(n: int) -> str:
+        return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+    body = []
+    for i in range(paragraphs):
+        body.append(
+            f"<div class=\"block\"><h2>{words(4)}</h2><p>{words(60)} <a href=\"#r{i}\">{words(2)}</a> "
+            f"<b>{words(3)}</b> &amp; {words(20)}</p>"
+            f"<ul><li>{words(5)}</li><li>{words(5)}</li></ul></div>"
+        )
+        if i % 5 == 0:
+            body.append(f"<script>window.ads.push({{slot: {i}, words: '{words(10)}'}});</script>")
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>" + words(6) + "</title>"
+        "<link rel=\"stylesheet\" href=\"a.css\"><style>.block{margin:0}</style></head><body>"
+        "<header><nav><a href=\"/\">Home</a> " + words(8) + "</nav></header>"
+        "<main>" + "\n".join(body) + "</main>"
+        "<aside>" + words(30) + "</aside><footer>" + words(12) + "</footer></body></html>"
+    )
+
+
+def load_pages(pages_dir: str, count: int) -> Dict[str, str]:
+    """Reads saved pages from pages_dir, or generates `count` synthetic pages."""
+    if pages_dir:
+        pages = {}
+        for name in sorted(os.listdir(pages_dir)):
+            if os.path.splitext(name)[1].lower() in (".html", ".htm"):
+                content = text_extractor._read_text_file_safe(os.path.join(pages_dir, name))
+                if content is not None:
+                    pages[name] = content
+        return pages
+
+    rng = random.Random(1234)
+    return {f"page_{i:04d}.html": _synthetic_page(rng, rng.randint(20, 200)) for i in range(count)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="HTML-to-text backend benchmark.")
+    parser.add_argument("--pages-dir", help="Directory of saved .html pages.")
+    parser.add_argument("--pages", type=int, default=200, help="Number of synthetic pages (without --pages-dir).")
+    parser.add_argument("--repeat", type=int, default=1, help="Extract the set this many times per backend.")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages_dir, args.pages)
+    if not pages:
+        print("No pages found.")
+        return 1
+    total_mb = sum(len(c.encode("utf-8")) for c in pages.values()) / (1024 * 1024)
+    print(f"Pages: {len(pages)} ({total_mb:.1f} MB), repeat={args.repeat}")
+
+    backends: List[str] = ["bs4", "stream"] + (["lxml"] if html_stream._HAS_LXML else [])
+    outputs: Dict[str, Dict[str, str]] = {}
+    timings: Dict[str, float] = {}
+    for backend in backends:
+        opts = {"backend": backend}
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            outputs[backend] = {name: text_extractor.extract_text_from_html_content(c, opts) for name, c in pages.items()}
+        timings[backend] = time.perf_counter() - t0
+
+    baseline = timings["bs4"]
+    for backend in backends:
+        mismatches = [n for n, text in outputs[backend].items() if text != outputs["bs4"][n]]
+        mb_s = total_mb * args.repeat / timings[backend]
+        print(f"{backend:7s} {timings[backend]:8.2f}s  {mb_s:7.2f} MB/s  {baseline / timings[backend]:5.2f}x  "
+              f"identical to bs4: {len(pages) - len(mismatches)}/{len(pages)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: per-request connections vs the pooled WebLoader session.
+
+Starts a local keep-alive HTTP/1.1 server and fetches the same host N times
+from several threads (like a BatchURLList against one records site):
+
+    unpooled: module-level requests.get per URL (the previous static engine),
+              a new TCP connection per request.
+    pooled:   WebLoader's shared session, connections kept alive and reused.
+
+The server counts accepted connections. --connect-latency-ms delays every new
+connection on the server side to model the handshake cost (TCP + TLS round
+trips) of a remote host, which is what pooling saves.
+
+Usage:
+    python benchmarks/bench_http.py --requests 500 --threads 8 --connect-latency-ms 30
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import requests
+
+from core.web_loader import WebLoader, DEFAULT_USER_AGENT
+
+_PAGE = ("<html><body>" + "<p>record entry text</p>" * 200 + "</body></html>").encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    # Buffered writes: headers and body leave in one segment (like production servers)
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(_PAGE)))
+        self.end_headers()
+        self.wfile.write(_PAGE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency_s: float):
+        super().__init__(address, _Handler)
+        self.latency_s = latency_s
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    def finish_request(self, request, client_address):
+        # Simulated handshake: paid once per connection, in the connection's thread
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        super().finish_request(request, client_address)
+
+
+def _run(fetch, urls, threads: int) -> float:
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(fetch, urls))
+    elapsed = time.perf_counter() - t0
+    failures = sum(1 for ok in results if not ok)
+    if failures:
+        print(f"  ({failures} failed requests)")
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pooled vs unpooled static fetch benchmark.")
+    parser.add_argument("--requests", type=int, default=500, help="Number of fetches (same host).")
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent fetch threads (download_workers).")
+    parser.add_argument("--connect-latency-ms", type=float, default=20.0, help="Simulated handshake cost per new connection.")
+    args = parser.parse_args()
+
+    server = _CountingServer(("127.0.0.1", 0), args.connect_latency_ms / 1000.0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/record/{i}" for i in range(args.requests)]
+    print(f"{args.requests} requests, {args.threads} threads, {args.connect_latency_ms:g} ms per new connection")
+
+    def unpooled(url: str) -> bool:
+        response = requests.get(url, timeout=20, headers={'User-Agent': DEFAULT_USER_AGENT})
+        return response.status_code == 200
+
+    loader = WebLoader({"download_max_size_mb": 10})
+
+    def pooled(url: str) -> bool:
+        content, _, error = loader.fetch(url, use_dynamic=False)
+        return error is None and content is not None
+
+    try:
+        for name, fetch in (("unpooled", unpooled), ("pooled", pooled)):
+            server.connections = 0
+            elapsed = _run(fetch, urls, args.threads)
+            print(f"{name:9s} {elapsed:7.2f}s  {args.requests / elapsed:8.1f} req/s  connections opened: {server.connections}")
+    finally:
+        loader.close()
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""
+Cache Administration CLI for Sift AI.
+
+Shows statistics of the on-disk caches (AI responses, extracted text, HTTP responses) and
+invalidates them. The cache locations are read from config.json.
+
+Examples:
+    python cache_admin.py stats
+    python cache_admin.py clear extraction
+    python cache_admin.py clear all
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from typing import Dict, List, Optional
+
+# --- Bootstrap Path for Core Modules ---
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config_manager import ConfigManager
+from core.version import APP_NAME
+from core.disk_cache import SQLiteCache
+from core.response_cache import ResponseCache
+from core.extraction_cache import ExtractionCache
+from core.http_cache import HttpCache
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stderr)
+
+
+def _load_caches(config: ConfigManager) -> Dict[str, SQLiteCache]:
+    """Opens the caches configured in config.json (without starting the AI engine)."""
+    return {
+        "responses": ResponseCache.from_config(config.get("response_cache", {})),
+        "extraction": ExtractionCache.from_config(config.get("extraction_cache", {})),
+        "http": HttpCache.from_config(config.get("http_cache", {}))
+    }
+
+
+def run(args_list: Optional[List[str]] = None) -> int:
+    """
+    Main execution logic.
+
+    Returns:
+        int: Exit code (0: success, 1: error).
+    """
+    parser = argparse.ArgumentParser(description=f"{APP_NAME} - Cache Administration")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Show entry counts and sizes of all caches.")
+    clear_p = sub.add_parser("clear", help="Invalidate a cache.")
+    clear_p.add_argument("cache", choices=["responses", "extraction", "http", "all"], help="Cache to clear.")
+    args = parser.parse_args(args_list)
+
+    config = ConfigManager(headless_mode=True)
+    if not config.is_loaded:
+        print("Configuration failed to load.", file=sys.stderr)
+        return 1
+
+    caches = _load_caches(config)
+
+    if args.command == "stats":
+        print(json.dumps({name: cache.stats() for name, cache in caches.items()}, indent=2))
+        return 0
+
+    targets = caches.keys() if args.cache == "all" else [args.cache]
+    for name in targets:
+        removed = caches[name].clear()
+        print(f"Cleared '{name}' cache: {removed} entries removed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
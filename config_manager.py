@@ -39,7 +39,22 @@ class ConfigManager:
         "server": {
             "host": "0.0.0.0",
             "port": 8000,
-            "timeout_keep_alive": 5
+            "timeout_keep_alive": 5,
+            # Worker processes of the API server (one controller each, so requests use several cores).
+            # With more than one, jobs, caches and rate-limit buckets are shared through SQLite files.
+            "workers": 1,
+            "rate_limit_store": "cache/rate_limits.sqlite",
+            # Seconds a starting worker may take to answer the supervisor's health check
+            "timeout_worker_healthcheck": 30
+        },
+        "jobs": {
+            # Background jobs of the HTTP API (POST /v1/jobs): processed at once per worker / waiting (then HTTP 429)
+            "max_running": 2,
+            "max_queued": 32,
+            # Finished jobs (status and results) stay available for polling this long
+            "retention_minutes": 60,
+            # Job status and results (shared by all API worker processes)
+            "path": "cache/jobs.sqlite"
         },
         "models": {
             "Gemini-1": [
@@ -124,23 +139,111 @@ class ConfigManager:
             "provider": "Gemini-1",
             "model": "gemini-2.5-flash",
             "reasoning_effort": "medium",
-            "batch_delay_seconds": 1.0,
+            "batch_delay_seconds": 0.0,
             "use_dynamic_loader": False
         },
         "dynamic_loader": {
             "timeout_ms": 30000,
             "scroll": False,
             "max_scrolls": 10,
+            # Event-driven scroll: a step waits for growth + XHR/DOM quiet; no growth within the timeout stops
+            "scroll_step_timeout_ms": 4000,
+            "scroll_quiet_ms": 300,
+            # Extract the visible text inside the browser (innerText) instead of returning the HTML
+            "extract_in_browser": False,
             "wait_selector": "",
             "remove_selectors": [
                 "#onetrust-accept-btn-handler", 
                 ".cookie-banner", 
                 ".ad-container"
-            ]
+            ],
+            # Request blocking: "text" drops the resource types / URL patterns below, "full" loads everything
+            "resource_profile": "text",
+            "blocked_resource_types": ["image", "media", "font"],
+            # Host suffixes (e.g. "doubleclick.net") or glob patterns over the full URL
+            "blocked_url_patterns": [
+                "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+                "facebook.net", "scorecardresearch.com", "hotjar.com", "segment.io", "criteo.com", "taboola.com"
+            ],
+            # Batch URL modes render on one browser with async Playwright: pages at once, per host, time limit per page
+            "async_engine": True,
+            "async_pages": 8,
+            "async_per_host": 4,
+            "page_timeout_ms": 90000,
+            # Persistent Playwright browsers for single dynamic fetches (and batches with async_engine off)
+            "browsers": 2,
+            # Relaunch a browser after this many pages (0 = never) or when a page's JS heap exceeds recycle_heap_mb
+            "max_pages_per_browser": 100,
+            "recycle_heap_mb": 512
         },
         "limits": {
             "concatenated_max_chars": 1000000,
             "download_max_size_mb": 10
+        },
+        "http": {
+            # Shared keep-alive connection pool of the static web loader
+            "timeout_seconds": 20,
+            "pool_connections": 32,
+            "pool_maxsize": 16,
+            # Larger pools for hosts hit by big batches, e.g. {"records.example.gov": 32}
+            "host_pool_sizes": {},
+            # Transport-level retries (connect errors, 429/5xx) with exponential backoff
+            "retries": 2,
+            "retry_backoff_factor": 0.5,
+            "retry_status_codes": [429, 500, 502, 503, 504],
+            # Binary downloads (PDF, DOCX, ...) up to this size are extracted from memory, larger ones via a temp file
+            "in_memory_max_mb": 16,
+            # Async bulk fetch of URL lists (--async-fetch): downloads in flight overall / per host
+            "async_max_concurrency": 32,
+            "async_per_host": 8
+        },
+        "rate_limits": {
+            # Token buckets per provider ("OpenAI") or model ("OpenAI/gpt-5-mini"); 0 = unlimited.
+            "default": {"requests_per_minute": 0, "tokens_per_minute": 0}
+        },
+        "retry": {
+            # Exponential backoff with jitter for 429/5xx/timeouts (Retry-After is honored)
+            "max_attempts": 5,
+            "base_delay_seconds": 1.0,
+            "max_delay_seconds": 60.0,
+            "deadline_seconds": 300.0
+        },
+        "response_cache": {
+            # Content-addressed cache of AI responses (provider, model, parameters, full prompt)
+            "enabled": True,
+            "path": "cache/responses.sqlite",
+            "max_size_mb": 256,
+            "ttl_hours": 168
+        },
+        "extraction_cache": {
+            # Extracted text keyed by file content hash + extractor version (+ HTML options)
+            "enabled": True,
+            "path": "cache/extraction.sqlite",
+            "max_size_mb": 1024,
+            "ttl_hours": 0
+        },
+        "http_cache": {
+            # Static web responses with ETag/Last-Modified/Cache-Control; stale entries are revalidated (304)
+            "enabled": True,
+            "path": "cache/http.sqlite",
+            "max_size_mb": 512,
+            "ttl_hours": 0
+        },
+        "concurrency": {
+            # Number of batch items in the AI (generate) stage at once.
+            # Overrides: "provider_workers": {"OpenAI": 8}, "model_workers": {"OpenAI/gpt-5-mini": 16}
+            "default_workers": 4,
+            "provider_workers": {},
+            "model_workers": {},
+            # Worker pools of the other pipeline stages and the queue size between stages (0 = auto)
+            "download_workers": 8,
+            "extract_workers": 2,
+            "stage_queue_size": 0,
+            # Document parsing runs in worker processes ("process", 0 = one per CPU) or in the stage threads ("thread")
+            "extract_mode": "process",
+            "extract_processes": 0,
+            # PDFs with at least this many pages are split into page ranges across the pool (0 = never)
+            "pdf_split_pages": 200
         }
     }
 
@@ -9,21 +9,29 @@ message queues, and resource handling.
 """
 
 import queue
+import asyncio
 import threading
 import os
 import time
 import re
 import datetime
 import logging
-from typing import List, Optional, Dict, Any, Tuple, Callable, Union
+from typing import List, Optional, Dict, Any, Tuple, Callable, Union, Iterator
 from urllib.parse import urlparse
 
 # Project modules
 from core.version import APP_NAME, CORE_VERSION
 from config_manager import ConfigManager
 import core.text_extractor as text_extractor
-from core.web_loader import WebLoader
-from ai_providers.base_provider import AIProvider, AIResponse
+from core.web_loader import WebLoader, BinaryContent
+from core.batch_executor import BatchPipeline, PipelineStage, BatchCancelled
+from core.rate_limiter import RateLimiter
+from core.response_cache import ResponseCache
+from core.extraction_cache import ExtractionCache
+from core.http_cache import HttpCache
+from core.parallel_extractor import ParallelExtractor
+from ai_providers.base_provider import AIProvider, AIResponse, StreamChunk
+from ai_providers.retry_policy import RetryPolicy
 from ai_providers.gemini_provider import GeminiProvider, GEMINI_AVAILABLE
 from ai_providers.openai_provider import OpenAICompatibleProvider, OPENAI_AVAILABLE
 
@@ -59,12 +67,45 @@ class AppController:
         self.message_queue: queue.Queue = queue.Queue()
         self.providers: Dict[str, AIProvider] = {}
         
-        # Initialize the WebLoader with limits from config
+        # Initialize the WebLoader with limits from config (static responses go through the HTTP cache)
         limits = self.config_manager.get("limits", {})
-        self.web_loader = WebLoader(config_limits=limits)
+        self.http_cache = HttpCache.from_config(self.config_manager.get("http_cache", {}))
+        self.web_loader = WebLoader(
+            config_limits=limits,
+            http_config=self.config_manager.get("http", {}),
+            dynamic_config=self.config_manager.get("dynamic_loader", {}),
+            http_cache=self.http_cache
+        )
+
+        # Shared request/token quota and retry policy for every provider call (GUI, headless, API)
+        self.rate_limiter = RateLimiter(self.config_manager.get("rate_limits", {}))
+        self.retry_policy = RetryPolicy.from_config(self.config_manager.get("retry", {}))
+
+        # Content-addressed caches of AI responses and extracted document text
+        self.response_cache = ResponseCache.from_config(self.config_manager.get("response_cache", {}))
+        self.extraction_cache = ExtractionCache.from_config(self.config_manager.get("extraction_cache", {}))
+        text_extractor.set_extraction_cache(self.extraction_cache)
+
+        # Process pool for CPU-bound document parsing in batch modes
+        self.parallel_extractor = ParallelExtractor.from_config(self.config_manager.get("concurrency", {}))
         
         self._initialize_providers()
         
+    def shutdown(self) -> None:
+        """
+        Releases long-lived resources (browser pool, HTTP connections, extraction processes).
+        Called by the GUI on close, by headless mode on exit and by the API server lifespan.
+        """
+        logging.info("Controller shutdown: releasing browsers, connections and worker processes.")
+        try:
+            self.web_loader.close()
+        except Exception as e:
+            logging.warning(f"WebLoader shutdown error: {e}")
+        try:
+            self.parallel_extractor.shutdown()
+        except Exception as e:
+            logging.warning(f"Extraction pool shutdown error: {e}")
+
     def get_models_for_provider(self, provider_key: str) -> List[str]:
         """
         Returns the available models for a provider, filtering out restricted 
@@ -181,12 +222,70 @@ class AppController:
             self.providers[key] = OpenAICompatibleProvider(api_key, base_url=urls.get(key), provider_name=key)
         
         if key in self.providers:
+            self.providers[key].attach_rate_limiter(self.rate_limiter, key)
+            self.providers[key].retry_policy = self.retry_policy
             logging.info(f"Provider activated: {key}")
 
     def get_available_providers(self) -> List[str]:
         """Returns the list of active providers."""
         return sorted(list(self.providers.keys()))
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters and store sizes of the caches."""
+        return {
+            "responses": self.response_cache.stats(),
+            "extraction": self.extraction_cache.stats(),
+            "http": self.http_cache.stats()
+        }
+
+    def clear_cache(self, name: str) -> int:
+        """
+        Invalidates a cache.
+
+        Args:
+            name (str): "responses", "extraction", "http" or "all".
+
+        Returns:
+            int: Number of removed entries.
+        """
+        caches = {"responses": self.response_cache, "extraction": self.extraction_cache, "http": self.http_cache}
+        if name == "all":
+            return sum(cache.clear() for cache in caches.values())
+        if name not in caches:
+            raise ValueError(f"Unknown cache: {name}. Valid options: {list(caches.keys()) + ['all']}")
+        return caches[name].clear()
+
+    def _resolve_batch_workers(self, provider_key: str, model: str, options: Dict[str, Any]) -> int:
+        """
+        Determines how many batch items may be in flight at once.
+        Priority: explicit 'max_workers' option > model entry > provider entry > default.
+
+        Args:
+            provider_key (str): The provider identifier.
+            model (str): The model identifier.
+            options (Dict[str, Any]): Processing options (may contain 'max_workers').
+
+        Returns:
+            int: The worker count (at least 1).
+        """
+        override = options.get("max_workers")
+        if override:
+            return max(1, int(override))
+
+        concurrency_cfg = self.config_manager.get("concurrency", {})
+        model_workers = concurrency_cfg.get("model_workers", {})
+        provider_workers = concurrency_cfg.get("provider_workers", {})
+
+        # Model entries may be qualified ("OpenAI/gpt-5-mini") or bare ("gpt-5-mini")
+        for key in (f"{provider_key}/{model}", model):
+            if key in model_workers:
+                return max(1, int(model_workers[key]))
+
+        if provider_key in provider_workers:
+            return max(1, int(provider_workers[provider_key]))
+
+        return max(1, int(concurrency_cfg.get("default_workers", 4)))
+
     # --- GUI Processing Control ---
 
     def start_processing(self, mode: str, prompt: str, provider_key: str, model: str, options: Dict[str, Any]):
@@ -245,11 +344,7 @@ class AppController:
             return
 
         self.message_queue.put(("status", "Concatenating files..."))
-        contents = []
-        for path in paths:
-            text = text_extractor.extract_text_from_file(path, options.get('html_options'))
-            if text:
-                contents.append(f"--- {os.path.basename(path)} ---\n{text}")
+        contents = self._extract_files_for_concat(paths, options.get('html_options'))
         
         if not contents:
             self._report_error("Failed to extract content from files.", provider, model)
@@ -295,41 +390,24 @@ class AppController:
         """Generic loop for batch processing (URL list or File list) in GUI MODE."""
         total = len(items)
         self.message_queue.put(("batch_start", total))
-        delay = options.get("delay", 1.0)
-        
-        # Extract options for URL fetching
-        raw_html = options.get('send_raw_html', False)
-        html_opts = options.get('html_options', {})
-        dynamic_opts = options.get('dynamic_options')
 
-        for i, item in enumerate(items):
+        def _on_start(i: int, item: str):
             # Update display
             display_name = item[:60] if is_url_mode else os.path.basename(item)
             self.message_queue.put(("batch_progress", (i, total, display_name)))
 
-            # Extract content
-            content = None
-            source_info = ""
-            original_name = None
-            
-            if is_url_mode:
-                content, source_info, error = self._fetch_content_from_url(item, raw_html, html_opts, dynamic_opts)
-            else:
-                content = text_extractor.extract_text_from_file(item, html_opts)
-                source_info = f"FILE: {display_name}"
-                original_name = display_name
-                error = "Read failure" if content is None else None
-
+        def _generate(i: int, ctx: Dict[str, Any]):
             # AI call or report error
-            if content:
-                full_prompt = self._build_prompt(prompt, content, source_info)
-                self._run_ai_task(provider, model, full_prompt, source_info, is_batch=True, batch_item_id=item, original_filename=original_name, **options)
+            if ctx["content"]:
+                full_prompt = self._build_prompt(prompt, ctx["content"], ctx["source_info"])
+                self._run_ai_task(provider, model, full_prompt, ctx["source_info"], is_batch=True, batch_item_id=ctx["item"], original_filename=ctx["original_name"], **options)
             else:
-                self._report_error(error or "Unknown error", provider, model, source_info, is_batch=True, batch_id=item)
+                self._report_error(ctx["error"] or "Unknown error", provider, model, ctx["source_info"], is_batch=True, batch_id=ctx["item"])
+
+        def _on_item_error(i: int, item: str, e: Exception):
+            self._report_error(f"Exception occurred: {e}", provider, model, item, is_batch=True, batch_id=item)
 
-            # Delay
-            if i < total - 1 and delay > 0:
-                time.sleep(delay)
+        self._run_batch_pipeline(items, provider, model, options, is_url_mode, _generate, _on_item_error, _on_start)
         
         # self.message_queue.put(("batch_complete", None)) # GUI handles batch completion
 
@@ -344,11 +422,9 @@ class AppController:
             self._report_error(f"Provider unavailable: {provider_key}", provider_key, model, source_info, is_batch, batch_item_id)
             return
 
-        # Call Provider
+        # Call Provider (or serve from the response cache)
         try:
-            # Filter kwargs (pass only relevant data to provider)
-            ai_kwargs = {k: v for k, v in kwargs.items() if k in ['reasoning_effort', 'verbosity']}
-            response_dict: AIResponse = provider.get_response(model, prompt, **ai_kwargs)
+            response_dict: AIResponse = self._get_ai_response(provider_key, provider, model, prompt, kwargs)
         except Exception as e:
             logging.error(f"Critical error during AI call: {e}")
             self._report_error(f"Exception occurred: {e}", provider_key, model, source_info, is_batch, batch_item_id)
@@ -366,7 +442,82 @@ class AppController:
 
     # --- Helper Functions (Used by both GUI and Headless) ---
 
-    def _fetch_content_from_url(self, url: str, raw_html: bool, html_opts: Dict, dynamic_opts: Dict = None) -> Tuple[Optional[str], str, Optional[str]]:
+    def _get_ai_response(self, provider_key: str, provider: AIProvider, model: str, prompt: str, options: Dict[str, Any]) -> AIResponse:
+        """
+        Returns the model response for a prompt, consulting the response cache first.
+        Successful provider responses are stored; 'no_cache' in the options bypasses the cache.
+        """
+        ai_kwargs, cache_key, cached = self._lookup_response_cache(provider_key, model, prompt, options)
+        if cached:
+            return cached
+
+        response_dict: AIResponse = provider.get_response(model, prompt, **ai_kwargs)
+        response_dict["cached"] = False
+
+        if cache_key and not response_dict["error"]:
+            self.response_cache.put(cache_key, response_dict)
+        return response_dict
+
+    async def _get_ai_response_async(self, provider_key: str, provider: AIProvider, model: str, prompt: str,
+                                     options: Dict[str, Any]) -> AIResponse:
+        """Async variant of _get_ai_response() (cache I/O on a worker thread, the provider call on the event loop)."""
+        ai_kwargs, cache_key, cached = await asyncio.to_thread(self._lookup_response_cache, provider_key, model, prompt, options)
+        if cached:
+            return cached
+
+        response_dict: AIResponse = await provider.get_response_async(model, prompt, **ai_kwargs)
+        response_dict["cached"] = False
+
+        if cache_key and not response_dict["error"]:
+            await asyncio.to_thread(self.response_cache.put, cache_key, response_dict)
+        return response_dict
+
+    def _stream_ai_response(self, provider_key: str, provider: AIProvider, model: str, prompt: str,
+                            options: Dict[str, Any]) -> Iterator[StreamChunk]:
+        """
+        Streaming variant of _get_ai_response(): yields text deltas, then the AIResponse.
+        A response cache hit is yielded as a single delta; streamed responses are cached like complete ones.
+        """
+        ai_kwargs, cache_key, cached = self._lookup_response_cache(provider_key, model, prompt, options)
+        if cached:
+            if cached["response"]:
+                yield cached["response"]
+            yield cached
+            return
+
+        stream = provider.stream_response(model, prompt, **ai_kwargs)
+        try:
+            for chunk in stream:
+                if isinstance(chunk, str):
+                    yield chunk
+                    continue
+                chunk["cached"] = False
+                if cache_key and not chunk["error"]:
+                    self.response_cache.put(cache_key, chunk)
+                yield chunk
+        finally:
+            # Closing this generator does not close the one it iterates (provider slot and connection)
+            stream.close()
+
+    def _lookup_response_cache(self, provider_key: str, model: str, prompt: str,
+                               options: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str], Optional[AIResponse]]:
+        """Returns (provider kwargs, cache key or None, cached response or None) for a prompt."""
+        # Filter kwargs (pass only relevant data to provider)
+        ai_kwargs = {k: v for k, v in options.items() if k in ['reasoning_effort', 'verbosity']}
+
+        use_cache = self.response_cache.enabled and not options.get("no_cache", False)
+        if not use_cache:
+            return ai_kwargs, None, None
+        # Keyed on exactly the parameters sent to the provider
+        cache_key = ResponseCache.make_key(provider_key, model, prompt, **ai_kwargs)
+        cached = self.response_cache.get(cache_key)
+        if cached:
+            logging.info(f"Response cache hit: {provider_key}/{model} ({len(prompt)} chars).")
+        return ai_kwargs, cache_key, cached
+
+    def _fetch_content_from_url(self, url: str, raw_html: bool, html_opts: Dict, dynamic_opts: Dict = None,
+                                fetch_metadata: Optional[Dict[str, Any]] = None,
+                                force_refresh: bool = False) -> Tuple[Optional[str], str, Optional[str]]:
         """
         Delegates URL downloading to WebLoader.
         Handles both static and dynamic fetching strategies.
@@ -376,30 +527,97 @@ class AppController:
             raw_html (bool): If True, skips text extraction (only applies if result is HTML).
             html_opts (Dict): Configuration for BeautifulSoup text extraction.
             dynamic_opts (Dict, optional): Configuration for Playwright (enabled, scroll, etc.).
+            fetch_metadata (Dict, optional): Filled with the fetch details (see WebLoader.fetch).
+            force_refresh (bool): Bypass the HTTP cache.
 
         Returns:
             Tuple[Content (str|None), SourceInfo (str), ErrorMessage (str|None)]
         """
         # 1. Fetch content (Delegated to WebLoader)
-        self.message_queue.put(("status", f"Downloading: {url[:50]}..."))
-        
-        use_dynamic = dynamic_opts.get('enabled', False) if dynamic_opts else False
-        
-        # WebLoader returns either the content string OR a temporary file path
-        content_or_path, source_info, error_msg = self.web_loader.fetch(url, use_dynamic, dynamic_opts)
+        fetch_metadata = fetch_metadata if fetch_metadata is not None else {}
+        content_or_path, source_info, error_msg = self._download_url(
+            url, dynamic_opts, fetch_metadata, raw_html, html_opts, force_refresh=force_refresh
+        )
 
         if error_msg:
             return None, source_info, error_msg
 
         # 2. Process/Extract Content
+        extracted_text, processing_error = self._extract_downloaded_content(
+            content_or_path, raw_html, html_opts, is_text=fetch_metadata.get("content_type") == "text"
+        )
+
+        if processing_error:
+            return None, source_info, processing_error
+            
+        return extracted_text, source_info, None
+
+    def _download_url(self, url: str, dynamic_opts: Dict = None, fetch_metadata: Optional[Dict[str, Any]] = None,
+                      raw_html: bool = False, html_opts: Optional[Dict] = None,
+                      force_refresh: bool = False) -> Tuple[Optional[str], str, Optional[str]]:
+        """
+        Download step of URL processing (I/O-bound).
+        With 'extract_in_browser', dynamic pages come back as text (fetch_metadata['content_type'] == "text").
+
+        Returns:
+            Tuple[ContentOrPath (str|None), SourceInfo (str), ErrorMessage (str|None)]
+        """
+        self.message_queue.put(("status", f"Downloading: {url[:50]}..."))
+        
+        use_dynamic = dynamic_opts.get('enabled', False) if dynamic_opts else False
+        if use_dynamic:
+            dynamic_opts = self._dynamic_fetch_options(dynamic_opts, raw_html, html_opts)
+        
+        # WebLoader returns the content string, an in-memory binary (BinaryContent) OR a temporary file path
+        return self.web_loader.fetch(url, use_dynamic, dynamic_opts, metadata=fetch_metadata, force_refresh=force_refresh)
+
+    def _dynamic_fetch_options(self, dynamic_opts: Dict, raw_html: bool, html_opts: Optional[Dict]) -> Dict:
+        """Adds the in-browser text extraction settings ('text_options') when 'extract_in_browser' applies."""
+        if raw_html:
+            return dynamic_opts
+        extract_in_browser = dynamic_opts.get('extract_in_browser')
+        if extract_in_browser is None:
+            extract_in_browser = self.config_manager.get("dynamic_loader", {}).get("extract_in_browser", False)
+        if not extract_in_browser:
+            return dynamic_opts
+        html_opts = html_opts or {}
+        return {**dynamic_opts, "text_options": {
+            "exclude_tags": html_opts.get('decompose_tags', text_extractor.DEFAULT_EXCLUDED_TAGS),
+            "separator": html_opts.get('text_separator', '\n'),
+            "strip": html_opts.get('text_strip', True)
+        }}
+
+    def _extract_downloaded_content(self, content_or_path: Union[str, BinaryContent], raw_html: bool, html_opts: Dict,
+                                    is_text: bool = False) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Extraction step of URL processing (CPU-bound).
+        Converts a downloaded HTML string, in-memory binary or temporary file into text.
+        is_text marks content already extracted in the browser (passed through as is).
+
+        Returns:
+            Tuple[Text (str|None), ErrorMessage (str|None)]
+        """
         extracted_text = None
         processing_error = None
 
+        if is_text:
+            if not content_or_path:
+                return None, "Empty text after in-browser extraction."
+            return content_or_path, None
+
         try:
+            # Case 0: Binary file kept in memory (no temp file to clean up)
+            if isinstance(content_or_path, BinaryContent):
+                extracted_text, error = self.parallel_extractor.extract_bytes(
+                    content_or_path.data, content_or_path.extension, html_opts
+                )
+                if not extracted_text:
+                    processing_error = error or "Extraction failed (empty content)."
+
             # Case A: Result is a File Path (e.g., PDF downloaded to temp)
-            if os.path.exists(content_or_path) and os.path.isfile(content_or_path):
+            elif os.path.exists(content_or_path) and os.path.isfile(content_or_path):
                 try:
-                    extracted_text = text_extractor.extract_text_from_file(content_or_path, html_opts)
+                    extracted_text, _ = self.parallel_extractor.extract(content_or_path, html_opts)
                     if not extracted_text:
                         processing_error = "Extraction failed (empty content)."
                 finally:
@@ -421,16 +639,13 @@ class AppController:
         except Exception as e:
             processing_error = f"Processing error: {str(e)}"
 
-        if processing_error:
-            return None, source_info, processing_error
-            
-        return extracted_text, source_info, None
+        return extracted_text, processing_error
 
-    def _save_result(self, provider, model, prompt, response, source, is_batch, batch_id, orig_filename) -> Optional[str]:
-        """Saves the response to a file."""
-        # Use overridden output dir if set (headless), otherwise config
-        out_dir = getattr(self, '_headless_output_dir', None) or \
-                  self.config_manager.get("paths", {}).get("output_directory", "ai_responses")
+    def _save_result(self, provider, model, prompt, response, source, is_batch, batch_id, orig_filename,
+                     output_dir: Optional[str] = None) -> Optional[str]:
+        """Saves the response to a file (in `output_dir` if given, e.g. per headless request)."""
+        # Use the request's output dir if set (headless), otherwise config
+        out_dir = output_dir or self.config_manager.get("paths", {}).get("output_directory", "ai_responses")
         
         os.makedirs(out_dir, exist_ok=True)
 
@@ -445,11 +660,22 @@ class AppController:
         else:
             name_base = "response"
 
-        filename = f"{timestamp}_{name_base}_ai.txt"
-        filepath = os.path.join(out_dir, filename)
+        # Concurrent batch items may finish within the same second:
+        # open with 'x' and add a counter suffix instead of overwriting.
+        base_path = os.path.join(out_dir, f"{timestamp}_{name_base}_ai")
+        filepath = f"{base_path}.txt"
+        counter = 1
 
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
+            while True:
+                try:
+                    f = open(filepath, 'x', encoding='utf-8')
+                    break
+                except FileExistsError:
+                    filepath = f"{base_path}_{counter}.txt"
+                    counter += 1
+
+            with f:
                 f.write(f"===== GENERATED BY: {APP_NAME} v{CORE_VERSION} =====\n")
                 f.write(f"===== SOURCE: {source} =====\n")
                 f.write(f"===== MODEL: {provider} / {model} =====\n")
@@ -476,6 +702,19 @@ class AppController:
                     results.append(os.path.join(root, f))
         return results
 
+    def _extract_files_for_concat(self, paths: List[str], html_opts: Optional[Dict]) -> List[str]:
+        """
+        Extracts files in parallel (Batch Files mode) and returns the labeled
+        sections of all readable files, in input order.
+        """
+        contents = []
+        for path, (text, error) in zip(paths, self.parallel_extractor.extract_many(paths, html_opts)):
+            if text:
+                contents.append(f"--- {os.path.basename(path)} ---\n{text}")
+            elif error:
+                logging.warning(f"Skipping {os.path.basename(path)}: {error}")
+        return contents
+
     def _build_prompt(self, user_prompt: str, content: str, source_info: str) -> str:
         """Constructs the final prompt with context."""
         return (
@@ -489,7 +728,7 @@ class AppController:
         """Sends error to the GUI."""
         err_response = {
             "response": msg, "error": True, "input_chars": 0, "output_chars": 0,
-            "input_tokens": 0, "output_tokens": 0, "total_tokens": 0, "reasoning_tokens": 0, "status_message": "Error"
+            "input_tokens": 0, "output_tokens": 0, "total_tokens": 0, "reasoning_tokens": 0, "status_message": "Error", "retries": 0
         }
         payload = (err_response, source_info, None, batch_id)
         target = "batch_item_result" if is_batch else "single_result"
@@ -510,37 +749,11 @@ class AppController:
 
         try:
             # AI call (same logic as original _run_ai_task)
-            ai_kwargs = {k: v for k, v in kwargs.items() if k in ['reasoning_effort', 'verbosity']}
-            
-            logging.warning(f"[HEADLESS_DIAG] Call: Provider={provider_key}, Model={model}, AI_KWARGS={ai_kwargs}, Prompt Len={len(prompt)}")
-
-            response_dict: AIResponse = provider.get_response(model, prompt, **ai_kwargs)
-
-            # Process result
-            saved_path = None
-            if not response_dict["error"]:
-                # 'is_batch' and 'batch_id' are irrelevant for saving in headless,
-                # but 'original_filename' is useful.
-                saved_path = self._save_result(
-                    provider_key, model, prompt, response_dict["response"], 
-                    source_info, is_batch=False, batch_id=None, 
-                    orig_filename=original_filename
-                )
-                
-                return {
-                    "status": "success",
-                    "source": source_info,
-                    "result": response_dict,
-                    "saved_path": saved_path
-                }
-            else:
-                # Error returned by AI provider
-                return {
-                    "status": "error",
-                    "source": source_info,
-                    "error_message": response_dict["response"],
-                    "result": response_dict
-                }
+            logging.warning(f"[HEADLESS_DIAG] Call: Provider={provider_key}, Model={model}, Prompt Len={len(prompt)}")
+
+            response_dict: AIResponse = self._get_ai_response(provider_key, provider, model, prompt, kwargs)
+            return self._headless_result(provider_key, model, prompt, source_info, original_filename, response_dict,
+                                         output_dir=kwargs.get("output_dir"))
 
         except Exception as e:
             logging.error(f"Critical error during AI call (headless): {e}", exc_info=True)
@@ -551,72 +764,260 @@ class AppController:
                 "result": None
             }
 
-    def _headless_batch_loop(self, items: List[str], prompt: str, provider: str, model: str, options: Dict, is_url_mode: bool) -> List[Dict[str, Any]]:
+    async def _run_ai_task_async(self, provider_key: str, model: str, prompt: str, source_info: str,
+                                 original_filename: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Async variant of _run_ai_task_sync(): the model call does not occupy a thread while it runs.
+        """
+        provider = self.providers.get(provider_key)
+        if not provider:
+            msg = f"Provider unavailable: {provider_key}"
+            logging.error(msg)
+            return {"status": "error", "source": source_info, "error_message": msg, "result": None}
+
+        try:
+            response_dict: AIResponse = await self._get_ai_response_async(provider_key, provider, model, prompt, kwargs)
+            return await asyncio.to_thread(
+                self._headless_result, provider_key, model, prompt, source_info, original_filename, response_dict,
+                kwargs.get("output_dir")
+            )
+        except Exception as e:
+            logging.error(f"Critical error during AI call (headless async): {e}", exc_info=True)
+            return {
+                "status": "error",
+                "source": source_info,
+                "error_message": f"Exception occurred: {e}",
+                "result": None
+            }
+
+    def _headless_result(self, provider_key: str, model: str, prompt: str, source_info: str,
+                         original_filename: Optional[str], response_dict: AIResponse,
+                         output_dir: Optional[str] = None) -> Dict[str, Any]:
+        """Saves a successful response (to `output_dir`, else the configured directory) and builds the headless result object."""
+        if response_dict["error"]:
+            # Error returned by AI provider
+            return {
+                "status": "error",
+                "source": source_info,
+                "error_message": response_dict["response"],
+                "result": response_dict
+            }
+
+        # 'is_batch' and 'batch_id' are irrelevant for saving in headless,
+        # but 'original_filename' is useful.
+        saved_path = self._save_result(
+            provider_key, model, prompt, response_dict["response"], 
+            source_info, is_batch=False, batch_id=None, 
+            orig_filename=original_filename, output_dir=output_dir
+        )
+        return {
+            "status": "success",
+            "source": source_info,
+            "result": response_dict,
+            "saved_path": saved_path
+        }
+
+    def _headless_batch_loop(self, items: List[str], prompt: str, provider: str, model: str, options: Dict, is_url_mode: bool,
+                             listener: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                             cancel_event: Optional[threading.Event] = None,
+                             keep_results: bool = True) -> List[Dict[str, Any]]:
         """
         SYNCHRONOUS loop for batch processing (headless mode).
-        Iterates items, runs AI calls, collects results.
+        Runs items through the staged batch pipeline and returns results in input order.
+        Item starts and finished items are reported to the listener as they happen (see process_headless).
         """
-        results = []
         total = len(items)
-        delay = options.get("delay", 1.0)
-        html_opts = options.get('html_options', {})
-        dynamic_opts = options.get('dynamic_options') # Added dynamic options extraction
 
         logging.info(f"[Headless] Starting batch processing: {total} items.")
+        if listener:
+            listener("start", {"total": total})
 
-        for i, item in enumerate(items):
+        def _on_start(i: int, item: str):
             display_name = item[:70] if is_url_mode else os.path.basename(item)
             logging.info(f"[Headless] Processing {i+1}/{total}: {display_name}")
+            if listener:
+                listener("progress", {"index": i, "total": total, "item": display_name})
 
-            # Extract content
-            content = None
-            source_info = ""
-            original_name = None
-            error_msg = None
-            
-            try:
-                if is_url_mode:
-                    # Update call to include dynamic_opts
-                    content, source_info, error_msg = self._fetch_content_from_url(
-                        item, 
-                        options.get('send_raw_html', False), 
-                        html_opts, 
-                        dynamic_opts
-                    )
-                else:
-                    content = text_extractor.extract_text_from_file(item, html_opts)
-                    source_info = f"FILE: {display_name}"
-                    original_name = display_name
-                    error_msg = "Read failure" if content is None else None
-            except Exception as e:
-                error_msg = f"Content extraction error: {e}"
-                source_info = item
-
+        def _generate(i: int, ctx: Dict[str, Any]) -> Dict[str, Any]:
             # AI call or log error
-            if content:
-                full_prompt = self._build_prompt(prompt, content, source_info)
-                result_dict = self._run_ai_task_sync(
-                    provider, model, full_prompt, source_info, 
-                    original_filename=original_name, **options
+            if ctx["content"]:
+                full_prompt = self._build_prompt(prompt, ctx["content"], ctx["source_info"])
+                result = self._run_ai_task_sync(
+                    provider, model, full_prompt, ctx["source_info"], 
+                    original_filename=ctx["original_name"], **options
                 )
-                results.append(result_dict)
             else:
-                logging.warning(f"[Headless] Item skipped (no content): {display_name} (Error: {error_msg})")
-                results.append({
+                logging.warning(f"[Headless] Item skipped (no content): {ctx['display_name']} (Error: {ctx['error']})")
+                result = {
                     "status": "error",
-                    "source": source_info,
-                    "error_message": error_msg or "Unknown content error",
+                    "source": ctx["source_info"],
+                    "error_message": ctx["error"] or "Unknown content error",
                     "result": None
-                })
+                }
+            if ctx["fetch"]:
+                result["fetch"] = ctx["fetch"]
+            return result
+
+        def _on_item_error(i: int, item: str, e: Exception) -> Dict[str, Any]:
+            if isinstance(e, BatchCancelled):
+                return {"status": "cancelled", "source": item, "error_message": "Cancelled before processing.", "result": None}
+            return {"status": "error", "source": item, "error_message": f"Exception occurred: {e}", "result": None}
 
-            # Delay
-            if i < total - 1 and delay > 0:
-                time.sleep(delay)
+        def _on_result(i: int, result: Dict[str, Any]):
+            if listener:
+                listener("item", {"index": i, "result": result})
+
+        results = self._run_batch_pipeline(items, provider, model, options, is_url_mode, _generate, _on_item_error, _on_start,
+                                           on_result=_on_result, cancel_event=cancel_event, keep_results=keep_results)
                 
-        logging.info(f"[Headless] Batch complete. Results count: {len(results)}.")
+        logging.info(f"[Headless] Batch complete. Results count: {len(results)}. Cache: {self.get_cache_stats()}")
         return results
 
-    def process_headless(self, mode: str, prompt: str, input_data: Union[str, List[str], None], options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # --- Batch Pipeline (shared by GUI and Headless) ---
+
+    def _run_batch_pipeline(self, items: List[str], provider: str, model: str, options: Dict, is_url_mode: bool,
+                            generate: Callable[[int, Dict[str, Any]], Any],
+                            on_error: Callable[[int, str, Exception], Any],
+                            on_start: Callable[[int, str], None],
+                            on_result: Optional[Callable[[int, Any], None]] = None,
+                            cancel_event: Optional[threading.Event] = None,
+                            keep_results: bool = True) -> List[Any]:
+        """
+        Runs a batch through the staged pipeline: download (URL mode only) -> extract -> generate.
+        Each stage has its own worker pool and bounded input queue, so the fetch of
+        one item overlaps the extraction and the AI call of others. With the
+        'async_fetch' option, the download stage is replaced by WebLoader.fetch_many();
+        dynamic URL lists are rendered by WebLoader.fetch_many_dynamic() (async engine).
+
+        Args:
+            items (List[str]): File paths or URLs.
+            provider (str): Provider key.
+            model (str): Model identifier.
+            options (Dict): Processing options.
+            is_url_mode (bool): True for URL lists, False for file lists.
+            generate (Callable): Final stage; receives the item context and produces the item's result.
+            on_error (Callable): Produces the result for an item whose stage raised an exception.
+            on_start (Callable): Called when an item enters the pipeline.
+            on_result (Callable, optional): Called with each item's result as soon as it is finished.
+            cancel_event (threading.Event, optional): Once set, items not yet started are passed to on_error
+                with a BatchCancelled exception (their downloaded temp files are removed) and the async
+                fetch loop stops.
+            keep_results (bool): If False, results are only handed to on_result (the returned list holds None).
+
+        Returns:
+            List[Any]: The generate-stage results in input order.
+        """
+        raw_html = options.get('send_raw_html', False)
+        html_opts = options.get('html_options', {})
+        dynamic_opts = options.get('dynamic_options')
+        force_refresh = options.get('force_refresh', False)
+        concurrency_cfg = self.config_manager.get("concurrency", {})
+
+        def _new_context(item: str) -> Dict[str, Any]:
+            return {
+                "item": item,
+                "display_name": item[:70] if is_url_mode else os.path.basename(item),
+                "payload": None,
+                "content": None,
+                "source_info": "",
+                "original_name": None,
+                "error": None,
+                "fetch": {}
+            }
+
+        def _download(i: int, item: str) -> Dict[str, Any]:
+            ctx = _new_context(item)
+            ctx["payload"], ctx["source_info"], ctx["error"] = self._download_url(
+                item, dynamic_opts, ctx["fetch"], raw_html, html_opts, force_refresh=force_refresh
+            )
+            return ctx
+
+        def _extract(i: int, ctx_or_item: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+            if is_url_mode:
+                ctx = ctx_or_item
+                if not ctx["error"]:
+                    ctx["content"], ctx["error"] = self._extract_downloaded_content(
+                        ctx.pop("payload"), raw_html, html_opts, is_text=ctx["fetch"].get("content_type") == "text"
+                    )
+                return ctx
+
+            ctx = _new_context(ctx_or_item)
+            ctx["content"], ctx["error"] = self.parallel_extractor.extract(ctx["item"], html_opts)
+            if ctx["error"] and ctx["error"] != "Read failure":
+                ctx["source_info"] = ctx["item"]
+            else:
+                ctx["source_info"] = f"FILE: {ctx['display_name']}"
+                ctx["original_name"] = ctx["display_name"]
+            return ctx
+
+        # Async engines: the whole URL list is fetched (httpx) or rendered (async Playwright)
+        # concurrently and every page enters the extract stage as soon as it completes
+        use_dynamic = is_url_mode and (dynamic_opts or {}).get("enabled", False)
+        fetched = None
+        if is_url_mode and not use_dynamic and options.get("async_fetch", False):
+            fetched = self.web_loader.fetch_many(items, force_refresh=force_refresh, cancel_event=cancel_event)
+        elif use_dynamic and self.config_manager.get("dynamic_loader", {}).get("async_engine", True):
+            fetched = self.web_loader.fetch_many_dynamic(items, self._dynamic_fetch_options(dynamic_opts, raw_html, html_opts),
+                                                         cancel_event=cancel_event)
+
+        feed = None
+        if fetched is not None:
+            def _async_feed():
+                try:
+                    for i, (payload, source_info, error), fetch_metadata in fetched:
+                        ctx = _new_context(items[i])
+                        ctx["payload"], ctx["source_info"], ctx["error"] = payload, source_info, error
+                        ctx["fetch"] = fetch_metadata
+                        yield i, ctx
+                finally:
+                    # Closing this generator does not close the one it iterates: stop the background fetch loop
+                    fetched.close()
+            feed = _async_feed()
+
+        def _on_error(i: int, item: str, e: Exception) -> Any:
+            # A downloaded item skipped on cancel still holds its payload (possibly a temp file)
+            if isinstance(e, BatchCancelled) and isinstance(e.payload, dict) and e.payload.get("payload") is not None:
+                ctx = e.payload
+                WebLoader.discard_result((ctx["payload"], ctx["source_info"], None))
+            return on_error(i, item, e)
+
+        stages: List[PipelineStage] = []
+        if is_url_mode and feed is None:
+            download_workers = concurrency_cfg.get("download_workers", 8)
+            if use_dynamic:
+                # Dynamic fetches lease browsers from the pool: keep every browser busy
+                download_workers = max(download_workers, self.web_loader.browser_pool.size)
+            stages.append(PipelineStage("download", _download, workers=download_workers))
+        # With the process pool, one extract thread per worker process keeps every core busy
+        extract_workers = concurrency_cfg.get("extract_workers", 2)
+        if self.parallel_extractor.enabled:
+            extract_workers = max(extract_workers, self.parallel_extractor.workers)
+        stages.append(PipelineStage("extract", _extract, workers=extract_workers))
+        # The generate pool size bounds in-flight model calls; pacing is done by the
+        # provider rate limiter, 'delay' only adds optional extra spacing between calls.
+        stages.append(PipelineStage(
+            "generate", generate,
+            workers=self._resolve_batch_workers(provider, model, options),
+            start_interval=options.get("delay", 0.0)
+        ))
+
+        def _log_stats(stats: Dict[str, Dict[str, int]]):
+            summary = " | ".join(f"{name}: queued={s['queued']} active={s['active']} done={s['done']}" for name, s in stats.items())
+            logging.info(f"Batch pipeline stages -> {summary}")
+
+        pipeline = BatchPipeline(
+            stages,
+            queue_size=concurrency_cfg.get("stage_queue_size", 0),
+            on_start=on_start,
+            on_result=on_result,
+            on_stats=_log_stats
+        )
+        return pipeline.run(items, on_error=_on_error, feed=feed, cancel_event=cancel_event, keep_results=keep_results)
+
+    def process_headless(self, mode: str, prompt: str, input_data: Union[str, List[str], None], options: Dict[str, Any],
+                         listener: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                         cancel_event: Optional[threading.Event] = None,
+                         keep_results: bool = True) -> List[Dict[str, Any]]:
         """
         Main entry point for Command Line (Headless) processing.
         Runs task synchronously and returns a list of results.
@@ -626,11 +1027,175 @@ class AppController:
             prompt (str): System prompt.
             input_data (Union[str, List[str], None]): Files/URLs or None.
             options (Dict[str, Any]): Configuration options.
+            listener (Callable, optional): Progress callback, called as listener(event, data) with
+                ("start", {"total": n}) first, then ("progress", {"index": i, "total": n, "item": name})
+                when a batch item starts and ("item", {"index": i, "result": result}) for every result.
+            cancel_event (threading.Event, optional): Cancels the run once set; batch items that have
+                not started yet come back with status "cancelled".
+            keep_results (bool): If False, batch results are only delivered to the listener and the
+                returned list holds None per item (memory stays flat for streamed batches).
 
         Returns:
             List[Dict[str, Any]]: List of result dictionaries.
         """
-        
+        if cancel_event is not None and cancel_event.is_set():
+            return [{"status": "cancelled", "source": "System", "error_message": "Cancelled before processing.", "result": None}]
+
+        started = [False]
+        reported = set()
+
+        def _relay(event: str, data: Dict[str, Any]):
+            if event == "start":
+                started[0] = True
+            elif event == "item":
+                reported.add(data["index"])
+            listener(event, data)
+
+        if listener and mode not in (self.MODE_BATCH_DIR, self.MODE_BATCH_URL_LIST):
+            _relay("start", {"total": 1})
+
+        results = self._process_headless_mode(mode, prompt, input_data, options, _relay if listener else None,
+                                              cancel_event, keep_results)
+
+        # Batch items are reported by the pipeline; single-step modes and early exits are reported here
+        if listener:
+            if not started[0]:
+                _relay("start", {"total": len(results)})
+            for i, result in enumerate(results):
+                if i not in reported and result is not None:
+                    _relay("item", {"index": i, "result": result})
+        return results
+
+    def _prepare_single_prompt(self, mode: str, prompt: str, input_data: Union[str, List[str], None], options: Dict[str, Any],
+                               fetch_metadata: Optional[Dict[str, Any]] = None
+                               ) -> Tuple[Optional[str], str, Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Builds the full prompt of a single-prompt headless mode (Direct Input, Single File, URL).
+
+        Returns:
+            Tuple: (full prompt, source info, original filename, error result); the error result
+            is a ready headless result dict, or None on success.
+        """
+        html_opts = options.get('html_options', {})
+
+        if mode == self.MODE_DIRECT:
+            return prompt, "Direct Input", None, None
+
+        if mode == self.MODE_SINGLE_FILE:
+            path = str(input_data)
+            if not path or not os.path.isfile(path):
+                return None, path, None, {"status": "error", "source": path, "error_message": "Invalid file path.", "result": None}
+
+            filename = os.path.basename(path)
+            content = text_extractor.extract_text_from_file(path, html_opts)
+            if not content:
+                return None, filename, None, {"status": "error", "source": filename, "error_message": "Empty or unreadable file.", "result": None}
+            return self._build_prompt(prompt, content, f"FILE: {filename}"), f"FILE: {filename}", filename, None
+
+        if mode == self.MODE_URL:
+            url = str(input_data)
+            fetch_metadata = fetch_metadata if fetch_metadata is not None else {}
+            content, info, error = self._fetch_content_from_url(
+                url, 
+                options.get('send_raw_html', False), 
+                html_opts, 
+                options.get('dynamic_options'),
+                fetch_metadata,
+                force_refresh=options.get('force_refresh', False)
+            )
+            if error:
+                return None, url, None, {"status": "error", "source": url, "error_message": error, "result": None, "fetch": fetch_metadata}
+            return self._build_prompt(prompt, content, info), info, f"url_{os.path.basename(urlparse(url).path)}", None
+
+        raise ValueError(f"Mode does not produce a single prompt: {mode}")
+
+    async def process_headless_async(self, mode: str, prompt: str, input_data: Union[str, List[str], None],
+                                     options: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Async entry point for the API server; same arguments and results as process_headless().
+        The single-prompt modes (Direct Input, Single File, URL) prepare the prompt on a worker
+        thread and await the model call on the event loop, so many requests can be in flight
+        without one thread each. Batch modes run process_headless() on a worker thread.
+        """
+        if mode not in (self.MODE_DIRECT, self.MODE_SINGLE_FILE, self.MODE_URL):
+            return await asyncio.to_thread(self.process_headless, mode, prompt, input_data, options)
+
+        provider_key = options.pop("provider_key", None)
+        model = options.pop("model", None)
+        fetch_metadata: Dict[str, Any] = {}
+        try:
+            logging.info(f"[Headless] Starting {mode} (async).")
+            full_prompt, info, filename, error_result = await asyncio.to_thread(
+                self._prepare_single_prompt, mode, prompt, input_data, options, fetch_metadata
+            )
+            if error_result:
+                return [error_result]
+
+            result = await self._run_ai_task_async(provider_key, model, full_prompt, info, original_filename=filename, **options)
+        except Exception as e:
+            logging.critical(f"[Headless] Unexpected error in process_headless_async: {e}", exc_info=True)
+            return [{"status": "error", "source": "System", "error_message": f"Critical error: {e}", "result": None}]
+
+        if mode == self.MODE_URL:
+            result["fetch"] = fetch_metadata
+        return [result]
+
+    def stream_headless(self, mode: str, prompt: str, input_data: Union[str, List[str], None],
+                        options: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Token streaming for the single-prompt headless modes (Direct Input, Single File, URL).
+        The prompt is prepared like in process_headless(); the model output is then streamed.
+
+        Yields:
+            Tuple[str, Dict]: ("start", {"source": info}), then ("delta", {"text": chunk}) per text
+            delta, and finally ("result", result) with the same result dict as process_headless().
+        """
+        provider_key = options.pop("provider_key", None)
+        model = options.pop("model", None)
+        fetch_metadata: Dict[str, Any] = {}
+        try:
+            full_prompt, info, filename, error_result = self._prepare_single_prompt(
+                mode, prompt, input_data, options, fetch_metadata
+            )
+        except Exception as e:
+            logging.error(f"[Headless] Stream preparation failed: {e}", exc_info=True)
+            full_prompt, info, filename = None, "System", None
+            error_result = {"status": "error", "source": "System", "error_message": f"Critical error: {e}", "result": None}
+        if error_result:
+            yield "result", error_result
+            return
+
+        provider = self.providers.get(provider_key)
+        if not provider:
+            msg = f"Provider unavailable: {provider_key}"
+            logging.error(msg)
+            yield "result", {"status": "error", "source": info, "error_message": msg, "result": None}
+            return
+
+        yield "start", {"source": info}
+        response_dict: Optional[AIResponse] = None
+        stream = self._stream_ai_response(provider_key, provider, model, full_prompt, options)
+        try:
+            for chunk in stream:
+                if isinstance(chunk, str):
+                    yield "delta", {"text": chunk}
+                else:
+                    response_dict = chunk
+            result = self._headless_result(provider_key, model, full_prompt, info, filename, response_dict,
+                                           output_dir=options.get("output_dir"))
+        except Exception as e:
+            logging.error(f"Critical error during AI stream (headless): {e}", exc_info=True)
+            result = {"status": "error", "source": info, "error_message": f"Exception occurred: {e}", "result": None}
+        finally:
+            stream.close()
+        if fetch_metadata:
+            result["fetch"] = fetch_metadata
+        yield "result", result
+
+    def _process_headless_mode(self, mode: str, prompt: str, input_data: Union[str, List[str], None], options: Dict[str, Any],
+                               listener: Optional[Callable[[str, Dict[str, Any]], None]],
+                               cancel_event: Optional[threading.Event], keep_results: bool) -> List[Dict[str, Any]]:
+        """Runs one headless request (see process_headless)."""
         # Unpack options from headless.py
         
         # FIX: Use .pop() instead of .get()
@@ -639,11 +1204,8 @@ class AppController:
         model = options.pop("model", None)
         
         html_opts = options.get('html_options', {})
-        dynamic_opts = options.get('dynamic_options') # Added extraction
         
-        # Override output dir (if specified in CLI)
-        if options.get("output_dir"):
-            self._headless_output_dir = options.get("output_dir")
+        # An output dir override (CLI / API request) stays in options: _run_ai_task_sync passes it on per call
 
         try:
             # --- 1. Direct Input ---
@@ -657,19 +1219,13 @@ class AppController:
 
             # --- 2. Single File ---
             elif mode == self.MODE_SINGLE_FILE:
-                path = str(input_data)
-                logging.info(f"[Headless] Starting {self.MODE_SINGLE_FILE}: {path}")
-                if not path or not os.path.isfile(path):
-                    return [{"status": "error", "source": path, "error_message": "Invalid file path.", "result": None}]
-                
-                filename = os.path.basename(path)
-                content = text_extractor.extract_text_from_file(path, html_opts)
-                if not content:
-                    return [{"status": "error", "source": filename, "error_message": "Empty or unreadable file.", "result": None}]
-                
-                full_prompt = self._build_prompt(prompt, content, f"FILE: {filename}")
+                logging.info(f"[Headless] Starting {self.MODE_SINGLE_FILE}: {input_data}")
+                full_prompt, info, filename, error_result = self._prepare_single_prompt(mode, prompt, input_data, options)
+                if error_result:
+                    return [error_result]
+
                 result = self._run_ai_task_sync(
-                    provider_key, model, full_prompt, f"FILE: {filename}", 
+                    provider_key, model, full_prompt, info, 
                     original_filename=filename, **options
                 )
                 return [result]
@@ -682,11 +1238,7 @@ class AppController:
                     return [{"status": "error", "source": "Batch Files", "error_message": "No input files provided.", "result": None}]
 
                 # Same logic as _process_batch_files
-                contents = []
-                for path in paths:
-                    text = text_extractor.extract_text_from_file(path, html_opts)
-                    if text:
-                        contents.append(f"--- {os.path.basename(path)} ---\n{text}")
+                contents = self._extract_files_for_concat(paths, html_opts)
                 
                 if not contents:
                     return [{"status": "error", "source": "Batch Files", "error_message": "Failed to extract content from files.", "result": None}]
@@ -700,23 +1252,19 @@ class AppController:
 
             # --- 4. Single URL ---
             elif mode == self.MODE_URL:
-                url = str(input_data)
-                logging.info(f"[Headless] Starting {self.MODE_URL}: {url}")
-                # Updated call to include dynamic_opts
-                content, info, error = self._fetch_content_from_url(
-                    url, 
-                    options.get('send_raw_html', False), 
-                    html_opts, 
-                    dynamic_opts
+                logging.info(f"[Headless] Starting {self.MODE_URL}: {input_data}")
+                fetch_metadata: Dict[str, Any] = {}
+                full_prompt, info, filename, error_result = self._prepare_single_prompt(
+                    mode, prompt, input_data, options, fetch_metadata
                 )
-                if error:
-                    return [{"status": "error", "source": url, "error_message": error, "result": None}]
+                if error_result:
+                    return [error_result]
 
-                full_prompt = self._build_prompt(prompt, content, info)
                 result = self._run_ai_task_sync(
                     provider_key, model, full_prompt, info, 
-                    original_filename=f"url_{os.path.basename(urlparse(url).path)}", **options
+                    original_filename=filename, **options
                 )
+                result["fetch"] = fetch_metadata
                 return [result]
 
             # --- 5. Directory (Batch) ---
@@ -728,7 +1276,9 @@ class AppController:
                     return [{"status": "error", "source": dir_path, "error_message": "No matching files found in directory.", "result": None}]
                 
                 # Call synchronous batch loop
-                return self._headless_batch_loop(files, prompt, provider_key, model, options, is_url_mode=False)
+                return self._headless_batch_loop(files, prompt, provider_key, model, options, is_url_mode=False,
+                                                 listener=listener, cancel_event=cancel_event,
+                                                 keep_results=keep_results)
 
             # --- 6. URL List (Batch) ---
             elif mode == self.MODE_BATCH_URL_LIST:
@@ -738,7 +1288,9 @@ class AppController:
                     return [{"status": "error", "source": "URL List", "error_message": "Empty URL list.", "result": None}]
                 
                 # Call synchronous batch loop
-                return self._headless_batch_loop(urls, prompt, provider_key, model, options, is_url_mode=True)
+                return self._headless_batch_loop(urls, prompt, provider_key, model, options, is_url_mode=True,
+                                                 listener=listener, cancel_event=cancel_event,
+                                                 keep_results=keep_results)
 
             else:
                 return [{"status": "error", "source": "System", "error_message": f"Unknown headless mode: {mode}", "result": None}]
@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batch Executor Module.
+
+Runs batch items (files or URLs) through a staged pipeline (e.g. download ->
+extract -> generate). Every stage owns its own pool of worker threads and the
+stages are connected by bounded queues, so I/O-bound downloading, CPU-bound
+extraction and slow model calls of different items overlap instead of running
+strictly one item after another.
+Results are always returned in submission order, regardless of completion order.
+A running batch can be cancelled: items that have not started yet are skipped.
+"""
+
+import time
+import queue
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Sentinel that tells a stage worker thread to exit
+_STOP = object()
+
+
+class BatchCancelled(Exception):
+    """
+    Passed to on_error for items skipped because the batch was cancelled.
+    `payload` is the stage input the item was dropped with (None if it never entered the pipeline),
+    so the handler can release what it holds (e.g. a downloaded temp file).
+    """
+
+    def __init__(self, message: str = "Batch cancelled.", payload: Any = None):
+        super().__init__(message)
+        self.payload = payload
+
+
+class PipelineStage:
+    """
+    A single pipeline stage: a function plus the size of its worker pool.
+    The function is called as func(index, payload) and its return value is
+    handed to the next stage (or becomes the item's result after the last stage).
+    """
+
+    def __init__(self, name: str, func: Callable[[int, Any], Any], workers: int = 1, start_interval: float = 0.0):
+        """
+        Initialize the stage.
+
+        Args:
+            name (str): Stage name (used in logs and statistics).
+            func (Callable): The stage function.
+            workers (int): Number of worker threads for this stage.
+            start_interval (float): Minimum number of seconds between two item starts in this stage.
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, int(workers))
+        self.start_interval = max(0.0, float(start_interval or 0.0))
+
+        self.active = 0
+        self.completed = 0
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def process(self, index: int, payload: Any) -> Any:
+        """Runs the stage function for one item while keeping the counters up to date."""
+        self._wait_for_start_slot()
+
+        with self._lock:
+            self.active += 1
+        try:
+            return self.func(index, payload)
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+
+    def _wait_for_start_slot(self) -> None:
+        """Spaces item starts by `start_interval` seconds (no-op if the interval is 0)."""
+        if self.start_interval <= 0:
+            return
+
+        with self._lock:
+            wait = self._next_start - time.monotonic()
+            self._next_start = max(self._next_start, time.monotonic()) + self.start_interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class BatchPipeline:
+    """
+    Bounded staged pipeline for batch processing.
+    Items flow through the stages in order; each stage keeps at most `workers`
+    items in flight and at most `queue_size` items wait in front of it.
+    """
+
+    def __init__(self,
+                 stages: List[PipelineStage],
+                 queue_size: int = 0,
+                 on_start: Optional[Callable[[int, Any], None]] = None,
+                 on_result: Optional[Callable[[int, Any], None]] = None,
+                 on_stats: Optional[Callable[[Dict[str, Dict[str, int]]], None]] = None,
+                 stats_interval: float = 5.0):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages (List[PipelineStage]): The stages, in processing order.
+            queue_size (int): Capacity of the queue in front of each stage (0 = 2x the stage's workers).
+            on_start (Callable, optional): Called as on_start(index, item) when an item enters the first stage.
+            on_result (Callable, optional): Called as on_result(index, result) as soon as an item is finished.
+            on_stats (Callable, optional): Called periodically with the output of stats() while the batch runs.
+            stats_interval (float): Seconds between two on_stats calls.
+        """
+        if not stages:
+            raise ValueError("BatchPipeline requires at least one stage.")
+
+        self.stages = stages
+        self.queue_size = max(0, int(queue_size))
+        self.on_start = on_start
+        self.on_result = on_result
+        self.on_stats = on_stats
+        self.stats_interval = max(0.1, float(stats_interval))
+        self._queues: List[queue.Queue] = []
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Returns the number of items waiting in front of each stage."""
+        return {stage.name: q.qsize() for stage, q in zip(self.stages, self._queues)}
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Returns per-stage statistics.
+        'queued' is the queue depth in front of the stage: a stage with a persistently
+        deep queue and all workers active is the bottleneck of the batch.
+        """
+        depths = self.queue_depths()
+        return {
+            stage.name: {
+                "queued": depths.get(stage.name, 0),
+                "active": stage.active,
+                "done": stage.completed,
+                "workers": stage.workers
+            }
+            for stage in self.stages
+        }
+
+    def _report_stats(self) -> None:
+        """Hands stats() to on_stats; a failing listener is logged and does not abort the batch."""
+        if not self.on_stats:
+            return
+        try:
+            self.on_stats(self.stats())
+        except Exception as e:
+            logging.error(f"BatchPipeline: stats handler failed: {e}")
+
+    def run(self,
+            items: Sequence[Any],
+            on_error: Optional[Callable[[int, Any, Exception], Any]] = None,
+            feed: Optional[Iterable[Tuple[int, Any]]] = None,
+            cancel_event: Optional[threading.Event] = None,
+            keep_results: bool = True) -> List[Any]:
+        """
+        Processes all items and returns the final-stage results in submission order.
+
+        Args:
+            items (Sequence): The batch items (file paths or URLs); they are the first stage's input.
+            on_error (Callable, optional): Called as on_error(index, item, exception) if any stage
+                raises; its return value is used as the item's result and the remaining stages
+                are skipped. If omitted, the first exception is re-raised after the batch finishes.
+            feed (Iterable, optional): Yields (index, first-stage input) pairs in any order, e.g. as
+                an upstream bulk download completes. Defaults to the items in submission order.
+            cancel_event (threading.Event, optional): Once set, items that have not entered a stage
+                yet are skipped (on_error receives a BatchCancelled carrying the dropped payload); items
+                in flight finish their stage. A generator feed is closed.
+            keep_results (bool): If False, results are only handed to on_result and the returned list
+                holds None (memory stays flat on very large batches).
+
+        Returns:
+            List[Any]: One result per item, in the same order as `items`.
+        """
+        total = len(items)
+        results: List[Any] = [None] * total
+        if not items:
+            return results
+
+        self._queues = [
+            queue.Queue(maxsize=self.queue_size or stage.workers * 2) for stage in self.stages
+        ]
+
+        state_lock = threading.Lock()
+        done = threading.Event()
+        remaining = [total]
+        errors: List[Exception] = []
+
+        def _finish(index: int, value: Any) -> None:
+            if keep_results:
+                results[index] = value
+            if self.on_result:
+                try:
+                    self.on_result(index, value)
+                except Exception as callback_error:
+                    logging.error(f"BatchPipeline: result callback failed: {callback_error}")
+            with state_lock:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    done.set()
+
+        def _fail(index: int, stage: PipelineStage, error: Exception) -> None:
+            if isinstance(error, BatchCancelled):
+                logging.debug(f"BatchPipeline: item {index + 1} skipped (batch cancelled).")
+            else:
+                logging.error(f"BatchPipeline: item {index + 1} failed in stage '{stage.name}': {error}", exc_info=True)
+            value = None
+            if on_error:
+                try:
+                    value = on_error(index, items[index], error)
+                except Exception as handler_error:
+                    logging.error(f"BatchPipeline: error handler failed: {handler_error}")
+            else:
+                with state_lock:
+                    errors.append(error)
+            _finish(index, value)
+
+        def _worker(stage_pos: int) -> None:
+            stage = self.stages[stage_pos]
+            in_queue = self._queues[stage_pos]
+            is_last = stage_pos == len(self.stages) - 1
+
+            while True:
+                entry = in_queue.get()
+                if entry is _STOP:
+                    break
+
+                index, payload = entry
+                if cancel_event is not None and cancel_event.is_set():
+                    _fail(index, stage, BatchCancelled(payload=payload))
+                    continue
+                try:
+                    if stage_pos == 0 and self.on_start:
+                        self.on_start(index, items[index])
+                    output = stage.process(index, payload)
+                except Exception as e:
+                    _fail(index, stage, e)
+                    continue
+
+                if is_last:
+                    _finish(index, output)
+                else:
+                    self._queues[stage_pos + 1].put((index, output))
+
+        def _feeder() -> None:
+            fed = set()
+            error: Exception = RuntimeError("Item was never delivered by the pipeline feed.")
+            source = feed if feed is not None else enumerate(items)
+            try:
+                for i, payload in source:
+                    fed.add(i)
+                    if cancel_event is not None and cancel_event.is_set():
+                        _fail(i, self.stages[0], BatchCancelled(payload=payload))
+                        break
+                    self._queues[0].put((i, payload))
+            except Exception as e:
+                error = e
+            finally:
+                # Stops a generator feed (e.g. a bulk download still running in the background)
+                close = getattr(source, "close", None)
+                if close is not None:
+                    close()
+            if cancel_event is not None and cancel_event.is_set():
+                error = BatchCancelled()
+            # Items the feed never delivered fail in the first stage instead of hanging the batch
+            for i in range(total):
+                if i not in fed:
+                    _fail(i, self.stages[0], error)
+
+        # Start worker pools (never more threads than items)
+        threads: List[List[threading.Thread]] = []
+        for pos, stage in enumerate(self.stages):
+            stage_threads = [
+                threading.Thread(target=_worker, args=(pos,), name=f"{stage.name}-{k}", daemon=True)
+                for k in range(min(stage.workers, total))
+            ]
+            for t in stage_threads:
+                t.start()
+            threads.append(stage_threads)
+
+        layout = ", ".join(f"{s.name}={len(t)}" for s, t in zip(self.stages, threads))
+        logging.info(f"BatchPipeline: {total} items, workers: {layout}.")
+
+        threading.Thread(target=_feeder, name="pipeline-feeder", daemon=True).start()
+
+        # Wait for completion, reporting stage statistics periodically
+        while not done.wait(timeout=self.stats_interval):
+            self._report_stats()
+
+        # Shut down the worker pools (all queues are drained at this point)
+        for pos, stage_threads in enumerate(threads):
+            for _ in stage_threads:
+                self._queues[pos].put(_STOP)
+        for stage_threads in threads:
+            for t in stage_threads:
+                t.join()
+
+        self._report_stats()
+
+        if errors:
+            raise errors[0]
+
+        return results
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+"""
+Browser Pool Module.
+
+Long-lived Playwright (Chromium) browsers for the dynamic web engine. Launching
+a browser costs 1-2 s, so instead of one launch per URL the pool keeps N
+browsers running and leases pages from them: every fetch gets a fresh, isolated
+browser context and page, which is closed after the fetch.
+
+Playwright's sync API is bound to the thread that started it, so every browser
+lives on its own dedicated worker thread; a lease is a job handed to a free
+worker. A browser is relaunched after `max_pages_per_browser` pages, when a
+page's JS heap exceeds `recycle_heap_mb`, or when it has crashed. If Playwright
+or the browser cannot be started (e.g. the browser binary is missing), the
+worker fails its jobs right away with that error and only retries the start
+after a backoff.
+
+Configuration ('dynamic_loader' section of config.json):
+    "browsers": 2                  # browsers (= dynamic pages rendered in parallel)
+    "max_pages_per_browser": 100   # relaunch after this many pages (0 = never)
+    "recycle_heap_mb": 512         # relaunch when a page's JS heap exceeds this (0 = off)
+"""
+
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from playwright.sync_api import sync_playwright
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    sync_playwright = None
+    PLAYWRIGHT_AVAILABLE = False
+
+# Sentinel that stops a worker thread
+_STOP = object()
+
+# Chromium-only JS heap probe (returns 0 elsewhere)
+_HEAP_JS = "() => (performance.memory ? performance.memory.usedJSHeapSize : 0)"
+
+
+class BrowserPool:
+    """
+    Fixed-size pool of browser worker threads; each owns one Playwright instance and browser.
+    """
+
+    # Backoff between two start attempts of a worker whose browser failed to start (doubles up to the max)
+    STARTUP_RETRY_SECONDS = 5.0
+    STARTUP_RETRY_MAX_SECONDS = 60.0
+
+    def __init__(self, size: int = 2, max_pages_per_browser: int = 100, recycle_heap_mb: float = 512,
+                 context_options: Optional[Dict[str, Any]] = None, launch_options: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the pool (browsers are launched on first use).
+
+        Args:
+            size (int): Number of browsers / worker threads.
+            max_pages_per_browser (int): Relaunch a browser after this many pages (0 = never).
+            recycle_heap_mb (float): Relaunch a browser when a page's JS heap exceeds this (0 = off).
+            context_options (Dict, optional): Arguments for browser.new_context() (e.g. user_agent).
+            launch_options (Dict, optional): Arguments for chromium.launch().
+        """
+        self.size = max(1, int(size))
+        self.max_pages_per_browser = max(0, int(max_pages_per_browser))
+        self.recycle_heap_bytes = int(float(recycle_heap_mb) * 1024 * 1024)
+        self.context_options = context_options or {}
+        self.launch_options = {"headless": True, **(launch_options or {})}
+
+        self._jobs: queue.Queue = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self.launches = 0
+        self.pages_served = 0
+
+    @classmethod
+    def from_config(cls, loader_cfg: Optional[Dict[str, Any]], context_options: Optional[Dict[str, Any]] = None) -> "BrowserPool":
+        """Builds the pool from the 'dynamic_loader' config section."""
+        cfg = loader_cfg or {}
+        return cls(
+            size=cfg.get("browsers", 2),
+            max_pages_per_browser=cfg.get("max_pages_per_browser", 100),
+            recycle_heap_mb=cfg.get("recycle_heap_mb", 512),
+            context_options=context_options
+        )
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BrowserPool has been shut down.")
+            if not self._threads:
+                for k in range(self.size):
+                    t = threading.Thread(target=self._worker, name=f"browser-{k}", daemon=True)
+                    t.start()
+                    self._threads.append(t)
+
+    def run(self, job: Callable[[Any], Any]) -> Any:
+        """
+        Leases a page: runs job(page) on a pooled browser in a fresh context and returns its result.
+        Blocks until a browser is free. Exceptions raised by the job propagate to the caller.
+        """
+        if not PLAYWRIGHT_AVAILABLE:
+            raise RuntimeError("Playwright is missing.")
+        self._ensure_started()
+        future: Future = Future()
+        self._jobs.put((job, future))
+        return future.result()
+
+    # --- Worker thread ---
+
+    def _worker(self) -> None:
+        """Owns one Playwright instance; (re)launches its browser as needed and serves jobs."""
+        playwright = None
+        browser = None
+        pages = 0
+        startup_error: Optional[Exception] = None
+        retry_at = 0.0
+        backoff = self.STARTUP_RETRY_SECONDS
+        try:
+            while True:
+                entry = self._jobs.get()
+                if entry is _STOP:
+                    break
+                job, future = entry
+                if not future.set_running_or_notify_cancel():
+                    continue
+
+                if startup_error is not None and time.monotonic() < retry_at:
+                    # Fail fast instead of paying a failed launch per job
+                    future.set_exception(RuntimeError(f"Browser unavailable: {startup_error}"))
+                    continue
+
+                try:
+                    if playwright is None:
+                        playwright = sync_playwright().start()
+                    if browser is None or not browser.is_connected():
+                        browser = self._launch(playwright, browser)
+                        pages = 0
+                except Exception as e:
+                    if startup_error is None:
+                        logging.error(f"BrowserPool: browser start failed on {threading.current_thread().name}: {e}")
+                    else:
+                        backoff = min(backoff * 2, self.STARTUP_RETRY_MAX_SECONDS)
+                    logging.warning(f"BrowserPool: failing jobs of {threading.current_thread().name}, "
+                                    f"next start attempt in {backoff:g}s.")
+                    startup_error = e
+                    retry_at = time.monotonic() + backoff
+                    future.set_exception(e)
+                    browser = None
+                    continue
+
+                if startup_error is not None:
+                    logging.info(f"BrowserPool: browser started on {threading.current_thread().name} after earlier failures.")
+                    startup_error = None
+                    backoff = self.STARTUP_RETRY_SECONDS
+
+                recycle = False
+                context = None
+                try:
+                    context = browser.new_context(**self.context_options)
+                    page = context.new_page()
+                    result = job(page)
+                    recycle = self._heap_exceeded(page)
+                    future.set_result(result)
+                except Exception as e:
+                    future.set_exception(e)
+                finally:
+                    if context is not None:
+                        try:
+                            context.close()
+                        except Exception:
+                            pass
+
+                pages += 1
+                with self._lock:
+                    self.pages_served += 1
+                if recycle or (self.max_pages_per_browser and pages >= self.max_pages_per_browser):
+                    logging.info(f"BrowserPool: recycling browser after {pages} pages"
+                                 f"{' (JS heap limit reached)' if recycle else ''}.")
+                    self._close_browser(browser)
+                    browser = None
+        finally:
+            self._close_browser(browser)
+            if playwright is not None:
+                try:
+                    playwright.stop()
+                except Exception:
+                    pass
+
+    def _launch(self, playwright, old_browser) -> Any:
+        self._close_browser(old_browser)
+        browser = playwright.chromium.launch(**self.launch_options)
+        with self._lock:
+            self.launches += 1
+        logging.info(f"BrowserPool: launched browser on {threading.current_thread().name}.")
+        return browser
+
+    def _heap_exceeded(self, page) -> bool:
+        if not self.recycle_heap_bytes:
+            return False
+        try:
+            return (page.evaluate(_HEAP_JS) or 0) > self.recycle_heap_bytes
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_browser(browser) -> None:
+        if browser is None:
+            return
+        try:
+            browser.close()
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        """Returns pool size, launched browsers and served pages."""
+        with self._lock:
+            return {"browsers": self.size, "launches": self.launches, "pages_served": self.pages_served}
+
+    def shutdown(self, timeout: float = 30.0) -> None:
+        """Closes all browsers and stops the worker threads (pending leases still run first)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            threads = list(self._threads)
+        for _ in threads:
+            self._jobs.put(_STOP)
+        for t in threads:
+            t.join(timeout=timeout)
+        if threads:
+            logging.info("BrowserPool: shut down.")
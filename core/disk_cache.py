@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+"""
+Disk Cache Module.
+
+Shared storage layer for the on-disk caches (AI responses, extracted text):
+a single SQLite file (stdlib only) holding compressed blobs with TTL expiry,
+size-bounded LRU eviction and hit/miss counters. Connections are short-lived,
+so the store can be used from several threads and processes at once.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+
+class SQLiteCache:
+    """
+    Key/blob store with LRU eviction. Subclasses add keying and (de)serialization.
+    """
+
+    # Table name (one per cache type, so several caches may share a database file)
+    TABLE = "entries"
+
+    def __init__(self, path: str, max_size_mb: float = 256, ttl_hours: float = 0, enabled: bool = True):
+        """
+        Initialize the store.
+
+        Args:
+            path (str): SQLite database file.
+            max_size_mb (float): Upper bound of the stored (compressed) data size.
+            ttl_hours (float): Entries older than this are treated as misses (0 = never expire).
+            enabled (bool): If False, every lookup is a miss and nothing is stored.
+        """
+        self.path = path
+        self.max_size_bytes = int(float(max_size_mb) * 1024 * 1024)
+        self.ttl_seconds = float(ttl_hours) * 3600
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+        if self.enabled:
+            try:
+                self._init_db()
+            except (sqlite3.Error, OSError) as e:
+                logging.error(f"{type(self).__name__} disabled (cannot open {path}): {e}")
+                self.enabled = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a short-lived connection; the block runs as one transaction."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.TABLE} ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+                " created REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_access ON {self.TABLE}(last_access)")
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    def get_blob(self, key: str) -> Optional[bytes]:
+        """Returns the stored blob (refreshing its LRU position), or None on a miss or expiry."""
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                row = conn.execute(f"SELECT value, created FROM {self.TABLE} WHERE key = ?", (key,)).fetchone()
+                if row and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                    conn.execute(f"DELETE FROM {self.TABLE} WHERE key = ?", (key,))
+                    row = None
+                if row:
+                    conn.execute(f"UPDATE {self.TABLE} SET last_access = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logging.warning(f"{type(self).__name__} read error: {e}")
+            row = None
+
+        self._count("hits" if row else "misses")
+        return row[0] if row else None
+
+    def put_blob(self, key: str, value: bytes) -> None:
+        """Stores a blob and evicts least-recently-used entries if the store is over budget."""
+        if not self.enabled:
+            return
+
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.TABLE} (key, value, size, created, last_access) VALUES (?, ?, ?, ?, ?)",
+                    (key, value, len(value), now, now)
+                )
+                self._evict(conn)
+            self._count("stores")
+        except sqlite3.Error as e:
+            logging.warning(f"{type(self).__name__} write error: {e}")
+
+    def delete_blob(self, key: str) -> None:
+        """Removes an entry (no-op if it does not exist)."""
+        if not self.enabled:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute(f"DELETE FROM {self.TABLE} WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            logging.warning(f"{type(self).__name__} delete error: {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Deletes least-recently-used entries until the store is below 90% of its size budget."""
+        total = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.TABLE}").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+
+        target = int(self.max_size_bytes * 0.9)
+        evicted = 0
+        for key, size in conn.execute(f"SELECT key, size FROM {self.TABLE} ORDER BY last_access ASC").fetchall():
+            if total <= target:
+                break
+            conn.execute(f"DELETE FROM {self.TABLE} WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+
+        self._count("evictions", evicted)
+        logging.info(f"{type(self).__name__}: evicted {evicted} entries.")
+
+    def clear(self) -> int:
+        """Removes all entries. Returns the number of deleted entries."""
+        if not self.enabled:
+            return 0
+        with self._connect() as conn:
+            return conn.execute(f"DELETE FROM {self.TABLE}").rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters (this process) and the current size of the store."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+        stats["enabled"] = self.enabled
+        stats["path"] = self.path
+        stats["entries"] = 0
+        stats["size_bytes"] = 0
+        if self.enabled:
+            try:
+                with self._connect() as conn:
+                    stats["entries"], stats["size_bytes"] = conn.execute(
+                        f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.TABLE}"
+                    ).fetchone()
+            except sqlite3.Error as e:
+                logging.warning(f"{type(self).__name__} stats error: {e}")
+        return stats
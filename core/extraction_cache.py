@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""
+Extraction Cache Module.
+
+Persistent cache of extracted document text. The key combines a hash of the
+file content, the extractor version and (for HTML) the extraction options, so
+unchanged files are served instantly across GUI, headless and API runs, while
+edited files or a new extractor version miss automatically.
+
+Storage is a single SQLite file (see core.disk_cache); text is stored zlib-compressed.
+"""
+
+import os
+import json
+import zlib
+import hashlib
+from typing import Any, Dict, Optional
+
+from core.disk_cache import SQLiteCache
+
+# Read size used when hashing file content
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ExtractionCache(SQLiteCache):
+    """
+    SQLite-backed LRU cache for extracted text.
+    """
+
+    TABLE = "extractions"
+
+    def __init__(self, path: str, max_size_mb: float = 1024, ttl_hours: float = 0, enabled: bool = True):
+        """
+        Initialize the cache.
+
+        Args:
+            path (str): SQLite database file.
+            max_size_mb (float): Upper bound of the stored (compressed) text size.
+            ttl_hours (float): Entries older than this are treated as misses (0 = never expire).
+            enabled (bool): If False, every lookup is a miss and nothing is stored.
+        """
+        super().__init__(path, max_size_mb=max_size_mb, ttl_hours=ttl_hours, enabled=enabled)
+
+    @classmethod
+    def from_config(cls, cache_cfg: Optional[Dict[str, Any]]) -> "ExtractionCache":
+        """Builds the cache from the 'extraction_cache' config section."""
+        cfg = cache_cfg or {}
+        return cls(
+            path=cfg.get("path", os.path.join("cache", "extraction.sqlite")),
+            max_size_mb=cfg.get("max_size_mb", 1024),
+            ttl_hours=cfg.get("ttl_hours", 0),
+            enabled=cfg.get("enabled", True)
+        )
+
+    @staticmethod
+    def make_key(filepath: str, extractor_version: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Computes the cache key of a file.
+
+        Args:
+            filepath (str): Path to the file (its content is hashed, not its name).
+            extractor_version (str): Version of the extraction logic.
+            options (Dict, optional): Extraction options that influence the output (HTML only).
+        """
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+
+        ext = os.path.splitext(filepath)[1].lower()
+        return ExtractionCache._compose_key(digest.hexdigest(), ext, extractor_version, options)
+
+    @staticmethod
+    def make_key_for_bytes(data: bytes, extension: str, extractor_version: str,
+                           options: Optional[Dict[str, Any]] = None) -> str:
+        """Computes the cache key of file content held in memory (same key as the file on disk)."""
+        return ExtractionCache._compose_key(hashlib.sha256(data).hexdigest(), extension.lower(), extractor_version, options)
+
+    @staticmethod
+    def _compose_key(content_digest: str, ext: str, extractor_version: str, options: Optional[Dict[str, Any]]) -> str:
+        suffix = json.dumps(options or {}, sort_keys=True, ensure_ascii=False)
+        return f"{content_digest}:{ext}:{extractor_version}:{hashlib.sha256(suffix.encode('utf-8')).hexdigest()[:16]}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached text, or None on a miss."""
+        blob = self.get_blob(key)
+        return zlib.decompress(blob).decode("utf-8") if blob is not None else None
+
+    def put(self, key: str, text: str) -> None:
+        """Stores extracted text."""
+        self.put_blob(key, zlib.compress(text.encode("utf-8")))
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+"""
+HTML Stream Module.
+
+Fast HTML-to-text backends for text_extractor. Instead of building a
+BeautifulSoup tree, then walking it to decompose excluded tags and again to
+collect the text, these backends receive parser events and drop excluded
+elements while parsing. The text is assembled with the same rules as
+BeautifulSoup's get_text(), so the output matches the default bs4 backend:
+
+    "stream": the standard library tokenizer (html.parser), no dependencies.
+              Follows the same tag-closing rules as bs4 with 'html.parser'.
+    "lxml":   libxml2 via lxml's parser-target interface (soft dependency).
+              Fastest; libxml2 repairs malformed markup its own way, so the
+              output may differ slightly on broken pages.
+"""
+
+from html.parser import HTMLParser
+from typing import Iterable, List, Optional
+
+try:
+    from lxml import etree
+    _HAS_LXML = True
+except ImportError:
+    etree = None
+    _HAS_LXML = False
+
+# Elements without content (never pushed on the open-element stack)
+VOID_ELEMENTS = frozenset([
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem",
+    "meta", "param", "source", "track", "wbr", "basefont", "bgsound", "command", "frame",
+    "image", "isindex", "nextid", "spacer"
+])
+
+# Elements whose strings are not part of the visible text (bs4 excludes them from get_text)
+NON_TEXT_ELEMENTS = frozenset(["script", "style", "template", "rt", "rp"])
+
+# Elements inside which whitespace-only strings are kept verbatim
+PRESERVE_WHITESPACE_ELEMENTS = frozenset(["pre", "textarea"])
+
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+BACKENDS = ("bs4", "stream", "lxml")
+
+
+class _TextCollector:
+    """
+    Receives start/end/data events and collects the visible strings. Also serves
+    as lxml parser target (start, end, data, comment, close).
+    """
+
+    def __init__(self, exclude: Iterable[str], separator: str, strip: bool):
+        self.exclude = frozenset(tag.lower() for tag in exclude or [])
+        self.separator = separator
+        self.strip = strip
+        self.parts: List[str] = []
+        self._stack: List[str] = []
+        self._buffer: List[str] = []
+        # Stack depth at which the current excluded / non-text / <pre> element was opened
+        self._skip_depth: Optional[int] = None
+        self._hidden_depth: Optional[int] = None
+        self._preserve_depth: Optional[int] = None
+
+    def _flush(self) -> None:
+        """Emits the pending string (adjacent data events form one string, as in bs4)."""
+        if not self._buffer:
+            return
+        text = "".join(self._buffer)
+        self._buffer = []
+        if self.strip:
+            text = text.strip()
+            if not text:
+                return
+        elif self._preserve_depth is None and not text.strip(_ASCII_SPACES):
+            # bs4 collapses whitespace-only strings outside <pre>/<textarea>
+            text = "\n" if "\n" in text else " "
+        self.parts.append(text)
+
+    def start(self, tag: str, attrib=None) -> None:
+        self._flush()
+        tag = tag.lower()
+        if tag in VOID_ELEMENTS:
+            return
+        self._stack.append(tag)
+        if self._skip_depth is None and tag in self.exclude:
+            self._skip_depth = len(self._stack)
+        elif self._hidden_depth is None and tag in NON_TEXT_ELEMENTS:
+            self._hidden_depth = len(self._stack)
+        if self._preserve_depth is None and tag in PRESERVE_WHITESPACE_ELEMENTS:
+            self._preserve_depth = len(self._stack)
+
+    def end(self, tag: str) -> None:
+        self._flush()
+        tag = tag.lower()
+        if tag not in self._stack:
+            return  # Stray end tag: ignored, like bs4
+        while self._stack.pop() != tag:
+            pass
+        depth = len(self._stack)
+        if self._skip_depth is not None and depth < self._skip_depth:
+            self._skip_depth = None
+        if self._hidden_depth is not None and depth < self._hidden_depth:
+            self._hidden_depth = None
+        if self._preserve_depth is not None and depth < self._preserve_depth:
+            self._preserve_depth = None
+
+    def data(self, text: str) -> None:
+        if self._skip_depth is None and self._hidden_depth is None:
+            self._buffer.append(text)
+
+    def comment(self, text: str) -> None:
+        self._flush()
+
+    def close(self) -> str:
+        self._flush()
+        return self.separator.join(self.parts)
+
+
+class _StreamParser(HTMLParser):
+    """Standard library tokenizer feeding a _TextCollector."""
+
+    def __init__(self, collector: _TextCollector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        # <tag/> opens and closes immediately
+        self.collector.start(tag)
+        if tag.lower() not in VOID_ELEMENTS:
+            self.collector.end(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+    def handle_comment(self, data):
+        self.collector.comment(data)
+
+    def handle_decl(self, decl):
+        self.collector.comment(decl)
+
+    def handle_pi(self, data):
+        self.collector.comment(data)
+
+    def unknown_decl(self, data):
+        # <![CDATA[...]]> sections count as text (bs4 CData)
+        self.collector.comment(data)
+        if data.startswith("CDATA["):
+            self.collector.data(data[6:])
+            self.collector.comment(data)
+
+
+def html_to_text(content: str, backend: str = "stream", exclude: Optional[Iterable[str]] = None,
+                 separator: str = "\n", strip: bool = True) -> str:
+    """
+    Converts an HTML string to text in a single streaming pass.
+
+    Args:
+        content (str): The HTML code.
+        backend (str): "stream" (standard library) or "lxml".
+        exclude (Iterable[str], optional): Tags dropped together with their content.
+        separator (str): Separator between strings.
+        strip (bool): Strip whitespace from every string and drop empty ones.
+
+    Returns:
+        str: The extracted text.
+    """
+    collector = _TextCollector(exclude or [], separator, strip)
+    if not content:
+        return ""
+
+    if backend == "lxml":
+        if not _HAS_LXML:
+            raise RuntimeError("HTML backend 'lxml' requested but lxml is not installed.")
+        parser = etree.HTMLParser(target=collector)
+        parser.feed(content)
+        return parser.close()
+
+    parser = _StreamParser(collector)
+    parser.feed(content)
+    parser.close()
+    return collector.close()
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+"""
+HTTP Cache Module.
+
+Local cache of static web responses for repeated URL fetches. Every stored
+body keeps its validators (ETag, Last-Modified) and freshness (Cache-Control
+max-age / Expires). The static web engine serves fresh entries without a
+request, revalidates stale ones with If-None-Match / If-Modified-Since and
+serves the stored body when the server answers 304 Not Modified.
+
+Responses marked 'Cache-Control: no-store' are never stored. Entries are keyed
+by URL only, so responses that vary on request headers other than
+Accept-Encoding (Vary) are not stored either. A response that cannot be
+stored removes the URL's previous entry.
+
+Storage is a single SQLite file (see core.disk_cache); each entry is the
+zlib-compressed metadata (JSON) followed by the body.
+"""
+
+import os
+import json
+import time
+import zlib
+import hashlib
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from core.disk_cache import SQLiteCache
+
+# Separates the JSON metadata from the body inside a stored blob (JSON never contains a raw NUL)
+_SEPARATOR = b"\x00"
+
+
+class HttpCache(SQLiteCache):
+    """
+    SQLite-backed LRU cache of HTTP response bodies with revalidation metadata.
+    """
+
+    TABLE = "http_responses"
+
+    def __init__(self, path: str, max_size_mb: float = 512, ttl_hours: float = 0, enabled: bool = True):
+        """
+        Initialize the cache.
+
+        Args:
+            path (str): SQLite database file.
+            max_size_mb (float): Upper bound of the stored (compressed) body size.
+            ttl_hours (float): Entries older than this are dropped, even if they could be revalidated (0 = never).
+            enabled (bool): If False, every lookup is a miss and nothing is stored.
+        """
+        super().__init__(path, max_size_mb=max_size_mb, ttl_hours=ttl_hours, enabled=enabled)
+
+    @classmethod
+    def from_config(cls, cache_cfg: Optional[Dict[str, Any]]) -> "HttpCache":
+        """Builds the cache from the 'http_cache' config section."""
+        cfg = cache_cfg or {}
+        return cls(
+            path=cfg.get("path", os.path.join("cache", "http.sqlite")),
+            max_size_mb=cfg.get("max_size_mb", 512),
+            ttl_hours=cfg.get("ttl_hours", 0),
+            enabled=cfg.get("enabled", True)
+        )
+
+    @staticmethod
+    def make_key(url: str) -> str:
+        """Computes the cache key of a URL."""
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def freshness(headers: Mapping[str, str], now: Optional[float] = None) -> Tuple[bool, float]:
+        """
+        Reads the caching directives of a response.
+
+        Args:
+            headers (Mapping): Response headers (case-insensitive mapping).
+            now (float, optional): Reference time (default: time.time()).
+
+        Returns:
+            Tuple[bool, float]: (storable, expiry timestamp; 0 = revalidate on every use).
+        """
+        now = time.time() if now is None else now
+        directives = {}
+        for part in (headers.get("cache-control") or "").lower().split(","):
+            name, _, value = part.strip().partition("=")
+            if name:
+                directives[name] = value.strip('"')
+
+        if "no-store" in directives:
+            return False, 0.0
+        if "no-cache" in directives:
+            return True, 0.0
+        for name in ("s-maxage", "max-age"):
+            if directives.get(name, "").isdigit():
+                return True, now + int(directives[name])
+
+        expires = headers.get("expires")
+        if expires:
+            try:
+                return True, parsedate_to_datetime(expires).timestamp()
+            except (TypeError, ValueError):
+                return True, 0.0
+        return True, 0.0
+
+    @staticmethod
+    def varies(headers: Mapping[str, str]) -> bool:
+        """True if the response depends on request headers other than Accept-Encoding (Vary)."""
+        fields = {field.strip().lower() for field in (headers.get("vary") or "").split(",") if field.strip()}
+        return bool(fields - {"accept-encoding"})
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """True if the entry may be served without contacting the server."""
+        return entry.get("expires", 0) > (time.time() if now is None else now)
+
+    @staticmethod
+    def conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        """Request headers that revalidate the entry (If-None-Match / If-Modified-Since)."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def get(self, url: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """Returns (metadata, body) of the stored response, or None on a miss."""
+        blob = self.get_blob(self.make_key(url))
+        if blob is None:
+            return None
+        meta, _, body = zlib.decompress(blob).partition(_SEPARATOR)
+        return json.loads(meta.decode("utf-8")), body
+
+    def put(self, url: str, headers: Mapping[str, str], body: bytes, kind: str, info: str) -> bool:
+        """
+        Stores a response unless it is marked no-store, varies on request headers (other than
+        Accept-Encoding) or carries no validator or freshness. Otherwise the URL's entry is removed.
+
+        Args:
+            url (str): The requested URL.
+            headers (Mapping): Response headers.
+            body (bytes): Response body (HTML as UTF-8 text, binary files as downloaded).
+            kind (str): "html" or "binary".
+            info (str): Source description returned with the cached result.
+
+        Returns:
+            bool: True if the response was stored.
+        """
+        storable, expires = self.freshness(headers)
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not storable or self.varies(headers) or not (etag or last_modified or expires):
+            # An older entry for the URL (e.g. stale without validators) must not outlive this response
+            self.delete_blob(self.make_key(url))
+            return False
+
+        meta = {
+            "url": url,
+            "kind": kind,
+            "info": info,
+            "etag": etag,
+            "last_modified": last_modified,
+            "expires": expires
+        }
+        payload = json.dumps(meta, ensure_ascii=True).encode("utf-8") + _SEPARATOR + body
+        self.put_blob(self.make_key(url), zlib.compress(payload))
+        return True
+
+    def refresh(self, url: str, entry: Dict[str, Any], body: bytes, headers: Mapping[str, str]) -> None:
+        """Updates validators and expiry of an entry after a 304 Not Modified response."""
+        merged = _LowerKeys(headers)
+        for name, key in (("etag", "etag"), ("last-modified", "last_modified")):
+            if not merged.get(name) and entry.get(key):
+                merged[name] = entry[key]
+        self.put(url, merged, body, entry.get("kind", "html"), entry.get("info", ""))
+
+
+class _LowerKeys(dict):
+    """Minimal case-insensitive header mapping for merged 304 headers."""
+
+    def __init__(self, headers: Mapping[str, str]):
+        super().__init__((k.lower(), v) for k, v in headers.items())
+
+    def get(self, key, default=None):
+        return super().get(key.lower(), default)
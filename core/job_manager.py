@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+
+"""
+Job Manager Module.
+
+Background execution of headless requests for the HTTP API. A submitted job
+gets an id immediately and runs on a bounded pool of job threads; clients poll
+its progress and partial results and may cancel it. At most `max_queued` jobs
+wait for a free thread: further submissions are rejected (HTTP 429) instead of
+piling up. Finished jobs are kept for `retention_minutes`, then dropped.
+
+Job status, progress and results live in a SQLite file (JobStore), so with a
+multi-worker API server any worker process can answer a poll or a cancel for a
+job that runs in another one. A job runs in the worker that accepted it; that
+worker refreshes the job's heartbeat and picks up cancellations requested
+through other workers. A job whose worker stopped sending heartbeats (the
+process exited) is reported as failed.
+
+Configuration ('jobs' section of config.json):
+    "max_running": 2           # jobs processed at the same time (per worker process)
+    "max_queued": 32           # jobs waiting for a free slot (0 = no waiting)
+    "retention_minutes": 60    # how long finished jobs stay available
+    "path": "cache/jobs.sqlite"
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+# Seconds between two heartbeats / cancellation checks of the jobs owned by a worker
+HEARTBEAT_SECONDS = 2.0
+# An unfinished job without a heartbeat for this long belongs to a worker that is gone
+LOST_AFTER_SECONDS = 30.0
+
+
+class JobQueueFull(RuntimeError):
+    """Raised by JobManager.submit() when `max_queued` jobs are already waiting."""
+
+
+class JobStore:
+    """
+    SQLite table of jobs (status, progress, heartbeat, cancel flag) and their per-item results.
+    Connections are short-lived, so the store can be shared by threads and worker processes.
+    """
+
+    # Columns of a job's public info (see _to_dict)
+    _COLUMNS = "id, mode, status, total, done, created, started, finished, error, owner"
+
+    def __init__(self, path: str):
+        """
+        Initialize the store.
+
+        Args:
+            path (str): SQLite database file.
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY, mode TEXT NOT NULL, status TEXT NOT NULL, error TEXT,"
+                " total INTEGER NOT NULL DEFAULT 0, done INTEGER NOT NULL DEFAULT 0,"
+                " created REAL NOT NULL, started REAL, finished REAL, heartbeat REAL NOT NULL,"
+                " cancel_requested INTEGER NOT NULL DEFAULT 0, owner TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_results ("
+                " job_id TEXT NOT NULL, idx INTEGER NOT NULL, result TEXT NOT NULL, PRIMARY KEY (job_id, idx))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)")
+
+    @contextmanager
+    def _connect(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """Opens a short-lived connection; the block runs as one transaction (write-locked if `immediate`)."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                if immediate:
+                    conn.execute("BEGIN IMMEDIATE")
+                yield conn
+        finally:
+            conn.close()
+
+    def insert(self, job_id: str, mode: str, owner: str, waiting: bool, max_queued: int) -> bool:
+        """
+        Adds a job. A job that a free job thread takes at once (`waiting` False) is added as running;
+        a waiting one is added as queued, but only while fewer than `max_queued` jobs are waiting in
+        all workers (checked and inserted atomically). Returns False if the queue is full.
+        """
+        now = time.time()
+        with self._connect(immediate=True) as conn:
+            if waiting:
+                queued = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+                if queued >= max_queued:
+                    return False
+            conn.execute(
+                "INSERT INTO jobs (id, mode, status, created, started, heartbeat, owner) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, mode, QUEUED if waiting else RUNNING, now, None if waiting else now, now, owner)
+            )
+        return True
+
+    def start(self, job_id: str) -> bool:
+        """Marks a job as running. Returns False if its cancellation was requested meanwhile."""
+        now = time.time()
+        with self._connect() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = ?, started = COALESCE(started, ?), heartbeat = ?"
+                " WHERE id = ? AND cancel_requested = 0",
+                (RUNNING, now, now, job_id)
+            ).rowcount > 0
+
+    def set_total(self, job_id: str, total: int) -> None:
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET total = ? WHERE id = ?", (total, job_id))
+
+    def add_result(self, job_id: str, index: int, result: Dict[str, Any]) -> None:
+        """Stores one finished item and updates the job's progress."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO job_results (job_id, idx, result) VALUES (?, ?, ?)",
+                (job_id, index, json.dumps(result, default=str))
+            )
+            conn.execute(
+                "UPDATE jobs SET done = (SELECT COUNT(*) FROM job_results WHERE job_id = ?) WHERE id = ?",
+                (job_id, job_id)
+            )
+
+    def finish(self, job_id: str, status: str, error: Optional[str] = None,
+               results: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Records the final state; `results` (if given) replaces the item results stored so far."""
+        with self._connect() as conn:
+            if results is not None:
+                conn.execute("DELETE FROM job_results WHERE job_id = ?", (job_id,))
+                conn.executemany(
+                    "INSERT INTO job_results (job_id, idx, result) VALUES (?, ?, ?)",
+                    [(job_id, i, json.dumps(r, default=str)) for i, r in enumerate(results)]
+                )
+                conn.execute(
+                    "UPDATE jobs SET done = ?, total = MAX(total, ?) WHERE id = ?",
+                    (len(results), len(results), job_id)
+                )
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = COALESCE(?, error), finished = ? WHERE id = ?",
+                (status, error, time.time(), job_id)
+            )
+
+    def request_cancel(self, job_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+
+    def heartbeat(self, job_ids: List[str]) -> List[str]:
+        """Refreshes the heartbeat of the given jobs. Returns those whose cancellation was requested."""
+        if not job_ids:
+            return []
+        marks = ",".join("?" * len(job_ids))
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET heartbeat = ? WHERE id IN ({marks})", (time.time(), *job_ids))
+            rows = conn.execute(
+                f"SELECT id FROM jobs WHERE cancel_requested = 1 AND id IN ({marks})", tuple(job_ids)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def fail_lost(self) -> int:
+        """Marks unfinished jobs without a recent heartbeat as failed (their worker is gone)."""
+        now = time.time()
+        with self._connect() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished = ? WHERE status IN (?, ?) AND heartbeat < ?",
+                (FAILED, "The worker process running this job exited.", now, QUEUED, RUNNING,
+                 now - LOST_AFTER_SECONDS)
+            ).rowcount
+
+    def purge(self, finished_before: float) -> None:
+        """Deletes finished jobs (and their results) that finished before the given time."""
+        marks = ",".join("?" * len(FINISHED_STATES))
+        with self._connect() as conn:
+            expired = f"SELECT id FROM jobs WHERE status IN ({marks}) AND finished < ?"
+            params = (*FINISHED_STATES, finished_before)
+            conn.execute(f"DELETE FROM job_results WHERE job_id IN ({expired})", params)
+            conn.execute(f"DELETE FROM jobs WHERE id IN ({expired})", params)
+
+    def load(self, job_id: str, include_results: bool = True) -> Optional[Dict[str, Any]]:
+        """Returns a job's status, progress and (optionally) the results finished so far."""
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {self._COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            info = self._to_dict(row)
+            if include_results:
+                info["results"] = [
+                    {"index": idx, **json.loads(result)}
+                    for idx, result in conn.execute(
+                        "SELECT idx, result FROM job_results WHERE job_id = ? ORDER BY idx", (job_id,)
+                    )
+                ]
+        return info
+
+    def load_all(self) -> List[Dict[str, Any]]:
+        """Returns all jobs (without results), oldest first."""
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT {self._COLUMNS} FROM jobs ORDER BY created").fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Returns the number of jobs per state."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {state: 0 for state in (QUEUED, RUNNING) + FINISHED_STATES}
+        counts.update(dict(rows))
+        return counts
+
+    @staticmethod
+    def _to_dict(row: tuple) -> Dict[str, Any]:
+        job_id, mode, status, total, done, created, started, finished, error, owner = row
+        return {
+            "job_id": job_id,
+            "mode": mode,
+            "status": status,
+            "progress": {"total": total, "done": done},
+            "created_at": created,
+            "started_at": started,
+            "finished_at": finished,
+            "error": error,
+            "worker": owner
+        }
+
+
+class Job:
+    """
+    A job accepted by this process: the request plus the handles that control its execution.
+    Its status, progress and results are kept in the JobStore.
+    """
+
+    def __init__(self, store: JobStore, mode: str, prompt: str, input_data: Any, options: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.store = store
+        self.mode = mode
+        self.prompt = prompt
+        self.input_data = input_data
+        self.options = options
+
+        self.cancel_event = threading.Event()
+        self.future: Optional[Future] = None
+
+    def on_event(self, event: str, data: Dict[str, Any]) -> None:
+        """Progress listener handed to AppController.process_headless()."""
+        try:
+            if event == "start":
+                self.store.set_total(self.id, data["total"])
+            elif event == "item":
+                self.store.add_result(self.id, data["index"], data["result"])
+        except sqlite3.Error as e:
+            logging.warning(f"Job {self.id}: progress not stored: {e}")
+
+
+class JobManager:
+    """
+    Runs headless requests as background jobs on a bounded thread pool; state is kept in a JobStore.
+    """
+
+    def __init__(self, runner: Callable[..., List[Dict[str, Any]]], max_running: int = 2, max_queued: int = 32,
+                 retention_minutes: float = 60, path: str = "cache/jobs.sqlite"):
+        """
+        Initialize the manager.
+
+        Args:
+            runner (Callable): Executes a request, called as runner(mode, prompt, input_data, options,
+                listener=..., cancel_event=...) (i.e. AppController.process_headless).
+            max_running (int): Jobs processed at the same time by this process.
+            max_queued (int): Jobs waiting for a free slot (in all worker processes) before submit()
+                raises JobQueueFull.
+            retention_minutes (float): How long finished jobs stay available.
+            path (str): SQLite file shared by all worker processes.
+        """
+        self.runner = runner
+        self.max_running = max(1, int(max_running))
+        self.max_queued = max(0, int(max_queued))
+        self.retention_seconds = max(0.0, float(retention_minutes) * 60)
+
+        self.store = JobStore(path)
+        self.store.fail_lost()
+        self.owner = str(os.getpid())
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_running, thread_name_prefix="job")
+        self._jobs: Dict[str, Job] = {}  # unfinished jobs of this process
+        self._lock = threading.Lock()
+
+        self._stop = threading.Event()
+        self._monitor = threading.Thread(target=self._monitor_loop, name="job-monitor", daemon=True)
+        self._monitor.start()
+
+    @classmethod
+    def from_config(cls, runner: Callable[..., List[Dict[str, Any]]], jobs_cfg: Optional[Dict[str, Any]]) -> "JobManager":
+        """Builds the manager from the 'jobs' config section."""
+        cfg = jobs_cfg or {}
+        return cls(
+            runner,
+            max_running=cfg.get("max_running", 2),
+            max_queued=cfg.get("max_queued", 32),
+            retention_minutes=cfg.get("retention_minutes", 60),
+            path=cfg.get("path", "cache/jobs.sqlite")
+        )
+
+    def submit(self, mode: str, prompt: str, input_data: Any, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Queues a request and returns the new job's info (see get()) immediately.
+
+        Raises:
+            JobQueueFull: If all job threads of this process are busy and `max_queued` jobs are already waiting.
+        """
+        job = Job(self.store, mode, prompt, input_data, options)
+        self.store.purge(time.time() - self.retention_seconds)
+        with self._lock:
+            # A free job thread takes the job at once; otherwise it has to fit into the shared queue
+            waiting = len(self._jobs) >= self.max_running
+            if not self.store.insert(job.id, mode, self.owner, waiting, self.max_queued):
+                raise JobQueueFull(f"Job queue is full ({self.max_queued} jobs waiting).")
+            self._jobs[job.id] = job
+            job.future = self._executor.submit(self._run, job)
+        logging.info(f"Job {job.id} queued: mode={mode}.")
+        return self.store.load(job.id, include_results=False)
+
+    def get(self, job_id: str, include_results: bool = True) -> Optional[Dict[str, Any]]:
+        """Returns a job's status, progress and (optionally) results; None if unknown or expired."""
+        self.store.fail_lost()
+        return self.store.load(job_id, include_results=include_results)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Returns all known jobs (without results), oldest first."""
+        self.store.fail_lost()
+        self.store.purge(time.time() - self.retention_seconds)
+        return self.store.load_all()
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Cancels a job: a waiting job never starts, a running batch skips the items
+        it has not started yet. Finished jobs are left as they are. A job running in
+        another worker process is cancelled by that worker within HEARTBEAT_SECONDS.
+        """
+        info = self.get(job_id, include_results=False)
+        if info is None or info["status"] in FINISHED_STATES:
+            return info
+        self.store.request_cancel(job_id)
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            self._cancel_local(job)
+        logging.info(f"Job {job_id} cancellation requested.")
+        return self.store.load(job_id, include_results=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of jobs per state (all workers) plus the configured limits."""
+        return {**self.store.counts(), "max_running": self.max_running, "max_queued": self.max_queued}
+
+    def shutdown(self) -> None:
+        """Cancels the unfinished jobs of this process and waits for the running ones to stop."""
+        self._stop.set()
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            self.cancel(job.id)
+        self._executor.shutdown(wait=True)
+
+    # --- Internals ---
+
+    def _cancel_local(self, job: Job) -> None:
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, CANCELLED)
+
+    def _monitor_loop(self) -> None:
+        """Keeps the heartbeat of this process's jobs fresh and applies cancellations from other workers."""
+        while not self._stop.wait(HEARTBEAT_SECONDS):
+            with self._lock:
+                jobs = dict(self._jobs)
+            try:
+                cancelled = self.store.heartbeat(list(jobs))
+            except sqlite3.Error as e:
+                logging.warning(f"Job heartbeat failed: {e}")
+                continue
+            for job_id in cancelled:
+                job = jobs[job_id]
+                if not job.cancel_event.is_set():
+                    logging.info(f"Job {job_id} cancelled by another worker.")
+                    self._cancel_local(job)
+
+    def _run(self, job: Job) -> None:
+        if job.cancel_event.is_set() or not self.store.start(job.id):
+            self._finish(job, CANCELLED)
+            return
+        logging.info(f"Job {job.id} started.")
+        try:
+            results = self.runner(
+                job.mode, job.prompt, job.input_data, job.options,
+                listener=job.on_event, cancel_event=job.cancel_event
+            )
+        except Exception as e:
+            logging.error(f"Job {job.id} failed: {e}", exc_info=True)
+            self._finish(job, FAILED, error=str(e))
+            return
+
+        # The returned list is authoritative (also covers requests that end before any item event)
+        self._finish(job, CANCELLED if job.cancel_event.is_set() else COMPLETED, results=results or [])
+
+    def _finish(self, job: Job, status: str, error: Optional[str] = None,
+                results: Optional[List[Dict[str, Any]]] = None) -> None:
+        with self._lock:
+            self._jobs.pop(job.id, None)
+        self.store.finish(job.id, status, error=error, results=results)
+        logging.info(f"Job {job.id} {status}.")
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+"""
+Parallel Extractor Module.
+
+Runs CPU-bound document parsing (PyMuPDF, python-docx, odfpy, BeautifulSoup)
+in a pool of worker processes, so batch extraction scales with the number of
+cores instead of being bound to one interpreter by the GIL.
+
+The extraction cache is consulted in the calling process (see
+text_extractor.extract_text_from_file); only cache misses are shipped to the
+pool. A file that crashes its worker (e.g. a malformed PDF taking down the
+native parser) is reported as an error for that file only: the broken pool is
+replaced and the remaining files continue.
+
+Large PDFs are additionally split into page ranges that are extracted by
+several workers at once and joined in page order. Downloads kept in memory
+(extract_bytes) are shipped to a worker as bytes, without a temporary file.
+
+Configuration ('concurrency' section of config.json):
+    "extract_mode": "process"   # "process" or "thread" (in-process, the old behavior)
+    "extract_processes": 0      # worker processes (0 = CPU count)
+    "pdf_split_pages": 200      # PDFs with at least this many pages are split across workers (0 = never)
+"""
+
+import os
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+import core.text_extractor as text_extractor
+
+# Result of one file: (text, error message)
+ExtractionResult = Tuple[Optional[str], Optional[str]]
+
+
+def _extract_in_worker(filepath: str, html_options: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Pool entry point: parses one file in the worker process (no cache access)."""
+    return text_extractor.extract_text_uncached(filepath, html_options)
+
+
+def _extract_bytes_in_worker(data: bytes, extension: str, html_options: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Pool entry point: parses in-memory file content in the worker process (no cache access)."""
+    return text_extractor.extract_bytes_uncached(data, extension, html_options)
+
+
+def _extract_pdf_range_in_worker(filepath: str, start: int, stop: int) -> Optional[str]:
+    """Pool entry point: extracts pages [start, stop) of a PDF in the worker process."""
+    return text_extractor.extract_pdf_page_range(filepath, start, stop)
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    """
+    Returns the multiprocessing start method for the pool. Forking a process that
+    already runs threads (GUI, pipeline stages, API server) can deadlock, so a
+    fork server is used where available and 'spawn' elsewhere (Windows, macOS).
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class ParallelExtractor:
+    """
+    Lazily started process pool for text extraction, shared by all batch modes.
+    """
+
+    def __init__(self, workers: int = 0, enabled: bool = True, pdf_split_pages: int = 200):
+        """
+        Initialize the extractor (the pool itself is started on first use).
+
+        Args:
+            workers (int): Number of worker processes (0 = CPU count).
+            enabled (bool): If False, every file is extracted in the calling thread.
+            pdf_split_pages (int): Minimum page count for page-parallel PDF extraction (0 = never split).
+        """
+        self.workers = int(workers) if workers and int(workers) > 0 else (os.cpu_count() or 1)
+        self.enabled = enabled
+        self.pdf_split_pages = max(0, int(pdf_split_pages or 0))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, concurrency_cfg: Optional[Dict[str, Any]]) -> "ParallelExtractor":
+        """Builds the extractor from the 'concurrency' config section."""
+        cfg = concurrency_cfg or {}
+        return cls(
+            workers=cfg.get("extract_processes", 0),
+            enabled=str(cfg.get("extract_mode", "process")).lower() == "process",
+            pdf_split_pages=cfg.get("pdf_split_pages", 200)
+        )
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                logging.info(f"Starting extraction process pool ({self.workers} workers).")
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=_pool_context())
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        """Drops a broken pool so the next submission starts a fresh one."""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run_in_pool(self, filepath: str, html_options: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Runs one uncached extraction in the pool and waits for it."""
+        pool = self._get_pool()
+        try:
+            page_count = self._split_page_count(filepath)
+            if page_count:
+                return self._extract_pdf_split(pool, filepath, page_count)
+            return pool.submit(_extract_in_worker, filepath, html_options).result()
+        except BrokenProcessPool:
+            logging.error(f"Extraction worker crashed on {filepath}; restarting the process pool.")
+            self._discard_pool(pool)
+            raise
+
+    def _run_bytes_in_pool(self, data: bytes, extension: str, html_options: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Runs one uncached in-memory extraction in the pool and waits for it."""
+        pool = self._get_pool()
+        try:
+            return pool.submit(_extract_bytes_in_worker, data, extension, html_options).result()
+        except BrokenProcessPool:
+            logging.error(f"Extraction worker crashed on in-memory {extension} content; restarting the process pool.")
+            self._discard_pool(pool)
+            raise
+
+    def _split_page_count(self, filepath: str) -> int:
+        """Returns the page count if the file is a PDF large enough to split, else 0."""
+        if not self.pdf_split_pages or self.workers < 2 or not filepath.lower().endswith(".pdf"):
+            return 0
+        page_count = text_extractor.get_pdf_page_count(filepath)
+        return page_count if page_count >= self.pdf_split_pages else 0
+
+    def _extract_pdf_split(self, pool: ProcessPoolExecutor, filepath: str, page_count: int) -> Optional[str]:
+        """Extracts a PDF as one page range per worker and joins the ranges in page order."""
+        chunk = -(-page_count // self.workers)
+        futures = [
+            pool.submit(_extract_pdf_range_in_worker, filepath, start, min(start + chunk, page_count))
+            for start in range(0, page_count, chunk)
+        ]
+        logging.info(f"Extracting {os.path.basename(filepath)} ({page_count} pages) in {len(futures)} page ranges.")
+        parts = [future.result() for future in futures]
+        if any(part is None for part in parts):
+            return None
+        return "".join(parts)
+
+    def extract(self, filepath: str, html_options: Optional[Dict[str, Any]] = None) -> ExtractionResult:
+        """
+        Extracts one file (blocking). Safe to call from many threads at once;
+        each call occupies one worker process while the file is parsed.
+
+        Returns:
+            Tuple[str | None, str | None]: (text, error). Errors never propagate as exceptions.
+        """
+        runner = self._run_in_pool if self.enabled else None
+        try:
+            text = text_extractor.extract_text_from_file(filepath, html_options, runner=runner)
+        except BrokenProcessPool:
+            return None, "Extraction worker crashed"
+        except Exception as e:
+            logging.error(f"Extraction error ({filepath}): {e}")
+            return None, f"Content extraction error: {e}"
+        return text, None if text is not None else "Read failure"
+
+    def extract_bytes(self, data: bytes, extension: str, html_options: Optional[Dict[str, Any]] = None) -> ExtractionResult:
+        """
+        Extracts file content held in memory (blocking), like extract() but without a file.
+
+        Returns:
+            Tuple[str | None, str | None]: (text, error). Errors never propagate as exceptions.
+        """
+        runner = self._run_bytes_in_pool if self.enabled else None
+        try:
+            text = text_extractor.extract_text_from_bytes(data, extension, html_options, runner=runner)
+        except BrokenProcessPool:
+            return None, "Extraction worker crashed"
+        except Exception as e:
+            logging.error(f"Extraction error (in-memory {extension}): {e}")
+            return None, f"Content extraction error: {e}"
+        return text, None if text is not None else "Read failure"
+
+    def extract_many(self, filepaths: List[str], html_options: Optional[Dict[str, Any]] = None) -> List[ExtractionResult]:
+        """
+        Extracts several files in parallel.
+
+        Returns:
+            List[Tuple[str | None, str | None]]: (text, error) per file, in submission order.
+        """
+        if not self.enabled or len(filepaths) < 2:
+            return [self.extract(path, html_options) for path in filepaths]
+
+        # One feeder thread per worker process keeps the pool saturated while
+        # cache lookups (file hashing) also run in parallel.
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(filepaths)), thread_name_prefix="extract") as feeder:
+            return list(feeder.map(lambda path: self.extract(path, html_options), filepaths))
+
+    def shutdown(self) -> None:
+        """Stops the worker processes."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
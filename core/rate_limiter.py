@@ -0,0 +1,439 @@
+# -*- coding: utf-8 -*-
+
+"""
+Rate Limiter Module.
+
+Provides per-provider / per-model request and token quotas for AI calls
+(requests-per-minute and tokens-per-minute token buckets). Every
+AIProvider.get_response() call passes through the limiter attached by the
+AppController, so GUI, headless, API server (and the debate module, which
+talks to the API server) all share the same quota.
+
+Configuration ('rate_limits' section of config.json, 0 = unlimited):
+    "rate_limits": {
+        "default": {"requests_per_minute": 0, "tokens_per_minute": 0},
+        "OpenAI": {"requests_per_minute": 500, "tokens_per_minute": 200000},
+        "OpenAI/gpt-5-mini": {"requests_per_minute": 5000, "tokens_per_minute": 2000000}
+    }
+A "Provider/model" entry wins over a "Provider" entry, which wins over "default".
+Provider and model entries define one shared bucket; "default" gives every
+provider/model pair its own bucket.
+
+Each entry may also set "max_concurrency" (default 64): the ceiling of an
+AIMD-controlled in-flight limit that halves when the provider pushes back
+(429/503) and grows by one request per round of successes after recovery.
+
+Async callers (AIProvider.get_response_async) use slot_async() / acquire_async() /
+record_usage_async(), which wait without blocking the event loop and share the same
+quotas. Shared (SQLite) buckets are updated on a worker thread, so a busy store
+never stalls the loop.
+
+With a multi-worker API server, use_shared_store() moves the token buckets into
+a SQLite file so all worker processes draw from one quota. The in-flight limit
+("max_concurrency") stays per process.
+"""
+
+import os
+import time
+import sqlite3
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
+
+# Rough characters-per-token ratio used to estimate prompt tokens before a call
+# (same heuristic as the Gemini fallback token estimation).
+CHARS_PER_TOKEN = 3
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `rate_per_minute`.
+    Uses reservations: a caller debits immediately (the balance may go negative)
+    and is told how long to wait, which keeps callers in FIFO order without
+    holding a lock while sleeping.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate_per_minute (float): Refill rate (requests or tokens per minute).
+            capacity (float, optional): Maximum burst size. Defaults to one minute of quota.
+        """
+        self.rate_per_second = float(rate_per_minute) / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Debits `amount` and returns the number of seconds the caller must wait
+        before the reservation becomes valid (0.0 if it can proceed immediately).
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_second
+
+    def adjust(self, delta: float) -> None:
+        """Corrects a previous reservation (positive delta refunds, negative debits)."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + delta)
+
+
+class SharedTokenBucket:
+    """
+    Token bucket whose balance lives in a SQLite table, so several processes share it.
+    Same reservation semantics as TokenBucket; every reserve/adjust is one short write transaction.
+    If the store cannot be reached the bucket falls back to a process-local TokenBucket.
+    """
+
+    TABLE = "rate_buckets"
+
+    def __init__(self, path: str, key: str, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            path (str): SQLite database file (see init_store()).
+            key (str): Bucket name, unique within the store.
+            rate_per_minute (float): Refill rate (requests or tokens per minute).
+            capacity (float, optional): Maximum burst size. Defaults to one minute of quota.
+        """
+        self.path = path
+        self.key = key
+        self.rate_per_second = float(rate_per_minute) / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._fallback = TokenBucket(rate_per_minute, capacity)
+
+    @classmethod
+    def init_store(cls, path: str) -> None:
+        """Creates the database file and the bucket table."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=30)
+        try:
+            with conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {cls.TABLE} ("
+                    " key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+                )
+        finally:
+            conn.close()
+
+    def _apply(self, delta: float) -> float:
+        """Refills, adds `delta` (negative = debit) and returns the new balance, in one write transaction."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                # Wall-clock time: the balance is shared between processes
+                conn.execute("BEGIN IMMEDIATE")
+                now = time.time()
+                row = conn.execute(f"SELECT tokens, updated FROM {self.TABLE} WHERE key = ?", (self.key,)).fetchone()
+                tokens = self.capacity
+                if row:
+                    tokens = min(self.capacity, row[0] + max(0.0, now - row[1]) * self.rate_per_second)
+                tokens = min(self.capacity, tokens + delta) if delta > 0 else tokens + delta
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.TABLE} (key, tokens, updated) VALUES (?, ?, ?)",
+                    (self.key, tokens, now)
+                )
+            return tokens
+        finally:
+            conn.close()
+
+    def reserve(self, amount: float) -> float:
+        """Debits `amount` and returns the seconds to wait before the reservation becomes valid."""
+        try:
+            tokens = self._apply(-amount)
+        except sqlite3.Error as e:
+            logging.warning(f"Rate limiter: shared bucket {self.key} unavailable, using a local bucket: {e}")
+            return self._fallback.reserve(amount)
+        if tokens >= 0:
+            return 0.0
+        return -tokens / self.rate_per_second
+
+    def adjust(self, delta: float) -> None:
+        """Corrects a previous reservation (positive delta refunds, negative debits)."""
+        try:
+            self._apply(delta)
+        except sqlite3.Error as e:
+            logging.warning(f"Rate limiter: shared bucket {self.key} unavailable, using a local bucket: {e}")
+            self._fallback.adjust(delta)
+
+
+# A process-local or a shared (multi-process) bucket; both offer reserve() and adjust()
+Bucket = Union[TokenBucket, SharedTokenBucket]
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD (additive increase, multiplicative decrease) limit on in-flight requests.
+    """
+
+    # Minimum seconds between two decreases, so one burst of 429s halves the limit only once
+    DECREASE_COOLDOWN = 1.0
+
+    def __init__(self, max_limit: int):
+        """
+        Initialize the controller.
+
+        Args:
+            max_limit (int): Upper bound (and starting value) of the in-flight limit.
+        """
+        self.max_limit = max(1, int(max_limit))
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        # Coroutines waiting for a slot: (event loop, future), woken from any thread
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def acquire(self) -> None:
+        """Blocks until a request slot is free under the current limit."""
+        with self._cond:
+            while self.in_flight >= max(1, int(self.limit)):
+                self._cond.wait()
+            self.in_flight += 1
+
+    async def acquire_async(self) -> None:
+        """Waits (without blocking the event loop) until a request slot is free under the current limit."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self.in_flight < max(1, int(self.limit)):
+                    self.in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # A wake-up that arrived just before the cancellation is passed on
+                with self._cond:
+                    if waiter.done() and not waiter.cancelled():
+                        self._wake_async(all_waiters=False)
+                raise
+
+    def release(self) -> None:
+        """Frees a request slot."""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+            self._wake_async(all_waiters=False)
+
+    def on_success(self) -> None:
+        """Additive increase: +1 slot per `limit` successful requests."""
+        with self._cond:
+            if self.limit < self.max_limit:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+                self._cond.notify_all()
+                self._wake_async(all_waiters=True)
+
+    def _wake_async(self, all_waiters: bool) -> None:
+        """Wakes waiting coroutines (caller holds the condition); cancelled waiters are skipped."""
+        while self._async_waiters:
+            loop, waiter = self._async_waiters.pop(0)
+            if waiter.done():
+                continue
+            loop.call_soon_threadsafe(_resolve_waiter, waiter)
+            if not all_waiters:
+                return
+
+    def on_throttle(self) -> None:
+        """Multiplicative decrease: halve the limit (at most once per cooldown window)."""
+        with self._cond:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.DECREASE_COOLDOWN:
+                self.limit = max(1.0, self.limit / 2.0)
+                self._last_decrease = now
+
+
+def _resolve_waiter(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class RateLimiter:
+    """
+    Registry of request/token buckets and adaptive concurrency limits, keyed by provider/model.
+    """
+
+    def __init__(self, limits_config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            limits_config (Dict, optional): The 'rate_limits' section from config.json.
+        """
+        self.config = limits_config or {}
+        self._buckets: Dict[str, Tuple[Optional[Bucket], Optional[Bucket]]] = {}
+        self._concurrency: Dict[str, AdaptiveConcurrency] = {}
+        self._lock = threading.Lock()
+        self._store_path: Optional[str] = None
+
+    def use_shared_store(self, path: str) -> None:
+        """
+        Keeps the request/token buckets in a SQLite file from now on, so every process that
+        uses the same file (the workers of a multi-worker API server) shares one quota.
+        """
+        SharedTokenBucket.init_store(path)
+        with self._lock:
+            self._store_path = path
+            self._buckets.clear()
+        logging.info(f"Rate limiter: buckets shared through {path}")
+
+    @staticmethod
+    def _is_shared(*buckets: Optional[Bucket]) -> bool:
+        """True if any of the buckets lives in the shared store (its updates are blocking SQLite writes)."""
+        return any(isinstance(bucket, SharedTokenBucket) for bucket in buckets)
+
+    def _new_bucket(self, key: str, rate_per_minute: float) -> Bucket:
+        if self._store_path:
+            return SharedTokenBucket(self._store_path, key, rate_per_minute)
+        return TokenBucket(rate_per_minute)
+
+    @staticmethod
+    def estimate_tokens(prompt: str) -> int:
+        """Estimates the prompt's token count before the call."""
+        return max(1, len(prompt) // CHARS_PER_TOKEN)
+
+    def _resolve_limits(self, provider_key: str, model: str) -> Tuple[str, Dict[str, Any]]:
+        """Returns the bucket key and the limit entry that applies to provider/model."""
+        qualified = f"{provider_key}/{model}"
+        if qualified in self.config:
+            return qualified, self.config[qualified]
+        if provider_key in self.config:
+            return provider_key, self.config[provider_key]
+        return qualified, self.config.get("default", {})
+
+    def _get_buckets(self, provider_key: str, model: str) -> Tuple[Optional[Bucket], Optional[Bucket]]:
+        """Returns (request bucket, token bucket) for provider/model, creating them on first use."""
+        bucket_key, limits = self._resolve_limits(provider_key, model)
+        with self._lock:
+            if bucket_key not in self._buckets:
+                rpm = float(limits.get("requests_per_minute", 0) or 0)
+                tpm = float(limits.get("tokens_per_minute", 0) or 0)
+                self._buckets[bucket_key] = (
+                    self._new_bucket(f"{bucket_key}#requests", rpm) if rpm > 0 else None,
+                    self._new_bucket(f"{bucket_key}#tokens", tpm) if tpm > 0 else None
+                )
+                if rpm > 0 or tpm > 0:
+                    logging.info(f"Rate limiter: {bucket_key} -> {rpm:g} RPM, {tpm:g} TPM")
+            return self._buckets[bucket_key]
+
+    def _get_concurrency(self, provider_key: str, model: str) -> AdaptiveConcurrency:
+        """Returns the AIMD controller for provider/model, creating it on first use."""
+        key, limits = self._resolve_limits(provider_key, model)
+        with self._lock:
+            if key not in self._concurrency:
+                self._concurrency[key] = AdaptiveConcurrency(limits.get("max_concurrency", 64))
+            return self._concurrency[key]
+
+    @contextmanager
+    def slot(self, provider_key: str, model: str) -> Iterator[None]:
+        """Holds one in-flight request slot for provider/model for the duration of the block."""
+        controller = self._get_concurrency(provider_key, model)
+        controller.acquire()
+        try:
+            yield
+        finally:
+            controller.release()
+
+    @asynccontextmanager
+    async def slot_async(self, provider_key: str, model: str) -> AsyncIterator[None]:
+        """Async variant of slot(): holds one in-flight request slot without blocking the event loop."""
+        controller = self._get_concurrency(provider_key, model)
+        await controller.acquire_async()
+        try:
+            yield
+        finally:
+            controller.release()
+
+    def on_success(self, provider_key: str, model: str) -> None:
+        """Feeds a successful call back into the adaptive concurrency limit."""
+        self._get_concurrency(provider_key, model).on_success()
+
+    def on_throttle(self, provider_key: str, model: str) -> None:
+        """Feeds provider pushback (429/503) back into the adaptive concurrency limit."""
+        controller = self._get_concurrency(provider_key, model)
+        controller.on_throttle()
+        logging.warning(f"Rate limiter: {provider_key}/{model} pushed back, in-flight limit now {int(controller.limit)}")
+
+    def reserve(self, provider_key: str, model: str, estimated_tokens: int) -> float:
+        """
+        Reserves one request and `estimated_tokens` tokens.
+
+        Returns:
+            float: Seconds to wait before the call may start.
+        """
+        request_bucket, token_bucket = self._get_buckets(provider_key, model)
+        wait = 0.0
+        if request_bucket:
+            wait = max(wait, request_bucket.reserve(1))
+        if token_bucket:
+            wait = max(wait, token_bucket.reserve(estimated_tokens))
+        return wait
+
+    def acquire(self, provider_key: str, model: str, estimated_tokens: int) -> float:
+        """
+        Blocks until the call fits into the quota.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        wait = self.reserve(provider_key, model, estimated_tokens)
+        if wait > 0:
+            logging.info(f"Rate limiter: waiting {wait:.2f}s for {provider_key}/{model}")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, provider_key: str, model: str, estimated_tokens: int) -> float:
+        """
+        Async variant of acquire(): waits with asyncio.sleep() until the call fits into the quota.
+        Reservations in the shared store run on a worker thread.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        if self._is_shared(*self._get_buckets(provider_key, model)):
+            wait = await asyncio.to_thread(self.reserve, provider_key, model, estimated_tokens)
+        else:
+            wait = self.reserve(provider_key, model, estimated_tokens)
+        if wait > 0:
+            logging.info(f"Rate limiter: waiting {wait:.2f}s for {provider_key}/{model}")
+            await asyncio.sleep(wait)
+        return wait
+
+    def record_usage(self, provider_key: str, model: str, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Reconciles the token bucket with the token count reported by the provider."""
+        if actual_tokens is None:
+            return
+        _, token_bucket = self._get_buckets(provider_key, model)
+        if token_bucket:
+            token_bucket.adjust(estimated_tokens - actual_tokens)
+
+    async def record_usage_async(self, provider_key: str, model: str, estimated_tokens: int,
+                                 actual_tokens: Optional[int]) -> None:
+        """Async variant of record_usage(): a shared token bucket is updated on a worker thread."""
+        if actual_tokens is None:
+            return
+        _, token_bucket = self._get_buckets(provider_key, model)
+        if self._is_shared(token_bucket):
+            await asyncio.to_thread(token_bucket.adjust, estimated_tokens - actual_tokens)
+        elif token_bucket:
+            token_bucket.adjust(estimated_tokens - actual_tokens)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+"""
+Response Cache Module.
+
+On-disk, content-addressed cache for AI responses. The key is a SHA-256 hash of
+everything that determines the model output (provider, model, reasoning effort,
+verbosity, temperature and the full prompt), so re-running the same prompt over
+the same document is served from disk instead of paying provider cost and latency.
+
+Storage is a single SQLite file (see core.disk_cache) with TTL expiry and
+size-bounded LRU eviction. Only successful responses are cached.
+"""
+
+import os
+import json
+import zlib
+import hashlib
+from typing import Any, Dict, Optional
+
+from core.disk_cache import SQLiteCache
+
+
+class ResponseCache(SQLiteCache):
+    """
+    SQLite-backed LRU cache for AIResponse dictionaries.
+    """
+
+    TABLE = "responses"
+
+    def __init__(self, path: str, max_size_mb: float = 256, ttl_hours: float = 168, enabled: bool = True):
+        """
+        Initialize the cache.
+
+        Args:
+            path (str): SQLite database file.
+            max_size_mb (float): Upper bound of the stored (compressed) response size.
+            ttl_hours (float): Entries older than this are treated as misses (0 = never expire).
+            enabled (bool): If False, every lookup is a miss and nothing is stored.
+        """
+        super().__init__(path, max_size_mb=max_size_mb, ttl_hours=ttl_hours, enabled=enabled)
+
+    @classmethod
+    def from_config(cls, cache_cfg: Optional[Dict[str, Any]]) -> "ResponseCache":
+        """Builds the cache from the 'response_cache' config section."""
+        cfg = cache_cfg or {}
+        return cls(
+            path=cfg.get("path", os.path.join("cache", "responses.sqlite")),
+            max_size_mb=cfg.get("max_size_mb", 256),
+            ttl_hours=cfg.get("ttl_hours", 168),
+            enabled=cfg.get("enabled", True)
+        )
+
+    @staticmethod
+    def make_key(provider_key: str, model: str, prompt: str, **params: Any) -> str:
+        """
+        Computes the content address of a request.
+
+        Args:
+            provider_key (str): Provider identifier.
+            model (str): Model identifier.
+            prompt (str): The full prompt sent to the model.
+            **params: Generation parameters (reasoning_effort, verbosity, temperature).
+        """
+        material = json.dumps({
+            "provider": provider_key,
+            "model": model,
+            "reasoning_effort": params.get("reasoning_effort"),
+            "verbosity": params.get("verbosity"),
+            "temperature": params.get("temperature"),
+            "prompt": prompt
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Looks up a cached response.
+
+        Returns:
+            Dict | None: The cached AIResponse (marked with 'cached': True), or None on a miss.
+        """
+        blob = self.get_blob(key)
+        if blob is None:
+            return None
+
+        response = json.loads(zlib.decompress(blob).decode("utf-8"))
+        response["cached"] = True
+        response["retries"] = 0
+        response["status_message"] = f"{response.get('status_message') or 'Success'} (Cached)"
+        return response
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        """Stores a successful response (error responses are never cached)."""
+        if not self.enabled or response.get("error"):
+            return
+        self.put_blob(key, zlib.compress(json.dumps(response, ensure_ascii=False).encode("utf-8")))
@@ -7,11 +7,23 @@ This module is responsible for converting various file formats (PDF, DOCX, HTML,
 into raw text. The module follows a "soft dependency" principle: if an external library
 (e.g., PyMuPDF) is missing, the application will not crash; only support for that
 specific format will be disabled.
+
+Every format extractor accepts either a file path or the file content as bytes
+(e.g. a download kept in memory, see extract_text_from_bytes), so documents do
+not need a temporary file to be parsed.
 """
 
+import io
 import os
+import mmap
+import codecs
 import logging
-from typing import Optional, Dict, Any, List, Callable
+from typing import Optional, Dict, Any, List, Callable, Union, Iterator, Tuple, TYPE_CHECKING
+
+from core import html_stream
+
+if TYPE_CHECKING:
+    from core.extraction_cache import ExtractionCache
 
 # --- Import Optional Libraries ---
 # Try-except blocks ensure that core functions (reading txt) work
@@ -58,89 +70,298 @@ if not all([_HAS_PDF, _HAS_DOCX, _HAS_ODT, _HAS_BS4, _HAS_RTF]):
     logging.warning("Some extractor libraries are missing. Certain file types will not be supported.")
 
 
+# A document: file path, or the file content in memory
+Source = Union[str, bytes]
+
 # --- Constants ---
 DEFAULT_HTML_PARSER = 'html.parser'
+# 'bs4' (BeautifulSoup tree), or a streaming backend: 'stream' (stdlib) / 'lxml' (see core.html_stream)
+DEFAULT_HTML_BACKEND = 'bs4'
 DEFAULT_EXCLUDED_TAGS = ["script", "style", "meta", "link", "header", "footer", "nav", "aside"]
 
+# Bump whenever extraction output changes, so cached results of older versions are not reused
+EXTRACTOR_VERSION = "2"
+
+# Optional persistent cache of extracted text (set by the AppController)
+_EXTRACTION_CACHE: Optional["ExtractionCache"] = None
+
+
+def set_extraction_cache(cache: Optional["ExtractionCache"]) -> None:
+    """
+    Enables (or disables, with None) the persistent extraction cache used by extract_text_from_file.
+    """
+    global _EXTRACTION_CACHE
+    _EXTRACTION_CACHE = cache if cache is not None and cache.enabled else None
+
 
 # --- Helper: Safe file reading with encoding detection ---
+
+# Byte order marks, longest first (the UTF-32 LE mark starts with the UTF-16 LE mark)
+_BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+# Prefix used to rule out candidate encodings before decoding the whole file
+_SNIFF_SIZE = 64 * 1024
+
+# Files above this size are decoded straight from a memory map instead of a bytes copy
+_MMAP_THRESHOLD = 16 * 1024 * 1024
+
+
+def _detect_encoding(data, encodings: List[str]) -> List[str]:
+    """
+    Returns the encodings worth a full decode, in priority order: the BOM
+    encoding if present, otherwise the candidates whose decoder accepts the
+    sampled prefix (checked incrementally, so a multi-byte character cut at
+    the end of the sample does not disqualify UTF-8).
+    """
+    head = bytes(data[:4])
+    for bom, enc in _BOMS:
+        if head.startswith(bom):
+            return [enc]
+
+    sample = bytes(data[:_SNIFF_SIZE])
+    # Fast path: a small pure-ASCII file is valid UTF-8, no need to try the other candidates
+    if 'utf-8' in encodings and len(data) <= _SNIFF_SIZE and sample.isascii():
+        return ['utf-8']
+
+    plausible = []
+    for enc in encodings:
+        try:
+            codecs.getincrementaldecoder(enc)().decode(sample, final=False)
+            plausible.append(enc)
+        except (UnicodeDecodeError, LookupError):
+            continue
+    return plausible
+
+
 def _read_text_file_safe(filepath: str, encodings: List[str] = None) -> Optional[str]:
-    """Attempts to read a file using multiple encodings."""
+    """
+    Reads a text file with encoding detection. The file is read once (memory-mapped
+    when large), the encoding is chosen from the BOM or a sampled prefix, and the
+    content is decoded once in the common case. Newlines are translated as in text mode.
+    """
     if encodings is None:
         encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-    
-    for enc in encodings:
+
+    try:
+        with open(filepath, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return ""
+            if size > _MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    text = _decode_candidates(data, encodings)
+            else:
+                text = _decode_candidates(f.read(), encodings)
+    except Exception as e:
+        logging.error(f"File reading error ({filepath}): {e}")
+        return None
+
+    if text is None:
+        logging.error(f"Failed to detect file encoding: {filepath}")
+        return None
+    return _translate_newlines(text)
+
+
+def _translate_newlines(text: str) -> str:
+    """Same universal-newline behavior as reading in text mode."""
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _read_text_source(source: Source, encodings: List[str] = None) -> Optional[str]:
+    """Decodes a text document given as a file path or as bytes."""
+    if not isinstance(source, (bytes, bytearray, memoryview)):
+        return _read_text_file_safe(source, encodings)
+    if encodings is None:
+        encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
+    if len(source) == 0:
+        return ""
+    text = _decode_candidates(source, encodings)
+    if text is None:
+        logging.error("Failed to detect the encoding of in-memory content.")
+        return None
+    return _translate_newlines(text)
+
+
+def _source_name(source: Source) -> str:
+    """Label of a document source for log messages."""
+    return "<in-memory>" if isinstance(source, (bytes, bytearray, memoryview)) else str(source)
+
+
+def _as_file(source: Source):
+    """Path or a binary file object, for libraries that accept either."""
+    return io.BytesIO(source) if isinstance(source, (bytes, bytearray, memoryview)) else source
+
+
+def _decode_candidates(data, encodings: List[str]) -> Optional[str]:
+    """Decodes the whole buffer with the first plausible encoding that succeeds."""
+    for enc in _detect_encoding(data, encodings):
         try:
-            with open(filepath, 'r', encoding=enc) as f:
-                return f.read()
+            return str(data, enc)
         except UnicodeDecodeError:
             continue
-        except Exception as e:
-            logging.error(f"File reading error ({filepath}): {e}")
-            return None
-    
-    logging.error(f"Failed to detect file encoding: {filepath}")
     return None
 
 
 # --- Specific Extractors ---
 
-def _extract_plain_text(filepath: str) -> Optional[str]:
+def _extract_plain_text(source: Source) -> Optional[str]:
     """Reads simple text files (txt, py, md)."""
-    return _read_text_file_safe(filepath)
+    return _read_text_source(source)
 
-def _extract_pdf(filepath: str) -> Optional[str]:
-    """Processes PDF (PyMuPDF)."""
+def _open_pdf(source: Source):
+    """Opens a PDF from a path or from bytes (PyMuPDF reads memory streams directly)."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=bytes(source), filetype="pdf")
+    return fitz.open(source)
+
+def iter_pdf_pages(source: Source, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+    """
+    Streams the text of a PDF page by page (PyMuPDF), so only one page is held in memory.
+    The document is closed when the iteration ends or the generator is closed.
+
+    Args:
+        source (str | bytes): Path to the PDF, or its content.
+        start (int): Index of the first page (0-based).
+        stop (int, optional): Index after the last page (default: end of document).
+
+    Yields:
+        Tuple[int, str]: (page number, 1-based; page text).
+    """
+    if not _HAS_PDF:
+        raise RuntimeError("PDF processing not possible: PyMuPDF is missing.")
+
+    doc = _open_pdf(source)
     try:
-        doc = fitz.open(filepath)
-        text = "".join([page.get_text("text") for page in doc])
+        end = doc.page_count if stop is None else min(stop, doc.page_count)
+        for index in range(start, end):
+            yield index + 1, doc.load_page(index).get_text("text")
+    finally:
         doc.close()
-        return text
+
+def _read_pdf_text(source: Source, start: int = 0, stop: Optional[int] = None,
+                   page_offsets: Optional[List[int]] = None) -> str:
+    """
+    Returns the text of pages [start, stop) of a PDF, built from iter_pdf_pages().
+
+    Args:
+        source (str | bytes): Path to the PDF, or its content.
+        start (int): Index of the first page (0-based).
+        stop (int, optional): Index after the last page (default: end of document).
+        page_offsets (List[int], optional): Receives the offset in the returned text where each page starts.
+    """
+    parts: List[str] = []
+    length = 0
+    for _, text in iter_pdf_pages(source, start, stop):
+        if page_offsets is not None:
+            page_offsets.append(length)
+        parts.append(text)
+        length += len(text)
+    return "".join(parts)
+
+def get_pdf_page_count(filepath: str) -> int:
+    """Returns the number of pages of a PDF (0 if it cannot be opened)."""
+    if not _HAS_PDF:
+        return 0
+    try:
+        with fitz.open(filepath) as doc:
+            return doc.page_count
     except Exception as e:
         logging.error(f"PDF error ({filepath}): {e}")
+        return 0
+
+def extract_pdf_page_range(filepath: str, start: int, stop: int) -> Optional[str]:
+    """Extracts the text of pages [start, stop) of a PDF (the unit of page-parallel extraction)."""
+    try:
+        return _read_pdf_text(filepath, start, stop)
+    except Exception as e:
+        logging.error(f"PDF error ({filepath}, pages {start + 1}-{stop}): {e}")
         return None
 
-def _extract_docx(filepath: str) -> Optional[str]:
+def extract_pdf_with_page_offsets(source: Source) -> Tuple[Optional[str], List[int]]:
+    """
+    Page-aware variant of PDF extraction: returns the same text as extract_text_from_file()
+    plus the offset in that text where each page starts (page_offsets[n - 1] for page n),
+    e.g. for chunking by page. On failure the text is None.
+    """
+    page_offsets: List[int] = []
+    try:
+        return _read_pdf_text(source, page_offsets=page_offsets), page_offsets
+    except Exception as e:
+        logging.error(f"PDF error ({_source_name(source)}): {e}")
+        return None, []
+
+def _extract_pdf(source: Source) -> Optional[str]:
+    """Processes PDF (PyMuPDF)."""
+    try:
+        return _read_pdf_text(source)
+    except Exception as e:
+        logging.error(f"PDF error ({_source_name(source)}): {e}")
+        return None
+
+def _extract_docx(source: Source) -> Optional[str]:
     """Processes DOCX (python-docx)."""
     try:
-        doc = docx.Document(filepath)
+        doc = docx.Document(_as_file(source))
         return '\n'.join([p.text for p in doc.paragraphs])
     except Exception as e:
-        logging.error(f"DOCX error ({filepath}): {e}")
+        logging.error(f"DOCX error ({_source_name(source)}): {e}")
         return None
 
-def _extract_odt(filepath: str) -> Optional[str]:
+def _extract_odt(source: Source) -> Optional[str]:
     """Processes ODT (odfpy)."""
     try:
-        textdoc = odf_load(filepath)
+        textdoc = odf_load(_as_file(source))
         all_paras = textdoc.getElementsByType(odf_text.P)
         return '\n'.join([teletype.extractText(p) for p in all_paras])
     except Exception as e:
-        logging.error(f"ODT error ({filepath}): {e}")
+        logging.error(f"ODT error ({_source_name(source)}): {e}")
         return None
 
-def _extract_rtf(filepath: str) -> Optional[str]:
+def _extract_rtf(source: Source) -> Optional[str]:
     """Processes RTF (striprtf)."""
     # RTF is often not UTF-8 but 8-bit encoded
-    content = _read_text_file_safe(filepath)
+    content = _read_text_source(source)
     if content:
         try:
             return rtf_to_text(content, errors="ignore")
         except Exception as e:
-            logging.error(f"RTF conversion error ({filepath}): {e}")
+            logging.error(f"RTF conversion error ({_source_name(source)}): {e}")
     return None
 
 def _extract_html_content(content: str, options: Dict[str, Any] = None) -> Optional[str]:
-    """Processes HTML string (BeautifulSoup logic)."""
+    """Processes HTML string (BeautifulSoup logic, or a streaming backend from core.html_stream)."""
+    opts = options or {}
+    backend = str(opts.get('backend') or DEFAULT_HTML_BACKEND).lower()
+    exclude = opts.get('decompose_tags', DEFAULT_EXCLUDED_TAGS)
+    separator = opts.get('text_separator', '\n')
+    do_strip = opts.get('text_strip', True)
+
+    if backend != 'bs4':
+        if backend not in html_stream.BACKENDS:
+            logging.warning(f"Unknown HTML backend '{backend}', using 'stream'.")
+            backend = 'stream'
+        elif backend == 'lxml' and not html_stream._HAS_LXML:
+            logging.warning("HTML backend 'lxml' requested but lxml is missing, using 'stream'.")
+            backend = 'stream'
+        try:
+            return html_stream.html_to_text(content, backend, exclude, separator, do_strip)
+        except Exception as e:
+            logging.error(f"HTML parse error ({backend}): {e}")
+            return None
+
     if not _HAS_BS4:
         logging.error("HTML processing not possible: beautifulsoup4 is missing.")
         return None
 
-    opts = options or {}
     parser = opts.get('parser', DEFAULT_HTML_PARSER)
-    exclude = opts.get('decompose_tags', DEFAULT_EXCLUDED_TAGS)
-    separator = opts.get('text_separator', '\n')
-    do_strip = opts.get('text_strip', True)
 
     try:
         soup = BeautifulSoup(content, parser)
@@ -155,9 +376,9 @@ def _extract_html_content(content: str, options: Dict[str, Any] = None) -> Optio
         logging.error(f"HTML parse error: {e}")
         return None
 
-def _extract_html_file(filepath: str, options: Dict[str, Any] = None) -> Optional[str]:
+def _extract_html_file(source: Source, options: Dict[str, Any] = None) -> Optional[str]:
     """Reads and processes an HTML file."""
-    content = _read_text_file_safe(filepath)
+    content = _read_text_source(source)
     if content:
         return _extract_html_content(content, options)
     return None
@@ -190,13 +411,60 @@ SUPPORTED_EXTRACTORS = _EXTRACTORS
 
 # --- Public API ---
 
-def extract_text_from_file(filepath: str, html_options: Optional[Dict[str, Any]] = None) -> Optional[str]:
+def extract_text_uncached(filepath: str, html_options: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """
+    Extracts text based on the file extension, bypassing the extraction cache.
+    This is the unit of work shipped to extraction worker processes.
+
+    Args:
+        filepath (str): Path to the file.
+        html_options (Dict, optional): Extra settings for HTML files.
+
+    Returns:
+        str | None: The extracted text, or None on error.
+    """
+    _, ext = os.path.splitext(filepath)
+    return _extract_source(filepath, ext, html_options)
+
+
+def extract_bytes_uncached(data: bytes, extension: str, html_options: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """
+    Extracts text from file content held in memory, bypassing the extraction cache.
+
+    Args:
+        data (bytes): The file content.
+        extension (str): File extension that selects the extractor (e.g. ".pdf").
+        html_options (Dict, optional): Extra settings for HTML content.
+
+    Returns:
+        str | None: The extracted text, or None on error.
+    """
+    return _extract_source(data, extension, html_options)
+
+
+def _extract_source(source: Source, ext: str, html_options: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Dispatches a path or bytes to the extractor registered for the extension."""
+    extractor = _EXTRACTORS.get(ext.lower())
+    if not extractor:
+        return None
+
+    # Special handling for passing HTML options
+    if ext.lower() in ['.html', '.htm'] and _HAS_BS4:
+        # A lambda or direct call is registered here, but for safety:
+        return _extract_html_file(source, html_options)
+    return extractor(source)
+
+
+def extract_text_from_file(filepath: str, html_options: Optional[Dict[str, Any]] = None,
+                           runner: Optional[Callable[[str, Optional[Dict[str, Any]]], Optional[str]]] = None) -> Optional[str]:
     """
     Extracts text based on the file extension.
 
     Args:
         filepath (str): Path to the file.
         html_options (Dict, optional): Extra settings for HTML files.
+        runner (Callable, optional): Executes the actual (uncached) extraction, e.g. in a
+            worker process. Defaults to extract_text_uncached in the calling thread.
 
     Returns:
         str | None: The extracted text, or None on error.
@@ -206,18 +474,73 @@ def extract_text_from_file(filepath: str, html_options: Optional[Dict[str, Any]]
         return None
 
     _, ext = os.path.splitext(filepath)
-    extractor = _EXTRACTORS.get(ext.lower())
-
-    if not extractor:
+    if ext.lower() not in _EXTRACTORS:
         logging.info(f"Unsupported file type: {ext} ({os.path.basename(filepath)})")
         return None
 
-    # Special handling for passing HTML options
-    if ext.lower() in ['.html', '.htm'] and _HAS_BS4:
-        # A lambda or direct call is registered here, but for safety:
-        return _extract_html_file(filepath, html_options)
-    
-    return extractor(filepath)
+    is_html = ext.lower() in ['.html', '.htm'] and _HAS_BS4
+
+    # Serve unchanged files from the extraction cache
+    cache_key = None
+    if _EXTRACTION_CACHE is not None:
+        try:
+            cache_key = _EXTRACTION_CACHE.make_key(filepath, EXTRACTOR_VERSION, html_options if is_html else None)
+            cached_text = _EXTRACTION_CACHE.get(cache_key)
+            if cached_text is not None:
+                return cached_text
+        except OSError as e:
+            logging.warning(f"Extraction cache lookup failed ({filepath}): {e}")
+
+    text = (runner or extract_text_uncached)(filepath, html_options)
+
+    if cache_key and text is not None:
+        _store_in_cache(cache_key, text, filepath)
+    return text
+
+
+def extract_text_from_bytes(data: bytes, extension: str, html_options: Optional[Dict[str, Any]] = None,
+                            runner: Optional[Callable[[bytes, str, Optional[Dict[str, Any]]], Optional[str]]] = None) -> Optional[str]:
+    """
+    Extracts text from file content held in memory (no temporary file).
+
+    Args:
+        data (bytes): The file content.
+        extension (str): File extension that selects the extractor (e.g. ".pdf").
+        html_options (Dict, optional): Extra settings for HTML content.
+        runner (Callable, optional): Executes the actual (uncached) extraction, e.g. in a
+            worker process. Defaults to extract_bytes_uncached in the calling thread.
+
+    Returns:
+        str | None: The extracted text, or None on error.
+    """
+    ext = extension.lower()
+    if ext not in _EXTRACTORS:
+        logging.info(f"Unsupported file type: {extension} (in-memory content)")
+        return None
+
+    is_html = ext in ['.html', '.htm'] and _HAS_BS4
+
+    # Same cache as for files: the key is the content hash
+    cache_key = None
+    if _EXTRACTION_CACHE is not None:
+        cache_key = _EXTRACTION_CACHE.make_key_for_bytes(data, ext, EXTRACTOR_VERSION, html_options if is_html else None)
+        cached_text = _EXTRACTION_CACHE.get(cache_key)
+        if cached_text is not None:
+            return cached_text
+
+    text = (runner or extract_bytes_uncached)(data, ext, html_options)
+
+    if cache_key and text is not None:
+        _store_in_cache(cache_key, text, "in-memory content")
+    return text
+
+
+def _store_in_cache(cache_key: str, text: str, source_name: str) -> None:
+    """Stores extracted text; a text the cache cannot encode (e.g. lone surrogates from a PDF) is just not cached."""
+    try:
+        _EXTRACTION_CACHE.put(cache_key, text)
+    except (UnicodeEncodeError, OSError) as e:
+        logging.warning(f"Extraction cache store failed ({source_name}): {e}")
 
 
 def extract_text_from_html_content(html_content: str, html_options: Optional[Dict[str, Any]] = None) -> Optional[str]:
@@ -8,41 +8,190 @@ It supports two retrieval strategies:
 1. Static (requests): Fast, suitable for standard HTML and binary files (PDF, DOCX).
 2. Dynamic (playwright): Slower, suitable for JS-heavy sites (SPA, Infinite Scroll).
 
+The static engine uses one pooled requests.Session per WebLoader, shared by all
+controller threads: connections are kept alive and reused per host, with
+configurable pool sizes and transport-level retries ('http' section of
+config.json). With an HttpCache (core.http_cache), static responses are stored
+with their validators: fresh entries are served without a request and stale
+ones are revalidated with a conditional GET (304 = served from disk).
+HTML bodies are streamed and decoded incrementally (charset from the BOM, the
+Content-Type header or a <meta charset> tag), so download_max_size_mb bounds
+memory. Binary files (PDF, DOCX, ...) up to http.in_memory_max_mb are returned in
+memory as BinaryContent; only larger ones are spilled to a temporary file.
+
+The dynamic engine renders pages on a persistent browser pool
+(core.browser_pool) instead of launching Chromium for every URL. Only the text
+is needed, so by default ("text" resource profile) requests for images, media,
+fonts and known analytics/ad hosts are aborted before they leave the browser.
+Infinite scroll waits on page signals (height growth, new DOM nodes, XHR/fetch
+quiet) instead of fixed sleeps and stops as soon as a step adds nothing. With
+the 'text_options' fetch option, excluded tags are removed and the visible text
+(innerText) is read inside the browser, so only the text crosses back to Python.
+
+For URL-list batches, fetch_many() downloads a whole list concurrently on an
+asyncio event loop (httpx), with a global and a per-host concurrency cap, and
+yields results as they complete. fetch_many_dynamic() is its dynamic
+counterpart: many pages rendered concurrently in a single browser (async
+Playwright), with a global and a per-host page cap and a per-page time limit.
+
 This module follows a "Soft Dependency" pattern: it will not crash if
 'requests' or 'playwright' are missing, but will report an error at runtime.
 """
 
 import os
+import re
 import time
+import codecs
+import queue
+import asyncio
 import logging
 import tempfile
 import shutil
+import fnmatch
+import threading
 from urllib.parse import urlparse
-from typing import Tuple, Optional, Dict, Any, List, Union
+from typing import Tuple, Optional, Dict, Any, Iterator, List, Union, Callable, NamedTuple
 from core.version import APP_NAME, CORE_VERSION
+from core.browser_pool import BrowserPool
+from core.http_cache import HttpCache
 
 # --- Optional Dependency: Static Engine (Requests) ---
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     from requests.exceptions import RequestException
+    from urllib3.util.retry import Retry
     REQUESTS_AVAILABLE = True
 except ImportError:
     requests = None
+    HTTPAdapter = None
     RequestException = None
+    Retry = None
     REQUESTS_AVAILABLE = False
 
+# --- Optional Dependency: Async Bulk Engine (httpx) ---
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTPX_AVAILABLE = False
+
 # --- Optional Dependency: Dynamic Engine (Playwright) ---
 try:
-    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+    from playwright.sync_api import TimeoutError as PlaywrightTimeout
+    from playwright.async_api import async_playwright, TimeoutError as AsyncPlaywrightTimeout
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
-    sync_playwright = None
     PlaywrightTimeout = None
+    async_playwright = None
+    AsyncPlaywrightTimeout = None
     PLAYWRIGHT_AVAILABLE = False
 
 # Constants
 DEFAULT_USER_AGENT = f'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 {APP_NAME}/{CORE_VERSION}'
 DEFAULT_TIMEOUT_MS = 30000
+DEFAULT_HTTP_CONFIG = {
+    "timeout_seconds": 20,
+    "pool_connections": 32,
+    "pool_maxsize": 16,
+    "host_pool_sizes": {},
+    "retries": 2,
+    "retry_backoff_factor": 0.5,
+    "retry_status_codes": [429, 500, 502, 503, 504],
+    "in_memory_max_mb": 16,
+    "async_max_concurrency": 32,
+    "async_per_host": 8
+}
+# Upper bound for a server's Retry-After before an async retry (a long value must not stall the URL)
+MAX_RETRY_AFTER_SECONDS = 30.0
+# Seconds between two cancellation checks of a bulk fetch/render loop
+_CANCEL_POLL_SECONDS = 0.2
+# Put into the results queue when a bulk loop has ended
+_LOOP_DONE = object()
+
+# Dynamic engine request blocking ('dynamic_loader' section: resource_profile, blocked_*)
+RESOURCE_PROFILES = ("text", "full")
+DEFAULT_BLOCKED_RESOURCE_TYPES = ["image", "media", "font"]
+DEFAULT_BLOCKED_URL_PATTERNS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "facebook.net", "scorecardresearch.com", "hotjar.com", "segment.io", "criteo.com", "taboola.com"
+]
+
+# Async dynamic engine (batch URL modes): pages rendered at once, overall / per host, and per-page time limit
+DEFAULT_ASYNC_PAGES = 8
+DEFAULT_ASYNC_PAGES_PER_HOST = 4
+DEFAULT_PAGE_TIMEOUT_MS = 90000
+
+# Event-driven scroll: a step ends once the page grew and XHR/fetch/DOM activity
+# has been quiet for scroll_quiet_ms; no growth within scroll_step_timeout_ms stops the scroll
+DEFAULT_SCROLL_STEP_TIMEOUT_MS = 4000
+DEFAULT_SCROLL_QUIET_MS = 300
+
+# Installed once per page: counts added nodes (MutationObserver) and in-flight XHR/fetch calls
+_SCROLL_PROBE_JS = """() => {
+    if (window.__siftScroll) return;
+    const s = window.__siftScroll = {nodes: 0, pending: 0, lastActivity: performance.now()};
+    const touch = () => { s.lastActivity = performance.now(); };
+    new MutationObserver(records => {
+        for (const r of records) s.nodes += r.addedNodes.length;
+        touch();
+    }).observe(document.documentElement, {childList: true, subtree: true});
+    if (window.fetch) {
+        const origFetch = window.fetch;
+        window.fetch = function (...args) {
+            s.pending++; touch();
+            return origFetch.apply(this, args).finally(() => { s.pending--; touch(); });
+        };
+    }
+    const origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+        s.pending++; touch();
+        this.addEventListener('loadend', () => { s.pending--; touch(); }, {once: true});
+        return origSend.apply(this, args);
+    };
+}"""
+
+_SCROLL_TO_BOTTOM_JS = "window.scrollTo(0, (document.scrollingElement || document.body).scrollHeight)"
+
+_SCROLL_STATE_JS = "() => ({height: (document.scrollingElement || document.body).scrollHeight, nodes: window.__siftScroll.nodes})"
+
+# Polled after each scroll: true once the page grew and the network and DOM are quiet
+_SCROLL_SETTLED_JS = """(start) => {
+    const s = window.__siftScroll;
+    const grown = (document.scrollingElement || document.body).scrollHeight > start.height || s.nodes > start.nodes;
+    return grown && s.pending === 0 && performance.now() - s.lastActivity >= start.quiet;
+}"""
+
+_REMOVE_ELEMENTS_JS = """(selectors) => {
+    selectors.forEach(selector => {
+        const elements = document.querySelectorAll(selector);
+        elements.forEach(el => el.remove());
+    });
+}"""
+
+# In-browser text extraction: drops excluded tags, returns the rendered text (innerText)
+_INNER_TEXT_JS = """(opts) => {
+    const root = document.body || document.documentElement;
+    if (!root) return "";
+    for (const tag of opts.exclude) {
+        try { root.querySelectorAll(tag).forEach(el => el.remove()); } catch (e) { /* invalid selector */ }
+    }
+    const text = root.innerText || "";
+    if (!opts.strip) return opts.separator === "\\n" ? text : text.split("\\n").join(opts.separator);
+    return text.split("\\n").map(line => line.trim()).filter(line => line).join(opts.separator);
+}"""
+
+
+
+class BinaryContent(NamedTuple):
+    """A downloaded binary file kept in memory (extension selects the extractor)."""
+    data: bytes
+    extension: str
+
+
+# Result of one fetch: (HTML string, in-memory binary or temp file path; source info; error)
+FetchResult = Tuple[Optional[Union[str, BinaryContent]], str, Optional[str]]
 
 
 class WebLoader:
@@ -50,12 +199,16 @@ class WebLoader:
     Centralized class for fetching web content.
     """
 
-    def __init__(self, config_limits: Dict[str, Any]):
+    def __init__(self, config_limits: Dict[str, Any], http_config: Optional[Dict[str, Any]] = None,
+                 dynamic_config: Optional[Dict[str, Any]] = None, http_cache: Optional[HttpCache] = None):
         """
         Initialize the WebLoader.
 
         Args:
             config_limits (Dict): The 'limits' section from config.json.
+            http_config (Dict, optional): The 'http' section from config.json (connection pooling, retries).
+            dynamic_config (Dict, optional): The 'dynamic_loader' section from config.json (browser pool).
+            http_cache (HttpCache, optional): Conditional-GET cache of the static engine.
         """
         self.logger = logging.getLogger(__name__)
         
@@ -63,7 +216,83 @@ class WebLoader:
         max_mb = config_limits.get("download_max_size_mb", 10)
         self.max_size_bytes = max_mb * 1024 * 1024
 
-    def fetch(self, url: str, use_dynamic: bool, options: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], str, Optional[str]]:
+        self.http_config = {**DEFAULT_HTTP_CONFIG, **(http_config or {})}
+        self.timeout = self.http_config["timeout_seconds"]
+        self.in_memory_max_bytes = int(float(self.http_config["in_memory_max_mb"]) * 1024 * 1024)
+        self._session: Optional["requests.Session"] = None
+        self._session_lock = threading.Lock()
+
+        self.dynamic_config = dynamic_config or {}
+        self._browser_pool: Optional[BrowserPool] = None
+
+        self.http_cache = http_cache if http_cache is not None and http_cache.enabled else None
+
+    # -------------------------------------------------------------------------
+    # CONNECTION POOL
+    # -------------------------------------------------------------------------
+
+    def _make_adapter(self, pool_maxsize: int) -> "HTTPAdapter":
+        """Creates a keep-alive connection pool adapter with transport-level retries."""
+        cfg = self.http_config
+        retry = Retry(
+            total=cfg["retries"],
+            connect=cfg["retries"],
+            read=cfg["retries"],
+            status=cfg["retries"],
+            backoff_factor=cfg["retry_backoff_factor"],
+            status_forcelist=cfg["retry_status_codes"],
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        return HTTPAdapter(
+            pool_connections=cfg["pool_connections"],
+            pool_maxsize=pool_maxsize,
+            max_retries=retry
+        )
+
+    @property
+    def session(self) -> "requests.Session":
+        """The shared, lazily created session (thread-safe: requests pools connections per host)."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    session.headers.update({'User-Agent': DEFAULT_USER_AGENT})
+                    default_adapter = self._make_adapter(self.http_config["pool_maxsize"])
+                    session.mount("http://", default_adapter)
+                    session.mount("https://", default_adapter)
+                    # Hosts hit by large batches may get bigger pools
+                    for host, size in self.http_config.get("host_pool_sizes", {}).items():
+                        host_adapter = self._make_adapter(int(size))
+                        session.mount(f"http://{host}/", host_adapter)
+                        session.mount(f"https://{host}/", host_adapter)
+                    self._session = session
+        return self._session
+
+    @property
+    def browser_pool(self) -> BrowserPool:
+        """The shared browser pool of the dynamic engine (browsers launch on first use)."""
+        if self._browser_pool is None:
+            with self._session_lock:
+                if self._browser_pool is None:
+                    self._browser_pool = BrowserPool.from_config(
+                        self.dynamic_config, context_options={"user_agent": DEFAULT_USER_AGENT}
+                    )
+        return self._browser_pool
+
+    def close(self) -> None:
+        """Closes the pooled connections and browsers."""
+        with self._session_lock:
+            session, self._session = self._session, None
+            pool, self._browser_pool = self._browser_pool, None
+        if session is not None:
+            session.close()
+        if pool is not None:
+            pool.shutdown()
+
+    def fetch(self, url: str, use_dynamic: bool, options: Optional[Dict[str, Any]] = None,
+              metadata: Optional[Dict[str, Any]] = None, force_refresh: bool = False) -> Tuple[Optional[str], str, Optional[str]]:
         """
         Main entry point. Dispatches the request to the appropriate engine.
 
@@ -71,6 +300,10 @@ class WebLoader:
             url (str): The target URL.
             use_dynamic (bool): If True, uses Playwright.
             options (Dict, optional): Extra settings (scroll, wait_selector, etc.).
+            metadata (Dict, optional): Filled with fetch details: engine, fetch_seconds, content_type
+                ("text" when extracted in the browser), http_cache (static: "hit", "revalidated", "miss"
+                or "refresh") and, for dynamic scrolls, scroll_steps and scroll_seconds.
+            force_refresh (bool): Static engine: bypass the HTTP cache (the new response is still stored).
 
         Returns:
             Tuple[Result, Info, Error]:
@@ -79,115 +312,387 @@ class WebLoader:
                 - Error (str | None): Error message if failed, else None.
         """
         options = options or {}
+        metadata = metadata if metadata is not None else {}
+        metadata["engine"] = "dynamic" if use_dynamic else "static"
         self.logger.info(f"WebLoader fetch initiated: {url} (Dynamic Mode: {use_dynamic})")
+        start = time.perf_counter()
 
         try:
             # 1. Dynamic Path (Playwright)
             if use_dynamic:
                 if not PLAYWRIGHT_AVAILABLE:
                     return None, url, "Playwright is missing. Install via 'pip install playwright' and 'playwright install'."
-                return self._fetch_dynamic(url, options)
+                return self._fetch_dynamic(url, options, metadata)
 
             # 2. Static Path (Requests)
             else:
                 if not REQUESTS_AVAILABLE:
                     return None, url, "The 'requests' library is missing."
-                return self._fetch_static(url)
+                return self._fetch_static(url, metadata, force_refresh)
 
         except Exception as e:
             self.logger.critical(f"WebLoader Critical Error: {e}", exc_info=True)
             return None, url, f"Critical download error: {str(e)}"
+        finally:
+            metadata["fetch_seconds"] = round(time.perf_counter() - start, 3)
 
     # -------------------------------------------------------------------------
     # STATIC ENGINE (Requests)
     # -------------------------------------------------------------------------
 
-    def _fetch_static(self, url: str) -> Tuple[Optional[str], str, Optional[str]]:
-        """Handles static HTML and binary file downloads."""
+    def _fetch_static(self, url: str, metadata: Optional[Dict[str, Any]] = None,
+                      force_refresh: bool = False) -> Tuple[Optional[str], str, Optional[str]]:
+        """Handles static HTML and binary file downloads (through the HTTP cache, if any)."""
+        metadata = metadata if metadata is not None else {}
+        cached = self._cache_lookup(url, force_refresh, metadata)
+        if cached and HttpCache.is_fresh(cached[0]):
+            metadata["http_cache"] = "hit"
+            return self._serve_cached(url, *cached)
+
         try:
-            # 'stream=True' is vital to prevent loading large files into memory immediately
-            response = requests.get(
-                url, 
-                stream=True, 
-                timeout=20, 
-                headers={'User-Agent': DEFAULT_USER_AGENT}
-            )
-            response.raise_for_status()
-
-            content_type = response.headers.get('content-type', '').lower()
-
-            # Content-Length check (if provided by server)
-            content_length = response.headers.get('content-length')
-            if content_length and int(content_length) > self.max_size_bytes:
-                return None, url, f"File size ({int(content_length)} bytes) exceeds the limit."
-
-            # CASE A: HTML Content
-            if 'text/html' in content_type:
-                # We read .text (this loads content into memory).
-                # To be strictly safe against massive HTML, we could iterate, 
-                # but standard practice for HTML allows .text with a length check.
-                text = response.text
-                if len(text.encode('utf-8')) > self.max_size_bytes:
-                    return None, url, "HTML content exceeded size limit."
-                
-                return text, "URL (Static HTML)", None
+            # 'stream=True' is vital to prevent loading large files into memory immediately.
+            # The 'with' block returns the connection to the pool on every exit path.
+            request_headers = HttpCache.conditional_headers(cached[0]) if cached else None
+            with self.session.get(url, stream=True, timeout=self.timeout, headers=request_headers) as response:
+                if cached and response.status_code == 304:
+                    self.http_cache.refresh(url, cached[0], cached[1], response.headers)
+                    metadata["http_cache"] = "revalidated"
+                    return self._serve_cached(url, *cached)
+                response.raise_for_status()
 
-            # CASE B: Binary File (PDF, DOCX, etc.)
-            else:
-                return self._download_binary_file(response, url)
+                content_type = response.headers.get('content-type', '').lower()
+
+                # Content-Length check (if provided by server)
+                content_length = response.headers.get('content-length')
+                if content_length and int(content_length) > self.max_size_bytes:
+                    return None, url, f"File size ({int(content_length)} bytes) exceeds the limit."
+
+                # CASE A: HTML Content (streamed; aborts as soon as the size limit is crossed)
+                if 'text/html' in content_type:
+                    decoder = _HtmlDecoder(self.max_size_bytes, content_type)
+                    for chunk in response.iter_content(chunk_size=65536):
+                        if chunk and not decoder.feed(chunk):
+                            return None, url, "HTML content exceeded size limit."
+                    text = decoder.finish()
+
+                    if self.http_cache is not None:
+                        self._cache_store(url, response.headers, text.encode('utf-8'), "html", "URL (Static HTML)")
+                    return text, "URL (Static HTML)", None
+
+                # CASE B: Binary File (PDF, DOCX, etc.)
+                else:
+                    result = self._download_binary_file(response, url)
+                    if result[2] is None:
+                        self._cache_store_file(url, response.headers, result)
+                    return result
 
         except RequestException as e:
             return None, url, f"Network Error (Requests): {e}"
         except Exception as e:
             return None, url, f"Download Error: {e}"
 
-    def _download_binary_file(self, response: requests.Response, url: str) -> Tuple[Optional[str], str, Optional[str]]:
-        """Streams binary data to a temporary file."""
-        # Create a temp file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".tmp")
-        downloaded_size = 0
+    def _download_binary_file(self, response: requests.Response, url: str) -> FetchResult:
+        """Streams binary data into memory, or into a temporary file once it exceeds the in-memory limit."""
+        sink = _BinarySink(self.max_size_bytes, self.in_memory_max_bytes, response.headers.get('content-length'))
+        try:
+            for chunk in response.iter_content(chunk_size=65536):
+                if chunk:
+                    sink.write(chunk)
+            return sink.finish(url)
+
+        except Exception as e:
+            # Cleanup on failure
+            sink.discard()
+            return None, url, f"Binary download failed: {e}"
+
+    # --- HTTP cache (shared by the sync and async static engines) ---
+
+    def _cache_lookup(self, url: str, force_refresh: bool, metadata: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """Returns the cached (metadata, body) of a URL, or None (no cache, miss or forced refresh)."""
+        if self.http_cache is None:
+            return None
+        metadata["http_cache"] = "refresh" if force_refresh else "miss"
+        return None if force_refresh else self.http_cache.get(url)
+
+    def _serve_cached(self, url: str, entry: Dict[str, Any], body: bytes) -> FetchResult:
+        """Turns a cached body into a fetch result (HTML string; binaries in memory or in a new temp file)."""
+        if entry.get("kind") == "html":
+            return body.decode("utf-8"), entry.get("info") or "URL (Static HTML)", None
+        sink = _BinarySink(self.max_size_bytes, self.in_memory_max_bytes, len(body))
+        sink.write(body)
+        return sink.finish(url)
+
+    def _cache_store(self, url: str, headers, body: bytes, kind: str, info: str) -> None:
+        if self.http_cache is not None:
+            self.http_cache.put(url, headers, body, kind, info)
+
+    def _cache_store_file(self, url: str, headers, result: FetchResult) -> None:
+        """Stores a downloaded binary file (already bounded by the size limit)."""
+        if self.http_cache is None:
+            return
+        content, info, _ = result
+        if isinstance(content, BinaryContent):
+            self.http_cache.put(url, headers, content.data, "binary", info)
+            return
+        try:
+            with open(content, "rb") as f:
+                body = f.read()
+        except OSError as e:
+            self.logger.warning(f"HTTP cache: cannot read {content}: {e}")
+            return
+        self.http_cache.put(url, headers, body, "binary", info)
+
+    @staticmethod
+    def _binary_extension(url: str) -> str:
+        """Extension of the URL path, which selects the extractor of a binary download."""
+        # Detect extension from URL path (fallback to .pdf)
+        path_ext = os.path.splitext(urlparse(url).path)[1]
+        if not path_ext:
+            path_ext = ".pdf" # Assumption for binary non-html content
+        return path_ext
+
+    @staticmethod
+    def _finalize_binary_file(temp_path: str, url: str) -> FetchResult:
+        """Gives a downloaded temp file the extension of the URL path, so the extractor can dispatch on it."""
+        path_ext = WebLoader._binary_extension(url)
+        
+        final_path = temp_path + path_ext
         
+        # Rename/Move (shutil.move handles cross-device moves better than os.rename)
         try:
-            with temp_file as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
-                        if downloaded_size > self.max_size_bytes:
-                            raise ValueError("Download exceeded size limit during streaming.")
-            
-            temp_path = temp_file.name
+            os.rename(temp_path, final_path)
+        except OSError:
+            shutil.move(temp_path, final_path)
             
-            # Detect extension from URL path (fallback to .pdf)
-            path_ext = os.path.splitext(urlparse(url).path)[1]
-            if not path_ext:
-                path_ext = ".pdf" # Assumption for binary non-html content
-            
-            final_path = temp_path + path_ext
-            
-            # Rename/Move (shutil.move handles cross-device moves better than os.rename)
+        return final_path, f"URL (Binary File: {path_ext})", None
+
+    # -------------------------------------------------------------------------
+    # ASYNC BULK ENGINE (httpx)
+    # -------------------------------------------------------------------------
+
+    def fetch_many(self, urls: List[str], max_concurrency: Optional[int] = None, per_host: Optional[int] = None,
+                   force_refresh: bool = False,
+                   cancel_event: Optional[threading.Event] = None) -> Iterator[Tuple[int, FetchResult, Dict[str, Any]]]:
+        """
+        Downloads a list of URLs concurrently (static engine only) and yields the
+        results in completion order, so callers can start processing the first
+        pages while the rest are still downloading.
+
+        Args:
+            urls (List[str]): The target URLs.
+            max_concurrency (int, optional): Maximum downloads in flight (default: http.async_max_concurrency).
+            per_host (int, optional): Maximum downloads in flight per host (default: http.async_per_host).
+            force_refresh (bool): Bypass the HTTP cache (new responses are still stored).
+            cancel_event (threading.Event, optional): Once set, downloads in flight are aborted and
+                no further results are yielded (closing the generator does the same).
+
+        Yields:
+            Tuple[int, FetchResult, Dict]: (index in `urls`, (content or temp file path, info, error),
+            fetch metadata), with the same result format as fetch().
+        """
+        if not urls:
+            return
+        if not HTTPX_AVAILABLE:
+            for i, url in enumerate(urls):
+                yield i, (None, url, "The 'httpx' library is missing (required for async bulk fetching)."), {"engine": "async"}
+            return
+
+        max_concurrency = max(1, int(max_concurrency or self.http_config["async_max_concurrency"]))
+        per_host = max(1, int(per_host or self.http_config["async_per_host"]))
+        self.logger.info(f"Async bulk fetch: {len(urls)} URLs (max {max_concurrency} in flight, {per_host} per host)")
+
+        yield from self._run_async_batch(
+            urls, lambda results: self._fetch_all_async(urls, max_concurrency, per_host, results, force_refresh),
+            thread_name="async-fetch", engine="async", error_label="Download Error", cancel_event=cancel_event
+        )
+
+    def _run_async_batch(self, urls: List[str], make_coroutine: Callable[[queue.Queue], Any], thread_name: str,
+                         engine: str, error_label: str,
+                         cancel_event: Optional[threading.Event] = None) -> Iterator[Tuple[int, FetchResult, Dict[str, Any]]]:
+        """
+        Runs a bulk coroutine on an event loop in its own thread and yields the (index, result, metadata)
+        entries it puts into the results queue. If the loop dies (e.g. the client or browser cannot be
+        started), every URL it has not delivered yet gets an error result instead of hanging the caller.
+        When `cancel_event` is set or the generator is closed, the coroutine is cancelled and results
+        nobody consumed are discarded (their temp files deleted).
+        """
+        results: queue.Queue = queue.Queue()
+        stop = threading.Event()
+
+        def _stopped() -> bool:
+            return stop.is_set() or (cancel_event is not None and cancel_event.is_set())
+
+        async def _main() -> None:
+            task = asyncio.ensure_future(make_coroutine(results))
+            while not task.done():
+                if _stopped():
+                    task.cancel()
+                    break
+                await asyncio.wait({task}, timeout=_CANCEL_POLL_SECONDS)
             try:
-                os.rename(temp_path, final_path)
-            except OSError:
-                shutil.move(temp_path, final_path)
-                
-            return final_path, f"URL (Binary File: {path_ext})", None
+                await task
+            except asyncio.CancelledError:
+                self.logger.info(f"{thread_name} cancelled.")
 
-        except Exception as e:
-            # Cleanup on failure
-            if os.path.exists(temp_file.name):
+        def _run() -> None:
+            try:
+                asyncio.run(_main())
+            except Exception as e:
+                self.logger.error(f"{thread_name} failed: {e}", exc_info=True)
+                results.put(e)
+            finally:
+                results.put(_LOOP_DONE)
+
+        worker = threading.Thread(target=_run, name=thread_name, daemon=True)
+        worker.start()
+
+        pending = set(range(len(urls)))
+        try:
+            while pending:
+                entry = results.get()
+                if entry is _LOOP_DONE:
+                    # Only reached after a cancellation: nothing more will arrive
+                    break
+                if isinstance(entry, Exception):
+                    for i in sorted(pending):
+                        yield i, (None, urls[i], f"{error_label}: {entry}"), {"engine": engine}
+                    break
+                pending.discard(entry[0])
+                yield entry
+        finally:
+            stop.set()
+            worker.join()
+            while not results.empty():
+                entry = results.get_nowait()
+                if isinstance(entry, tuple):
+                    self.discard_result(entry[1])
+
+    @staticmethod
+    def discard_result(result: FetchResult) -> None:
+        """Deletes the temp file of a fetch result that will not be processed (no-op for other results)."""
+        content, info, _ = result
+        if isinstance(content, str) and str(info).startswith("URL (Binary File") and os.path.isfile(content):
+            try:
+                os.remove(content)
+            except OSError as e:
+                logging.warning(f"Failed to delete temp file {content}: {e}")
+
+    async def _fetch_all_async(self, urls: List[str], max_concurrency: int, per_host: int, results: queue.Queue,
+                               force_refresh: bool = False) -> None:
+        """Runs all downloads on one httpx client and puts (index, result, metadata) into `results`."""
+        global_limit = asyncio.Semaphore(max_concurrency)
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+
+        limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+        transport = httpx.AsyncHTTPTransport(retries=self.http_config["retries"], limits=limits)
+        async with httpx.AsyncClient(
+            transport=transport,
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers={'User-Agent': DEFAULT_USER_AGENT}
+        ) as client:
+
+            async def _one(index: int, url: str) -> None:
+                host = urlparse(url).netloc
+                host_limit = host_limits.setdefault(host, asyncio.Semaphore(per_host))
+                start = time.perf_counter()
+                metadata: Dict[str, Any] = {"engine": "async"}
                 try:
-                    os.remove(temp_file.name)
-                except OSError:
-                    pass
+                    async with global_limit, host_limit:
+                        result = await self._fetch_static_async(client, url, metadata, force_refresh)
+                except Exception as e:
+                    self.logger.error(f"Async fetch failed ({url}): {e}")
+                    result = (None, url, f"Download Error: {e}")
+                metadata["fetch_seconds"] = round(time.perf_counter() - start, 3)
+                results.put((index, result, metadata))
+
+            await asyncio.gather(*(_one(i, url) for i, url in enumerate(urls)))
+
+    async def _fetch_static_async(self, client: "httpx.AsyncClient", url: str, metadata: Optional[Dict[str, Any]] = None,
+                                  force_refresh: bool = False) -> FetchResult:
+        """Async counterpart of _fetch_static: size limit enforced while streaming, status retries with backoff."""
+        metadata = metadata if metadata is not None else {}
+        cached = None
+        if self.http_cache is not None:
+            # SQLite I/O runs off the event loop
+            cached = await asyncio.to_thread(self._cache_lookup, url, force_refresh, metadata)
+            if cached and HttpCache.is_fresh(cached[0]):
+                metadata["http_cache"] = "hit"
+                return await asyncio.to_thread(self._serve_cached, url, *cached)
+        request_headers = HttpCache.conditional_headers(cached[0]) if cached else None
+
+        cfg = self.http_config
+        for attempt in range(cfg["retries"] + 1):
+            try:
+                async with client.stream("GET", url, headers=request_headers) as response:
+                    if cached and response.status_code == 304:
+                        await asyncio.to_thread(self.http_cache.refresh, url, cached[0], cached[1], response.headers)
+                        metadata["http_cache"] = "revalidated"
+                        return await asyncio.to_thread(self._serve_cached, url, *cached)
+                    if response.status_code in cfg["retry_status_codes"] and attempt < cfg["retries"]:
+                        retry_after = response.headers.get("retry-after", "")
+                        delay = float(retry_after) if retry_after.isdigit() else cfg["retry_backoff_factor"] * (2 ** attempt)
+                        delay = min(delay, MAX_RETRY_AFTER_SECONDS)
+                        await asyncio.sleep(delay)
+                        continue
+                    response.raise_for_status()
+                    return await self._read_response_async(response, url)
+            except httpx.HTTPError as e:
+                # httpx appends a multi-line help text to status errors; keep the first line
+                return None, url, f"Network Error (httpx): {str(e).splitlines()[0] if str(e) else type(e).__name__}"
+        return None, url, "Network Error (httpx): retries exhausted."
+
+    async def _read_response_async(self, response: "httpx.Response", url: str) -> FetchResult:
+        """Reads an HTML body into memory, or a binary body into memory / a temp file, enforcing the size limit."""
+        content_type = response.headers.get('content-type', '').lower()
+
+        content_length = response.headers.get('content-length')
+        if content_length and int(content_length) > self.max_size_bytes:
+            return None, url, f"File size ({int(content_length)} bytes) exceeds the limit."
+
+        # CASE A: HTML Content
+        if 'text/html' in content_type:
+            decoder = _HtmlDecoder(self.max_size_bytes, content_type)
+            async for chunk in response.aiter_bytes(chunk_size=65536):
+                if not decoder.feed(chunk):
+                    return None, url, "HTML content exceeded size limit."
+            text = decoder.finish()
+            if self.http_cache is not None:
+                await asyncio.to_thread(self._cache_store, url, response.headers, text.encode('utf-8'), "html", "URL (Static HTML)")
+            return text, "URL (Static HTML)", None
+
+        # CASE B: Binary File (PDF, DOCX, etc.)
+        sink = _BinarySink(self.max_size_bytes, self.in_memory_max_bytes, content_length)
+        try:
+            async for chunk in response.aiter_bytes(chunk_size=65536):
+                sink.write(chunk)
+            result = sink.finish(url)
+            if self.http_cache is not None:
+                await asyncio.to_thread(self._cache_store_file, url, response.headers, result)
+            return result
+        except asyncio.CancelledError:
+            # Bulk fetch cancelled mid-download: no partial temp file is left behind
+            sink.discard()
+            raise
+        except Exception as e:
+            sink.discard()
             return None, url, f"Binary download failed: {e}"
 
     # -------------------------------------------------------------------------
     # DYNAMIC ENGINE (Playwright)
     # -------------------------------------------------------------------------
 
-    def _fetch_dynamic(self, url: str, options: Dict[str, Any]) -> Tuple[Optional[str], str, Optional[str]]:
-        """Uses Playwright to render the page, handling JS and scrolling."""
+    def _fetch_dynamic(self, url: str, options: Dict[str, Any], metadata: Dict[str, Any]) -> Tuple[Optional[str], str, Optional[str]]:
+        """Renders the page on a pooled browser, handling JS and scrolling."""
+        try:
+            return self.browser_pool.run(lambda page: self._render_page(page, url, options, metadata))
+        except PlaywrightTimeout:
+            return None, url, "Timeout occurred during dynamic loading."
+        except Exception as e:
+            return None, url, f"Playwright Error: {e}"
+
+    def _render_page(self, page, url: str, options: Dict[str, Any], metadata: Dict[str, Any]) -> Tuple[Optional[str], str, Optional[str]]:
+        """Navigates a leased page (fresh browser context) and returns the rendered HTML."""
         
         # Unpack options with defaults
         timeout = options.get('timeout_ms', DEFAULT_TIMEOUT_MS)
@@ -196,75 +701,163 @@ class WebLoader:
         max_scrolls = options.get('max_scrolls', 10)
         remove_selectors = options.get('remove_selectors', [])
 
-        try:
-            with sync_playwright() as p:
-                # Launch browser in headless mode
-                # Chromium is the safest default for general web scraping
-                browser = p.chromium.launch(headless=True)
-                
-                # Create context (User-Agent is critical to avoid bot detection)
-                context = browser.new_context(user_agent=DEFAULT_USER_AGENT)
-                page = context.new_page()
-
-                self.logger.info(f"Playwright navigating to: {url}")
-                
-                # 1. Navigation
-                # 'domcontentloaded' is faster than 'networkidle'
-                page.goto(url, timeout=timeout, wait_until="domcontentloaded")
-
-                # 2. Wait for specific element (Optional)
-                if wait_selector:
-                    try:
-                        self.logger.info(f"Waiting for selector: {wait_selector}")
-                        page.wait_for_selector(wait_selector, timeout=5000)
-                    except PlaywrightTimeout:
-                        self.logger.warning(f"Selector ({wait_selector}) did not appear in time. Continuing.")
+        self._install_request_blocking(page, options)
 
-                # 3. Clean DOM via JS (Remove cookie banners, ads, etc.)
-                if remove_selectors:
-                    self._remove_elements_js(page, remove_selectors)
+        self.logger.info(f"Playwright navigating to: {url}")
+        
+        # 1. Navigation
+        # 'domcontentloaded' is faster than 'networkidle'
+        page.goto(url, timeout=timeout, wait_until="domcontentloaded")
 
-                # 4. Smart Scroll (Infinite Scroll handling)
-                if do_scroll:
-                    self._smart_scroll(page, max_scrolls)
+        # 2. Wait for specific element (Optional)
+        if wait_selector:
+            try:
+                self.logger.info(f"Waiting for selector: {wait_selector}")
+                page.wait_for_selector(wait_selector, timeout=5000)
+            except PlaywrightTimeout:
+                self.logger.warning(f"Selector ({wait_selector}) did not appear in time. Continuing.")
 
-                # 5. Extract Content
-                content = page.content()
-                
-                # Size Check
-                if len(content.encode('utf-8')) > self.max_size_bytes:
-                     return None, url, "Rendered HTML content exceeded size limit."
+        # 3. Clean DOM via JS (Remove cookie banners, ads, etc.)
+        if remove_selectors:
+            self._remove_elements_js(page, remove_selectors)
 
-                browser.close()
-                return content, "URL (Dynamic JS)", None
+        # 4. Smart Scroll (Infinite Scroll handling)
+        if do_scroll:
+            step_timeout, quiet = self._scroll_settings(options)
+            scroll_start = time.perf_counter()
+            metadata["scroll_steps"] = self._smart_scroll(page, max_scrolls, step_timeout, quiet)
+            metadata["scroll_seconds"] = round(time.perf_counter() - scroll_start, 3)
+            self.logger.info(f"Smart Scroll finished: {metadata['scroll_steps']} steps in {metadata['scroll_seconds']}s")
 
-        except PlaywrightTimeout:
-            return None, url, "Timeout occurred during dynamic loading."
-        except Exception as e:
-            return None, url, f"Playwright Error: {e}"
+        # 5. Extract Content: visible text computed in the browser, or the serialized DOM
+        text_options = options.get('text_options')
+        if text_options:
+            content = page.evaluate(_INNER_TEXT_JS, self._inner_text_args(text_options))
+            metadata["content_type"] = "text"
+        else:
+            content = page.content()
+            metadata["content_type"] = "html"
+
+        return self._rendered_result(content, url)
+
+    def _scroll_settings(self, options: Dict[str, Any]) -> Tuple[int, int]:
+        """Returns (step timeout, quiet period) in ms for the event-driven scroll."""
+        step_timeout = options.get('scroll_step_timeout_ms') or self.dynamic_config.get(
+            'scroll_step_timeout_ms', DEFAULT_SCROLL_STEP_TIMEOUT_MS)
+        quiet = options.get('scroll_quiet_ms') or self.dynamic_config.get('scroll_quiet_ms', DEFAULT_SCROLL_QUIET_MS)
+        return step_timeout, quiet
+
+    @staticmethod
+    def _inner_text_args(text_options: Dict[str, Any]) -> Dict[str, Any]:
+        """Arguments of _INNER_TEXT_JS from the 'text_options' fetch option."""
+        return {
+            "exclude": list(text_options.get('exclude_tags') or []),
+            "separator": text_options.get('separator', '\n'),
+            "strip": bool(text_options.get('strip', True))
+        }
+
+    def _rendered_result(self, content: str, url: str) -> FetchResult:
+        """Applies the size limit to rendered content (encoding only when it might exceed the limit)."""
+        if len(content) * 4 > self.max_size_bytes and len(content.encode('utf-8')) > self.max_size_bytes:
+            return None, url, "Rendered content exceeded size limit."
+        return content, "URL (Dynamic JS)", None
+
+    def _blocking_rules(self, options: Dict[str, Any]) -> Optional[Tuple[frozenset, List[str], List[str]]]:
+        """
+        Resolves the request blocklist of a dynamic fetch (request options override the config).
+
+        Returns:
+            (resource types, host suffixes, URL globs), or None for the "full" profile.
+        """
+        cfg = self.dynamic_config
+        profile = options.get('resource_profile') or cfg.get('resource_profile', "text")
+        if profile not in RESOURCE_PROFILES:
+            self.logger.warning(f"Unknown resource profile '{profile}'. Using 'text'.")
+            profile = "text"
+        if profile == "full":
+            return None
+
+        types = options.get('block_resource_types')
+        if types is None:
+            types = cfg.get('blocked_resource_types', DEFAULT_BLOCKED_RESOURCE_TYPES)
+        patterns = options.get('block_url_patterns')
+        if patterns is None:
+            patterns = cfg.get('blocked_url_patterns', DEFAULT_BLOCKED_URL_PATTERNS)
+
+        hosts = [p.lower().lstrip(".") for p in patterns if "*" not in p]
+        globs = [p for p in patterns if "*" in p]
+        return frozenset(t.lower() for t in types), hosts, globs
 
-    def _smart_scroll(self, page, max_scrolls: int):
-        """Scrolls to the bottom of the page incrementally."""
+    def _request_blocker(self, options: Dict[str, Any]) -> Optional[Callable[[Any], bool]]:
+        """Returns a predicate telling whether a Playwright request is blocked, or None if nothing is."""
+        rules = self._blocking_rules(options)
+        if rules is None:
+            return None
+        types, hosts, globs = rules
+        if not (types or hosts or globs):
+            return None
+
+        def _is_blocked(request) -> bool:
+            if request.resource_type in types:
+                return True
+            if not (hosts or globs):
+                return False
+            request_url = request.url
+            host = (urlparse(request_url).hostname or "").lower()
+            return (any(host == h or host.endswith("." + h) for h in hosts)
+                    or any(fnmatch.fnmatchcase(request_url, g) for g in globs))
+
+        return _is_blocked
+
+    def _install_request_blocking(self, page, options: Dict[str, Any]) -> None:
+        """Aborts requests for blocked resource types and hosts before they leave the browser."""
+        is_blocked = self._request_blocker(options)
+        if is_blocked is None:
+            return
+
+        def _handle(route):
+            if is_blocked(route.request):
+                route.abort("blockedbyclient")
+            else:
+                route.continue_()
+
+        page.route("**/*", _handle)
+
+    def _smart_scroll(self, page, max_scrolls: int, step_timeout_ms: int = DEFAULT_SCROLL_STEP_TIMEOUT_MS,
+                      quiet_ms: int = DEFAULT_SCROLL_QUIET_MS) -> int:
+        """
+        Scrolls to the bottom of the page until it stops growing.
+
+        Each step scrolls once, then waits until the page grew (scrollHeight or new
+        DOM nodes) and XHR/fetch and DOM activity have been quiet for quiet_ms. A step
+        without growth within step_timeout_ms ends the scroll.
+
+        Returns:
+            int: Number of scroll steps that loaded new content.
+        """
         self.logger.info(f"Starting Smart Scroll (Max: {max_scrolls})")
-        
-        last_height = page.evaluate("document.body.scrollHeight")
-        
+        page.evaluate(_SCROLL_PROBE_JS)
+
+        steps = 0
         for i in range(max_scrolls):
-            # Scroll to bottom
-            page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            
-            # Static sleep is often more reliable than networkidle for infinite scrolls
-            time.sleep(1.5)
-            
-            new_height = page.evaluate("document.body.scrollHeight")
-            
-            if new_height == last_height:
-                self.logger.debug("Page height did not change. Stopping scroll.")
-                break
-            
-            last_height = new_height
+            state = page.evaluate(_SCROLL_STATE_JS)
+            page.evaluate(_SCROLL_TO_BOTTOM_JS)
+
+            try:
+                page.wait_for_function(_SCROLL_SETTLED_JS, arg={**state, "quiet": quiet_ms},
+                                       timeout=step_timeout_ms, polling=100)
+            except PlaywrightTimeout:
+                # Content may still have arrived while the network never went quiet
+                new_state = page.evaluate(_SCROLL_STATE_JS)
+                if new_state["height"] <= state["height"] and new_state["nodes"] <= state["nodes"]:
+                    self.logger.debug("Page did not grow. Stopping scroll.")
+                    break
+
+            steps += 1
             self.logger.debug(f"Scroll step: {i+1}/{max_scrolls}")
 
+        return steps
+
     def _remove_elements_js(self, page, selectors: List[str]):
         """Removes elements from the DOM using client-side JavaScript."""
         if not selectors:
@@ -272,19 +865,294 @@ class WebLoader:
             
         self.logger.info(f"Removing elements via JS: {selectors}")
         
-        # JS Closure to iterate and remove
-        js_code = """(selectors) => {
-            selectors.forEach(selector => {
-                const elements = document.querySelectorAll(selector);
-                elements.forEach(el => el.remove());
-            });
-        }"""
-        
         try:
-            page.evaluate(js_code, selectors)
+            page.evaluate(_REMOVE_ELEMENTS_JS, selectors)
         except Exception as e:
             self.logger.warning(f"Error removing elements: {e}")
 
+    # -------------------------------------------------------------------------
+    # ASYNC DYNAMIC ENGINE (async Playwright)
+    # -------------------------------------------------------------------------
+
+    def fetch_many_dynamic(self, urls: List[str], options: Optional[Dict[str, Any]] = None,
+                           max_concurrency: Optional[int] = None, per_host: Optional[int] = None,
+                           page_timeout_ms: Optional[int] = None,
+                           cancel_event: Optional[threading.Event] = None) -> Iterator[Tuple[int, FetchResult, Dict[str, Any]]]:
+        """
+        Renders a list of URLs concurrently on one browser (async Playwright) and
+        yields the results in completion order. Every page gets a fresh context and
+        goes through the same steps as fetch() with use_dynamic=True.
+
+        Args:
+            urls (List[str]): The target URLs.
+            options (Dict, optional): Dynamic options (scroll, wait_selector, text_options, etc.).
+            max_concurrency (int, optional): Pages rendered at once (default: dynamic_loader.async_pages).
+            per_host (int, optional): Pages rendered at once per host (default: dynamic_loader.async_per_host).
+            page_timeout_ms (int, optional): Overall time limit per page (default: dynamic_loader.page_timeout_ms).
+            cancel_event (threading.Event, optional): Once set, renders in flight are aborted and
+                no further results are yielded (closing the generator does the same).
+
+        Yields:
+            Tuple[int, FetchResult, Dict]: (index in `urls`, (content, info, error), fetch metadata).
+        """
+        if not urls:
+            return
+        options = options or {}
+        if not PLAYWRIGHT_AVAILABLE:
+            for i, url in enumerate(urls):
+                yield i, (None, url, "Playwright is missing. Install via 'pip install playwright' and 'playwright install'."), {"engine": "dynamic"}
+            return
+
+        cfg = self.dynamic_config
+        max_concurrency = max(1, int(max_concurrency or cfg.get("async_pages", DEFAULT_ASYNC_PAGES)))
+        per_host = max(1, int(per_host or cfg.get("async_per_host", DEFAULT_ASYNC_PAGES_PER_HOST)))
+        page_timeout_s = (page_timeout_ms or cfg.get("page_timeout_ms", DEFAULT_PAGE_TIMEOUT_MS)) / 1000.0
+        self.logger.info(f"Async dynamic render: {len(urls)} URLs ({max_concurrency} pages at once, {per_host} per host)")
+
+        # Same hand-over as fetch_many(): the event loop runs in its own thread
+        yield from self._run_async_batch(
+            urls, lambda results: self._render_all_async(urls, options, max_concurrency, per_host, page_timeout_s, results),
+            thread_name="async-render", engine="dynamic", error_label="Render engine error", cancel_event=cancel_event
+        )
+
+    async def _render_all_async(self, urls: List[str], options: Dict[str, Any], max_concurrency: int,
+                                per_host: int, page_timeout_s: float, results: queue.Queue) -> None:
+        """Renders all URLs on one browser and puts (index, result, metadata) into `results`."""
+        global_limit = asyncio.Semaphore(max_concurrency)
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+        launch_lock = asyncio.Lock()
+        state: Dict[str, Any] = {"browser": None}
+
+        async with async_playwright() as playwright:
+
+            async def _browser():
+                # Launched on first use; relaunched if it crashed
+                async with launch_lock:
+                    if state["browser"] is None or not state["browser"].is_connected():
+                        state["browser"] = await playwright.chromium.launch(headless=True)
+                    return state["browser"]
+
+            async def _one(index: int, url: str) -> None:
+                metadata: Dict[str, Any] = {"engine": "dynamic"}
+                start = time.perf_counter()
+                host_limit = host_limits.setdefault(urlparse(url).netloc, asyncio.Semaphore(per_host))
+                try:
+                    async with global_limit, host_limit:
+                        start = time.perf_counter()
+                        browser = await _browser()
+                        result = await asyncio.wait_for(
+                            self._render_in_context_async(browser, url, options, metadata), page_timeout_s
+                        )
+                except (asyncio.TimeoutError, AsyncPlaywrightTimeout):
+                    result = (None, url, "Timeout occurred during dynamic loading.")
+                except Exception as e:
+                    result = (None, url, f"Playwright Error: {e}")
+                metadata["fetch_seconds"] = round(time.perf_counter() - start, 3)
+                results.put((index, result, metadata))
+
+            try:
+                await asyncio.gather(*(_one(i, url) for i, url in enumerate(urls)))
+            finally:
+                if state["browser"] is not None:
+                    try:
+                        await state["browser"].close()
+                    except Exception:
+                        pass
+
+    async def _render_in_context_async(self, browser, url: str, options: Dict[str, Any], metadata: Dict[str, Any]) -> FetchResult:
+        """Renders one URL in a fresh browser context (closed afterwards, also on timeout)."""
+        context = await browser.new_context(user_agent=DEFAULT_USER_AGENT)
+        try:
+            page = await context.new_page()
+            return await self._render_page_async(page, url, options, metadata)
+        finally:
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+    async def _render_page_async(self, page, url: str, options: Dict[str, Any], metadata: Dict[str, Any]) -> FetchResult:
+        """Async counterpart of _render_page."""
+        timeout = options.get('timeout_ms', DEFAULT_TIMEOUT_MS)
+        wait_selector = options.get('wait_selector')
+        remove_selectors = options.get('remove_selectors', [])
+
+        is_blocked = self._request_blocker(options)
+        if is_blocked is not None:
+            async def _handle(route):
+                if is_blocked(route.request):
+                    await route.abort("blockedbyclient")
+                else:
+                    await route.continue_()
+            await page.route("**/*", _handle)
+
+        self.logger.info(f"Playwright (async) navigating to: {url}")
+        await page.goto(url, timeout=timeout, wait_until="domcontentloaded")
+
+        if wait_selector:
+            try:
+                await page.wait_for_selector(wait_selector, timeout=5000)
+            except AsyncPlaywrightTimeout:
+                self.logger.warning(f"Selector ({wait_selector}) did not appear in time. Continuing.")
+
+        if remove_selectors:
+            try:
+                await page.evaluate(_REMOVE_ELEMENTS_JS, remove_selectors)
+            except Exception as e:
+                self.logger.warning(f"Error removing elements: {e}")
+
+        if options.get('scroll', False):
+            step_timeout, quiet = self._scroll_settings(options)
+            scroll_start = time.perf_counter()
+            metadata["scroll_steps"] = await self._smart_scroll_async(page, options.get('max_scrolls', 10), step_timeout, quiet)
+            metadata["scroll_seconds"] = round(time.perf_counter() - scroll_start, 3)
+
+        text_options = options.get('text_options')
+        if text_options:
+            content = await page.evaluate(_INNER_TEXT_JS, self._inner_text_args(text_options))
+            metadata["content_type"] = "text"
+        else:
+            content = await page.content()
+            metadata["content_type"] = "html"
+
+        return self._rendered_result(content, url)
+
+    async def _smart_scroll_async(self, page, max_scrolls: int, step_timeout_ms: int, quiet_ms: int) -> int:
+        """Async counterpart of _smart_scroll."""
+        await page.evaluate(_SCROLL_PROBE_JS)
+
+        steps = 0
+        for _ in range(max_scrolls):
+            state = await page.evaluate(_SCROLL_STATE_JS)
+            await page.evaluate(_SCROLL_TO_BOTTOM_JS)
+            try:
+                await page.wait_for_function(_SCROLL_SETTLED_JS, arg={**state, "quiet": quiet_ms},
+                                             timeout=step_timeout_ms, polling=100)
+            except AsyncPlaywrightTimeout:
+                new_state = await page.evaluate(_SCROLL_STATE_JS)
+                if new_state["height"] <= state["height"] and new_state["nodes"] <= state["nodes"]:
+                    break
+            steps += 1
+
+        return steps
+
+# Bytes of the body searched for a <meta charset> declaration (HTML spec: 1024)
+_CHARSET_SNIFF_BYTES = 1024
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9._:-]+)""", re.IGNORECASE)
+_HEADER_CHARSET_RE = re.compile(r"""charset\s*=\s*["']?([A-Za-z0-9._:-]+)""", re.IGNORECASE)
+_BOMS = ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+
+
+class _HtmlDecoder:
+    """
+    Decodes an HTML body chunk by chunk with a running byte counter. The charset
+    comes from the BOM, the Content-Type header or a <meta charset> in the first
+    1024 bytes (fallback: UTF-8); undecodable bytes are replaced.
+    """
+
+    def __init__(self, max_size_bytes: int, content_type: str = ""):
+        self.max_size_bytes = max_size_bytes
+        match = _HEADER_CHARSET_RE.search(content_type or "")
+        self.charset = self._valid_charset(match.group(1)) if match else None
+        self.size = 0
+        self._head = b""
+        self._decoder = None
+        self._parts: List[str] = []
+
+    @staticmethod
+    def _valid_charset(name) -> Optional[str]:
+        if isinstance(name, bytes):
+            name = name.decode("ascii", errors="ignore")
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            return None
+
+    def _start(self) -> None:
+        """Picks the charset from the buffered head of the body and decodes it."""
+        charset = next((enc for bom, enc in _BOMS if self._head.startswith(bom)), None) or self.charset
+        if charset is None:
+            match = _META_CHARSET_RE.search(self._head[:_CHARSET_SNIFF_BYTES])
+            charset = self._valid_charset(match.group(1)) if match else None
+        self.charset = charset or "utf-8"
+        self._decoder = codecs.getincrementaldecoder(self.charset)(errors="replace")
+        self._parts.append(self._decoder.decode(self._head))
+        self._head = b""
+
+    def feed(self, chunk: bytes) -> bool:
+        """Adds a chunk; returns False once the body exceeds the size limit."""
+        self.size += len(chunk)
+        if self.size > self.max_size_bytes:
+            return False
+        if self._decoder is not None:
+            self._parts.append(self._decoder.decode(chunk))
+        else:
+            self._head += chunk
+            if len(self._head) >= _CHARSET_SNIFF_BYTES:
+                self._start()
+        return True
+
+    def finish(self) -> str:
+        """Returns the decoded text."""
+        if self._decoder is None:
+            self._start()
+        self._parts.append(self._decoder.decode(b"", final=True))
+        return "".join(self._parts)
+
+
+class _BinarySink:
+    """
+    Collects a binary download in memory and spills it to a temporary file once it
+    exceeds the in-memory limit (or right away if Content-Length announces a larger file).
+    """
+
+    def __init__(self, max_size_bytes: int, in_memory_max_bytes: int, expected_size=None):
+        self.max_size_bytes = max_size_bytes
+        self.in_memory_max_bytes = in_memory_max_bytes
+        self.size = 0
+        self._buffer = bytearray()
+        self._file = None
+        try:
+            if expected_size is not None and int(expected_size) > in_memory_max_bytes:
+                self._spill()
+        except ValueError:
+            pass
+
+    def _spill(self) -> None:
+        self._file = tempfile.NamedTemporaryFile(delete=False, suffix=".tmp")
+        self._file.write(self._buffer)
+        self._buffer = bytearray()
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self.max_size_bytes:
+            raise ValueError("Download exceeded size limit during streaming.")
+        if self._file is not None:
+            self._file.write(chunk)
+            return
+        self._buffer += chunk
+        if len(self._buffer) > self.in_memory_max_bytes:
+            self._spill()
+
+    def finish(self, url: str) -> FetchResult:
+        """Returns the in-memory content, or the finalized temp file path."""
+        ext = WebLoader._binary_extension(url)
+        if self._file is None:
+            return BinaryContent(bytes(self._buffer), ext), f"URL (Binary File: {ext})", None
+        self._file.close()
+        return WebLoader._finalize_binary_file(self._file.name, url)
+
+    def discard(self) -> None:
+        """Drops the buffer and deletes the temp file (download failed)."""
+        self._buffer = bytearray()
+        if self._file is not None:
+            self._file.close()
+            try:
+                os.remove(self._file.name)
+            except OSError:
+                pass
+
+
 # --- Testing Block (Run this file directly to test) ---
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
@@ -305,4 +1173,6 @@ if __name__ == "__main__":
     if PLAYWRIGHT_AVAILABLE:
         print("\nTesting Dynamic Fetch...")
         c, i, e = loader.fetch("https://example.com", use_dynamic=True, options={'scroll': False})
-        print(f"Info: {i}, Error: {e}, Length: {len(c) if c else 0}")
\ No newline at end of file
+        print(f"Info: {i}, Error: {e}, Length: {len(c) if c else 0}")
+
+    loader.close()
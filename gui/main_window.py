@@ -23,6 +23,7 @@ DEFAULT_HTML_PARSER = 'html.parser'
 DEFAULT_HTML_DECOMPOSE_TAGS = ["script", "style", "meta", "link", "header", "footer", "nav", "aside"]
 DEFAULT_HTML_TEXT_SEPARATOR = '\n'
 DEFAULT_HTML_TEXT_STRIP = True
+DEFAULT_HTML_BACKEND = 'bs4'
 
 class AppView:
     """
@@ -162,7 +163,7 @@ class AppView:
         self.verbosity_combobox = ttk.Combobox(self.ai_options_frame, textvariable=self.verbosity_var, values=["low", "medium", "high"], state="disabled", width=15)
         
         self.delay_label = ttk.Label(self.ai_options_frame, text="Delay (sec):")
-        self.delay_var = tk.DoubleVar(value=self.controller.config_manager.get('defaults', {}).get('batch_delay_seconds', 1.0))
+        self.delay_var = tk.DoubleVar(value=self.controller.config_manager.get('defaults', {}).get('batch_delay_seconds', 0.0))
         self.delay_spinbox = ttk.Spinbox(self.ai_options_frame, from_=0.0, to=300.0, increment=0.5, textvariable=self.delay_var, width=8, format="%.1f")
 
         # --- HTML Extractor Widgets ---
@@ -183,6 +184,10 @@ class AppView:
 
         self.html_text_strip_var = tk.BooleanVar(value=DEFAULT_HTML_TEXT_STRIP)
         self.html_text_strip_checkbutton = ttk.Checkbutton(self.html_params_inner_frame, text="Strip whitespace", variable=self.html_text_strip_var)
+
+        self.html_backend_label = ttk.Label(self.html_params_inner_frame, text="Backend:")
+        self.html_backend_var = tk.StringVar(value=DEFAULT_HTML_BACKEND)
+        self.html_backend_combobox = ttk.Combobox(self.html_params_inner_frame, textvariable=self.html_backend_var, values=["bs4", "stream", "lxml"], state="readonly", width=10)
         
         # --- Processing, Output, Status ---
         self.process_button = ttk.Button(self.process_frame, text="Start Processing")
@@ -256,6 +261,8 @@ class AppView:
         self.html_text_separator_label.grid(row=2, column=0, sticky="w", padx=(0,5), pady=2)
         self.html_text_separator_entry.grid(row=2, column=1, sticky="w", pady=2)
         self.html_text_strip_checkbutton.grid(row=3, column=0, columnspan=2, sticky="w", pady=2)
+        self.html_backend_label.grid(row=4, column=0, sticky="w", padx=(0,5), pady=2)
+        self.html_backend_combobox.grid(row=4, column=1, sticky="w", pady=2)
 
         self.process_frame.grid(row=4, column=0, sticky="ew")
         self.process_button.pack()
@@ -329,6 +336,7 @@ class AppView:
                     options['text_separator'] = sep_val_str
             
             options['text_strip'] = self.html_text_strip_var.get()
+            options['backend'] = self.html_backend_var.get()
             logging.info(f"Using custom HTML extractor options from GUI: {options}")
         else:
             logging.info("HTML extractor: detailed params checkbox not checked, using defaults.")
@@ -82,8 +82,14 @@ def _setup_arg_parser() -> argparse.ArgumentParser:
 
     # --- Runtime Options ---
     opt_grp = parser.add_argument_group('Runtime Options')
-    opt_grp.add_argument('-d', '--delay', type=float, default=1.0,
-                         help="Delay between batch items in seconds.")
+    opt_grp.add_argument('-d', '--delay', type=float, default=0.0,
+                         help="Extra delay between batch AI calls in seconds (quotas are enforced by 'rate_limits' in config.json).")
+    opt_grp.add_argument('-w', '--workers', type=int,
+                         help="Batch items processed concurrently (overrides the 'concurrency' config section).")
+    opt_grp.add_argument('--no-cache', action='store_true',
+                         help="Bypass the AI response cache (always call the provider).")
+    opt_grp.add_argument('--force-refresh', action='store_true',
+                         help="Bypass the HTTP cache and re-download every URL (static engine).")
     opt_grp.add_argument('-q', '--quiet', action='store_true',
                          help="Quiet mode (log only errors).")
     
@@ -92,6 +98,8 @@ def _setup_arg_parser() -> argparse.ArgumentParser:
     spec_grp.add_argument('-r', '--recursive', action='store_true', help="BatchDirectory: Scan subfolders.")
     spec_grp.add_argument('-t', '--file-type', default='*.*', help="BatchDirectory: File mask (e.g., *.pdf).")
     spec_grp.add_argument('--raw-html', action='store_true', help="URL: Send raw HTML without extraction/cleaning.")
+    spec_grp.add_argument('--async-fetch', action='store_true',
+                          help="BatchURLList: Download all URLs concurrently (async, static engine) and process pages as they arrive.")
 
     # --- HTML Extractor Advanced ---
     html_grp = parser.add_argument_group('HTML Extractor Advanced')
@@ -99,6 +107,8 @@ def _setup_arg_parser() -> argparse.ArgumentParser:
     html_grp.add_argument('--html-decompose-tags', help="Comma-separated list of tags to remove.")
     html_grp.add_argument('--html-no-strip', action='store_true', help="Disable whitespace stripping.")
     html_grp.add_argument('--html-separator', default='\\n', help="Text separator between tags (e.g., '\\n', '|'). Default: \\n")
+    html_grp.add_argument('--html-backend', choices=['bs4', 'stream', 'lxml'], default='bs4',
+                          help="HTML-to-text backend: bs4 (default), or the faster streaming 'stream' / 'lxml'.")
 
     # --- Dynamic Web Loader (Playwright) ---
     dyn_grp = parser.add_argument_group('Dynamic Web Loader (Playwright)')
@@ -107,6 +117,11 @@ def _setup_arg_parser() -> argparse.ArgumentParser:
     dyn_grp.add_argument('--max-scrolls', type=int, default=10, help="Maximum number of scroll steps. Default: 10.")
     dyn_grp.add_argument('--wait-selector', type=str, help="CSS selector to wait for before extraction.")
     dyn_grp.add_argument('--remove-selectors', type=str, help="Comma-separated selectors to remove from DOM (e.g. cookie banners).")
+    dyn_grp.add_argument('--resource-profile', choices=['text', 'full'],
+                         help="Request blocking: 'text' drops images, media, fonts and analytics hosts; 'full' loads everything. Default: config.")
+    dyn_grp.add_argument('--extract-in-browser', action='store_true',
+                         help="Extract the visible text inside the browser (innerText) instead of parsing the HTML in Python.")
+    dyn_grp.add_argument('--block-patterns', type=str, help="Comma-separated host suffixes or URL globs to block (replaces the config list).")
 
     return parser
 
@@ -165,6 +180,7 @@ def run(args_list: Optional[List[str]] = None) -> int:
     if args.quiet:
         log.setLevel(logging.ERROR)
 
+    controller = None
     try:
         # 1. Load Prompt
         prompt_text = ""
@@ -233,6 +249,7 @@ def run(args_list: Optional[List[str]] = None) -> int:
         # Build HTML options
         html_options_for_controller = {
             "parser": args.html_parser,
+            "backend": args.html_backend,
             "text_strip": not args.html_no_strip,
             "text_separator": separator_cleaned
         }
@@ -253,15 +270,26 @@ def run(args_list: Optional[List[str]] = None) -> int:
              selectors = [s.strip() for s in args.remove_selectors.split(',') if s.strip()]
              dynamic_options_for_controller["remove_selectors"] = selectors
 
+        if args.extract_in_browser:
+            dynamic_options_for_controller["extract_in_browser"] = True
+        if args.resource_profile:
+            dynamic_options_for_controller["resource_profile"] = args.resource_profile
+        if args.block_patterns is not None:
+            dynamic_options_for_controller["block_url_patterns"] = [p.strip() for p in args.block_patterns.split(',') if p.strip()]
+
         options = {
             "provider_key": args.provider,
             "model": args.model,
             "mode": controller_mode,
             "output_dir": args.output_dir,
             "delay": args.delay,
+            "max_workers": args.workers,
+            "no_cache": args.no_cache,
+            "force_refresh": args.force_refresh,
             "recursive": args.recursive,
             "file_type": args.file_type,
             "send_raw_html": args.raw_html,
+            "async_fetch": args.async_fetch,
             "html_options": html_options_for_controller,
             "dynamic_options": dynamic_options_for_controller, # Passed to controller -> WebLoader
             "reasoning_effort": args.reasoning_effort,
@@ -298,6 +326,10 @@ def run(args_list: Optional[List[str]] = None) -> int:
     except Exception as e:
         log.critical(f"Unexpected Error: {e}", exc_info=not args.quiet)
         return 1
+    finally:
+        # Close browsers, pooled connections and extraction worker processes
+        if controller is not None:
+            controller.shutdown()
 
 
 def main():
@@ -13,6 +13,7 @@ This script launches the GUI application. Its responsibilities include:
 import tkinter as tk
 from tkinter import messagebox
 import logging
+import multiprocessing
 import sys
 import traceback
 
@@ -97,6 +98,7 @@ def main():
         # Handle Window Closing (Graceful shutdown)
         def on_closing():
             logging.info("Application closed by user.")
+            controller.shutdown()
             root.destroy()
             sys.exit(0)
 
@@ -119,4 +121,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the extraction process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file